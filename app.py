@@ -1,22 +1,35 @@
 # ============================
 # File: app.py
 # ============================
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify
+from contextlib import ExitStack
+from io import BytesIO
 from pathlib import Path
-import tempfile
 import os
 
-from cv import process_file
+from cv import model_loaded, parse_paths, process_file, write_outputs
+
+
+class InMemoryRequest(Request):
+    """Keep uploaded files in memory; werkzeug spools anything over 500 KB to a temp file.
+    MAX_CONTENT_LENGTH bounds what a request can hold."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return BytesIO()
+
 
 app = Flask(__name__)
+app.request_class = InMemoryRequest
 app.config["MAX_CONTENT_LENGTH"] = 50 * 1024 * 1024  # 50 MB
+# Set to a directory to also keep <stem>_CV.json / CV.json files of every upload
+app.config["CV_OUTPUT_DIR"] = os.getenv("CV_OUTPUT_DIR")
 
 @app.route("/")
 def home():
     return """
-    <h2>Upload CV (PDF/TXT/Image)</h2>
+    <h2>Upload CV (PDF/DOCX/TXT/Image)</h2>
     <form method="POST" enctype="multipart/form-data" action="/upload">
-        <input type="file" name="cv" accept=".pdf,.txt,.png,.jpg,.jpeg" required>
+        <input type="file" name="cv" accept=".pdf,.docx,.txt,.png,.jpg,.jpeg" multiple required>
         <br><br>
         <label>Phone Region: <input name="phone_region" placeholder="IN"></label>
         <br><br>
@@ -24,31 +37,60 @@ def home():
     </form>
     """
 
+
+def _buffer(file, stack):
+    """The upload's bytes without copying them (a memoryview of the in-memory stream).
+
+    The view is released when `stack` closes; werkzeug cannot close the stream while it is exported.
+    """
+    stream = file.stream
+    if hasattr(stream, "getbuffer"):
+        return stack.enter_context(stream.getbuffer())
+    return file.read()
+
+
 @app.route("/upload", methods=["POST"])
 def upload():
-    if "cv" not in request.files:
+    files = request.files.getlist("cv")
+    if not files:
         return "No file uploaded", 400
 
-    file = request.files["cv"]
     phone_region = request.form.get("phone_region")
+    out_dir = app.config["CV_OUTPUT_DIR"]
+
+    with ExitStack() as stack:
+        if len(files) == 1:
+            data = _buffer(files[0], stack)
+            return jsonify(process_file(data, phone_region, out_dir, filename=Path(files[0].filename).name))
+
+        # Several CVs: names for all of them come from one nlp.pipe batch
+        buffers = [(Path(file.filename).name, _buffer(file, stack)) for file in files]
+        parsed = parse_paths(buffers, phone_region)
+
+    results = []
+    for file, result in zip(files, parsed):
+        if "error" in result:
+            results.append({"file_name": file.filename, "error": result["error"]})
+            continue
+        if out_dir:
+            write_outputs(result, out_dir)
+        results.append(dict(result, file_name=file.filename))
+    return jsonify(results)
+
+
+# Probes for the production launcher (serve_cv.py): liveness, and readiness once the model is loaded
+@app.route("/healthz")
+def healthz():
+    return jsonify({"status": "ok"})
 
-    suffix = Path(file.filename).suffix
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(file.read())
-    tmp.close()
-    tmp_path = Path(tmp.name)
 
-    out_dir = Path.cwd() / "uploads_output"
-    out_dir.mkdir(exist_ok=True)
+@app.route("/readyz")
+def readyz():
+    if not model_loaded():
+        return jsonify({"status": "loading"}), 503
+    return jsonify({"status": "ready"})
 
-    try:
-        result = process_file(tmp_path, phone_region, out_dir)
-        return jsonify(result)
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
 
 if __name__ == "__main__":
-    app.run(port=5000, host="0.0.0.0", debug=True)
+    # Development server only; run `python serve_cv.py` in production
+    app.run(port=5000, host="0.0.0.0", debug=os.getenv("CV_DEBUG") == "1")
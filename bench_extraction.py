@@ -0,0 +1,120 @@
+# ============================
+# File: bench_extraction.py
+# ============================
+"""
+Benchmark the text_extraction backends on a corpus of resumes.
+
+Every file is run through each backend of its format on its own (plus the normal
+fallback chain as "auto"), `--repeat` times. Per format and backend it reports
+latency percentiles, how often the backend yielded text and the mean characters
+extracted.
+
+Usage:
+    python bench_extraction.py path/to/corpus [--repeat 3] [--json out.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import text_extraction
+
+SUFFIXES = {".pdf", ".docx", ".txt", ".md"}
+AUTO = "auto"
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def corpus_files(root):
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in SUFFIXES)
+
+
+def bench(paths, repeat=3):
+    """{(format, backend): {"latencies": [s, ...], "chars": [n, ...], "empty": n, "errors": n}}"""
+    samples = {}
+    warmed = set()
+    for path in paths:
+        data = path.read_bytes()
+        fmt = text_extraction.detect_format(path.name, data)
+        runs = [(name, [name]) for name, _ in text_extraction.BACKENDS[fmt]] + [(AUTO, None)]
+        for name, backends in runs:
+            stats = samples.setdefault((fmt, name), {"latencies": [], "chars": [], "empty": 0, "errors": 0})
+            if (fmt, name) not in warmed:
+                # Untimed first run: backend libraries are imported lazily
+                text_extraction.extract(data, fmt=fmt, backends=backends)
+                warmed.add((fmt, name))
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = text_extraction.extract(data, fmt=fmt, backends=backends)
+                stats["latencies"].append(time.perf_counter() - started)
+            chars = len(result.text.strip())
+            stats["chars"].append(chars)
+            if not chars:
+                failed = any(err != "no text extracted" for err in result.errors.values())
+                stats["errors" if failed else "empty"] += 1
+    return samples
+
+
+def summarize(samples):
+    rows = []
+    for (fmt, name), stats in sorted(samples.items()):
+        latencies = stats["latencies"]
+        files = len(stats["chars"])
+        rows.append({
+            "format": fmt,
+            "backend": name,
+            "files": files,
+            "yield": round(sum(1 for c in stats["chars"] if c) / files, 3) if files else 0,
+            "empty": stats["empty"],
+            "errors": stats["errors"],
+            "mean_chars": round(sum(stats["chars"]) / files) if files else 0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(max(latencies) * 1000, 2),
+        })
+    return rows
+
+
+def print_table(rows):
+    columns = ["format", "backend", "files", "yield", "empty", "errors", "mean_chars", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark text extraction backends")
+    ap.add_argument("corpus", help="Resume file or directory of resumes (PDF/DOCX/TXT)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per file and backend")
+    ap.add_argument("--json", help="Also write the summary rows to this JSON file")
+    args = ap.parse_args()
+
+    paths = corpus_files(args.corpus)
+    if not paths:
+        print("No PDF/DOCX/TXT files found in", args.corpus)
+        sys.exit(1)
+
+    rows = summarize(bench(paths, repeat=max(1, args.repeat)))
+    print_table(rows)
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        print("Saved:", args.json)
+
+
+if __name__ == "__main__":
+    main()
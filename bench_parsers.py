@@ -0,0 +1,403 @@
+# ============================
+# File: bench_parsers.py
+# ============================
+"""
+Benchmark and accuracy regression suite for the resume parsers.
+
+Runs every CV in benchmarks/corpus through each parser, stage by stage:
+- form_data   form_data.resume_parser (the /resume-parse/ basic parser)
+- keyword     create_job.utils.parser.parse_resume
+- cv          cv.py extract_all (its name stage needs the spaCy model; without it the
+              stage is reported as not run)
+
+The corpus has TXT, PDF and DOCX CVs, so the extract stages cover every format.
+It reports p50 / p95 latency and peak traced memory per stage and the accuracy of
+each field against benchmarks/golden/<stem>.json. With a baseline
+(benchmarks/baseline.json) it exits 1 when a field's accuracy drops by more than
+--accuracy-tolerance, a stage's p95 grows past --latency-factor, or a parser or
+field in the baseline could not be measured.
+
+Usage:
+    python bench_parsers.py [--repeat 5] [--parsers form_data,keyword,cv]
+    python bench_parsers.py --update-baseline        # after an intended change
+
+Latency baselines are machine dependent: record them on the machine that checks them.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+import text_extraction
+
+BENCH_DIR = Path(__file__).resolve().parent / "benchmarks"
+CORPUS_DIR = BENCH_DIR / "corpus"
+GOLDEN_DIR = BENCH_DIR / "golden"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+
+ACCURACY_TOLERANCE = 0.02
+LATENCY_FACTOR = 1.5
+# p95 growth below this is noise, whatever the factor says
+LATENCY_FLOOR_MS = 1.0
+
+
+# ---------------- stage timing ----------------
+class StageRecorder:
+    """`with recorder("emails"): ...` records the stage's latency, or its peak memory when tracing."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.peak_bytes = defaultdict(int)
+        self.trace_memory = False
+        self.enabled = True
+
+    @contextmanager
+    def __call__(self, stage):
+        if not self.enabled:
+            yield
+            return
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            yield
+            peak = tracemalloc.get_traced_memory()[1] - before
+            self.peak_bytes[stage] = max(self.peak_bytes[stage], peak)
+            return
+        started = time.perf_counter()
+        yield
+        self.latencies[stage].append(time.perf_counter() - started)
+
+
+# ---------------- parsers (stages + canonical fields) ----------------
+def run_form_data(path, stage):
+    from form_data import resume_parser
+
+    with stage("extract"), open(path, "rb") as f:
+        text = resume_parser.extract_text(f, path.name) or ""
+    with stage("emails"):
+        emails = resume_parser.extract_emails(text)
+    with stage("phones"):
+        phones = resume_parser.extract_phones(text)
+    with stage("education"):
+        education = resume_parser.extract_education(text)
+    with stage("name"):
+        name = resume_parser.guess_name(text)
+    return {"name": name, "emails": emails, "phones": phones, "education": education}
+
+
+def run_keyword(path, stage):
+    from create_job.utils import parser
+
+    with stage("extract"):
+        text = text_extraction.extract_file(path).text
+    with stage("emails"):
+        email = parser.extract_email(text)
+    with stage("phones"):
+        phone = parser.extract_phone(text)
+    with stage("education"):
+        education = parser.extract_education(text)
+    with stage("experience"):
+        experience = parser.extract_experience(text)
+    with stage("name"):
+        name = parser.extract_name(text)
+    return {
+        "name": name,
+        "emails": [email] if email else [],
+        "phones": [phone] if phone else [],
+        "education": [e["degree"] for e in education],
+        "experience": [f"{e['role']} {e['company'] or ''}" for e in experience],
+    }
+
+
+@lru_cache(maxsize=None)
+def cv_missing_ner():
+    """Why cv.py's spaCy NER cannot run here, or None."""
+    import cv
+
+    try:
+        cv.get_nlp()
+    except ImportError:
+        return "spaCy is not installed"
+    except OSError:
+        return f"spaCy model {cv.SPACY_MODEL} is not installed"
+    return None
+
+
+def run_cv(path, stage):
+    import cv
+
+    with stage("extract"):
+        text = cv.load_file(path)
+    with stage("emails"):
+        cv.extract_emails(text)
+    with stage("phones"):
+        cv.extract_phones(text)
+    names = []
+    if not cv_missing_ner():
+        with stage("name"):
+            names = cv.extract_names(text, top_n=8)
+    with stage("sections"):
+        sections, _ = cv.find_sections_blocks(text)
+    with stage("experience"):
+        cv.parse_experience(sections.get("experience", {}).get("lines", []))
+    with stage("education"):
+        cv.parse_education(sections.get("education", {}).get("lines", []))
+    with stage("total"):
+        fields = cv.extract_all(text, name_candidates=names)
+    found = fields["sections"]
+    result = {
+        "emails": found["contact"]["emails"],
+        "phones": found["contact"]["phones"],
+        "education": [e["text"] for e in found["education"]],
+        "experience": [e["raw"] for e in found["experience"]],
+        "skills": found["skills"],
+    }
+    if not cv_missing_ner():
+        result["name"] = (fields["name_candidates"] or [None])[0]
+    return result
+
+
+PARSERS = {
+    "form_data": run_form_data,
+    "keyword": run_keyword,
+    "cv": run_cv,
+}
+
+
+def unmeasured(parser):
+    """The stage a parser leaves out in this environment and why, or None."""
+    if parser == "cv" and cv_missing_ner():
+        return f"name ({cv_missing_ner()})"
+    return None
+
+
+# ---------------- accuracy ----------------
+def _norm(value):
+    return re.sub(r"[^a-z0-9+]+", " ", str(value).lower()).strip()
+
+
+def _phone_key(value):
+    return re.sub(r"\D", "", str(value))[-10:]
+
+
+def _set_f1(expected, found):
+    expected, found = set(expected), set(found)
+    if not expected and not found:
+        return 1.0
+    hits = len(expected & found)
+    if not hits:
+        return 0.0
+    precision, recall = hits / len(found), hits / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _recall_in(expected, found):
+    """Share of expected items mentioned in what the parser found (free-text fields)."""
+    if not expected:
+        return 1.0 if not found else 0.0
+    haystack = " | ".join(_norm(f) for f in found)
+    return sum(1 for e in expected if f" {_norm(e)} " in f" {haystack} ") / len(expected)
+
+
+def score(golden, fields):
+    """{field: 0..1} for the golden fields this parser produces."""
+    scores = {}
+    for field, found in fields.items():
+        expected = golden.get(field)
+        if expected is None:
+            continue
+        if field == "name":
+            scores[field] = 1.0 if found and _norm(found) == _norm(expected) else 0.0
+        elif field == "emails":
+            scores[field] = _set_f1({e.lower() for e in expected}, {f.lower() for f in found})
+        elif field == "phones":
+            scores[field] = _set_f1({_phone_key(e) for e in expected}, {_phone_key(f) for f in found})
+        elif field == "skills":
+            scores[field] = _set_f1({_norm(e) for e in expected}, {_norm(f) for f in found})
+        else:
+            scores[field] = _recall_in(expected, found)
+    return scores
+
+
+# ---------------- suite ----------------
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def load_corpus():
+    cases = []
+    for path in sorted(CORPUS_DIR.iterdir()):
+        golden = GOLDEN_DIR / f"{path.stem}.json"
+        if path.is_file() and golden.exists():
+            cases.append((path, json.loads(golden.read_text(encoding="utf-8"))))
+    return cases
+
+
+def bench_parser(run, cases, repeat):
+    recorder = StageRecorder()
+    field_scores = defaultdict(list)
+    failures = []
+
+    # Untimed warm-up, once per file format: lazy imports (PDF / DOCX backends) and
+    # model loads (spaCy) are not a per-CV cost
+    recorder.enabled = False
+    for path in {path.suffix.lower(): path for path, _ in cases}.values():
+        run(path, recorder)
+    recorder.enabled = True
+
+    for path, golden in cases:
+        try:
+            fields = run(path, recorder)
+        except Exception as exc:
+            failures.append(f"{path.name}: {exc!r}")
+            continue
+        for field, value in score(golden, fields).items():
+            field_scores[field].append(value)
+        for _ in range(repeat - 1):
+            run(path, recorder)
+
+    recorder.trace_memory = True
+    tracemalloc.start()
+    try:
+        for path, _ in cases:
+            try:
+                run(path, recorder)
+            except Exception:
+                pass
+    finally:
+        tracemalloc.stop()
+
+    stages = {
+        stage: {
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            "peak_kib": round(recorder.peak_bytes[stage] / 1024, 1),
+        }
+        for stage, samples in recorder.latencies.items()
+    }
+    accuracy = {field: round(sum(v) / len(v), 3) for field, v in field_scores.items()}
+    return {"stages": stages, "accuracy": accuracy, "failures": failures}
+
+
+def compare(report, baseline, accuracy_tolerance, latency_factor, latency_floor_ms, skipped=None):
+    """Regression messages of `report` against `baseline`.
+
+    Parsers that were not asked for are ignored; a baselined parser in `skipped`
+    (asked for but unable to run) or a baselined field it did not produce is a regression.
+    """
+    problems = []
+    for parser, base in baseline.get("parsers", {}).items():
+        current = report.get(parser)
+        if current is None:
+            if parser in (skipped or {}):
+                problems.append(f"{parser} could not run ({skipped[parser]})")
+            continue
+        for field, expected in base.get("accuracy", {}).items():
+            got = current["accuracy"].get(field)
+            if got is None:
+                problems.append(f"{parser}.{field} was not measured (baseline {expected})")
+            elif got < expected - accuracy_tolerance:
+                problems.append(f"{parser}.{field} accuracy {got} < baseline {expected}")
+        for stage, expected in base.get("p95_ms", {}).items():
+            got = current["stages"].get(stage, {}).get("p95_ms")
+            if got is not None and got > expected * latency_factor and got - expected > latency_floor_ms:
+                problems.append(f"{parser}.{stage} p95 {got}ms > {latency_factor}x baseline {expected}ms")
+    return problems
+
+
+def baseline_from(report):
+    return {
+        "parsers": {
+            parser: {
+                "accuracy": result["accuracy"],
+                "p95_ms": {stage: s["p95_ms"] for stage, s in result["stages"].items()},
+            }
+            for parser, result in report.items()
+        }
+    }
+
+
+def print_report(report, skipped):
+    for parser, result in report.items():
+        print(f"\n== {parser}")
+        if unmeasured(parser):
+            print(f"  NOT MEASURED: {unmeasured(parser)}")
+        print(f"  {'stage':<12}{'p50_ms':>10}{'p95_ms':>10}{'peak_kib':>10}")
+        for stage, s in result["stages"].items():
+            print(f"  {stage:<12}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['peak_kib']:>10}")
+        accuracy = result["accuracy"]
+        if accuracy:
+            overall = round(sum(accuracy.values()) / len(accuracy), 3)
+            print("  accuracy:", ", ".join(f"{k}={v}" for k, v in accuracy.items()), f"(mean {overall})")
+        for failure in result["failures"]:
+            print("  FAILED", failure)
+    for parser, reason in skipped.items():
+        print(f"\n== {parser}: skipped ({reason})")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Resume parser benchmark and accuracy regression suite")
+    ap.add_argument("--parsers", default=",".join(PARSERS), help="Comma separated parsers to run")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per CV")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+    ap.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    ap.add_argument("--accuracy-tolerance", type=float, default=ACCURACY_TOLERANCE)
+    ap.add_argument("--latency-factor", type=float, default=LATENCY_FACTOR)
+    ap.add_argument("--latency-floor-ms", type=float, default=LATENCY_FLOOR_MS)
+    ap.add_argument("--json", help="Also write the full report to this JSON file")
+    args = ap.parse_args()
+
+    cases = load_corpus()
+    if not cases:
+        print("No corpus files with golden JSON in", CORPUS_DIR)
+        sys.exit(1)
+
+    report, skipped = {}, {}
+    for name in [p.strip() for p in args.parsers.split(",") if p.strip()]:
+        try:
+            report[name] = bench_parser(PARSERS[name], cases, max(1, args.repeat))
+        except ImportError as exc:
+            skipped[name] = f"missing dependency: {exc.name or exc}"
+    print_report(report, skipped)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {"parsers": {}}
+        # Parsers that could not run here keep their recorded baseline
+        baseline["parsers"].update(baseline_from(report)["parsers"])
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print("\nBaseline written:", baseline_path)
+        return
+
+    if not baseline_path.exists():
+        print("\nNo baseline at", baseline_path, "- run with --update-baseline to record one.")
+        return
+    problems = compare(
+        report, json.loads(baseline_path.read_text(encoding="utf-8")),
+        args.accuracy_tolerance, args.latency_factor, args.latency_floor_ms, skipped,
+    )
+    failures = [f"{parser}: {f}" for parser, result in report.items() for f in result["failures"]]
+    if problems or failures:
+        print("\nREGRESSIONS:")
+        for problem in problems + failures:
+            print("  -", problem)
+        sys.exit(1)
+    print("\nNo regressions against", baseline_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,36 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .utils.prompt_compactor import CHARS_PER_TOKEN, _dedupe, _fit_budget
+
+
+class FitBudgetTests(TestCase):
+    def test_smaller_sections_still_fit_after_a_truncated_one(self):
+        header = ["Asha Rao", "Backend Engineer"]
+        experience = ["EXPERIENCE"] + [f"Built service {i} with Django and Celery" for i in range(20)]
+        skills = ["SKILLS", "Python, SQL"]
+        sections = [("header", header), ("experience", experience), ("skills", skills)]
+        size = lambda block: sum(len(line) + 1 for line in block)
+        # Room for four experience lines and the skills block, not for a fifth experience line
+        budget_tokens = (size(header) + size(experience[:4]) + size(skills) + CHARS_PER_TOKEN) // CHARS_PER_TOKEN
+
+        kept = _fit_budget(sections, budget_tokens)
+
+        # Skills has lower priority than experience but is small enough to be kept whole
+        self.assertEqual(kept, [header, experience[:4], skills])
+
+    def test_overflowing_header_keeps_a_single_line(self):
+        sections = [("header", ["A" * 30, "B" * 30]), ("skills", ["SKILLS"])]
+
+        self.assertEqual(_fit_budget(sections, 10), [["A" * 30], ["SKILLS"]])
+
+
+class DedupeTests(TestCase):
+    def test_repeated_sub_headings_are_kept(self):
+        lines = []
+        for job in ("A", "B", "C"):
+            lines += [f"Engineer, {job}", "Responsibilities:", f"- built {job}", "Acme Corp Confidential"]
+
+        out = _dedupe(lines)
+
+        self.assertEqual(out.count("Responsibilities:"), 3)
+        self.assertEqual(out.count("Acme Corp Confidential"), 1)
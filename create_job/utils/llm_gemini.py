@@ -1,26 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from google import genai
+from google.genai import types
 
-import os
+from .prompt_builder import PROMPT_VERSION
 
+logger = logging.getLogger(__name__)
 
+GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_BACKEND = settings.GEMINI_BACKEND
 
-from google import genai
-import os
+# Cache identity of a Gemini resume parse: a new model or prompt means a new parse.
+# Stub parses get their own version so they never answer for real ones.
+PARSER_NAME = "gemini"
+PARSER_VERSION = (
+    f"{GEMINI_MODEL}/{PROMPT_VERSION}" if GEMINI_BACKEND == "gemini" else f"{GEMINI_BACKEND}/{PROMPT_VERSION}"
+)
 
-def call_gemini_llm(prompt):
-    api_key = os.getenv("GEMINI_API_KEY")
+RESPONSE_CACHE_PREFIX = "gemini_response"
+# Quota / overload errors worth another attempt
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 20.0
 
-    try:
-        client = genai.Client(api_key=api_key)
 
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
+class GeminiBackend:
+    """The real API through one long-lived genai.Client (its HTTP pool is reused)."""
+
+    name = "gemini"
+
+    def __init__(self):
+        self.client = genai.Client(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            http_options=types.HttpOptions(timeout=settings.GEMINI_TIMEOUT * 1000),
         )
-        
 
+    def generate(self, prompt):
+        response = self.client.models.generate_content(model=GEMINI_MODEL, contents=prompt)
         return response.text
 
+
+class StubBackend:
+    """Offline stand-in for load tests: no network, fixed latency, deterministic JSON.
+
+    Fills name / email / phone with simple regexes over the resume text in the prompt.
+    """
+
+    name = "stub"
+
+    def generate(self, prompt):
+        time.sleep(settings.GEMINI_STUB_LATENCY)
+        text = prompt.split('RESUME TEXT:', 1)[-1]
+        email = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", text)
+        phone = re.search(r"\+?(?:\d[\s-]?){9,12}\d", text)
+        lines = [ln.strip() for ln in text.strip('"\n ').splitlines() if ln.strip()]
+        return json.dumps({
+            "name": lines[0] if lines else "",
+            "email": email.group(0) if email else "",
+            "phone": phone.group(0) if phone else "",
+            "linkedin_url": "",
+            "github_url": "",
+            "education": [],
+            "experience": [],
+            "total_experience": "",
+            "skills": [],
+        })
+
+
+BACKENDS = {
+    GeminiBackend.name: GeminiBackend,
+    StubBackend.name: StubBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+# Calls in flight from this process; a caller waits for a slot up to the request timeout
+_slots = threading.BoundedSemaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+
+def get_backend():
+    """The configured backend, built once per process (GEMINI_BACKEND: a name in BACKENDS or a dotted path)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_class = BACKENDS.get(GEMINI_BACKEND) or import_string(GEMINI_BACKEND)
+                _backend = backend_class()
+    return _backend
+
+
+def _response_cache_key(prompt):
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{RESPONSE_CACHE_PREFIX}:{PARSER_VERSION}:{digest}"
+
+
+def _wait_for_rate_window():
+    """Fixed one-minute window shared by all processes through the cache (GEMINI_REQUESTS_PER_MINUTE).
+
+    Waits at most the request timeout (GEMINI_TIMEOUT), then raises TimeoutError.
+    """
+    limit = settings.GEMINI_REQUESTS_PER_MINUTE
+    if not limit:
+        return
+    deadline = time.time() + settings.GEMINI_TIMEOUT
+    while True:
+        window = int(time.time() // 60)
+        key = f"{RESPONSE_CACHE_PREFIX}:rpm:{window}"
+        try:
+            cache.add(key, 0, timeout=120)
+            used = cache.incr(key)
+        except Exception as exc:
+            logger.warning("Gemini rate limit check failed, not limiting: %s", exc)
+            return
+        if used <= limit:
+            return
+        wake = (window + 1) * 60 + random.uniform(0, 1)
+        if wake > deadline:
+            raise TimeoutError("Timed out waiting for the Gemini requests-per-minute window")
+        time.sleep(wake - time.time())
+
+
+def _is_retryable(exc):
+    status = getattr(exc, "code", None)
+    if status in RETRYABLE_STATUS:
+        return True
+    return isinstance(exc, (TimeoutError, ConnectionError)) or exc.__class__.__name__ in (
+        "ConnectError", "ReadTimeout", "ConnectTimeout", "RemoteProtocolError",
+    )
+
+
+def _generate_with_retry(backend, prompt):
+    attempts = settings.GEMINI_MAX_RETRIES + 1
+    for attempt in range(attempts):
+        # Wait for the rate window before taking a slot, so waiting callers do not block the others
+        _wait_for_rate_window()
+        if not _slots.acquire(timeout=settings.GEMINI_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a free Gemini request slot")
+        try:
+            return backend.generate(prompt)
+        except Exception as exc:
+            if attempt == attempts - 1 or not _is_retryable(exc):
+                raise
+            # Full jitter keeps parallel uploads from retrying in lockstep
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            logger.warning("Gemini call failed (%s), retry %s/%s in %.1fs", exc, attempt + 1, attempts - 1, delay)
+        finally:
+            _slots.release()
+        time.sleep(delay)
+
+
+def call_gemini_llm(prompt):
+    """Raw model output for the prompt, or {"error": ...}.
+
+    Identical prompts are answered from the cache; calls are limited per process
+    (GEMINI_MAX_CONCURRENCY) and per minute across processes, and retried with jitter.
+    """
+    key = _response_cache_key(prompt)
+    try:
+        cached = cache.get(key)
+    except Exception as exc:
+        logger.warning("Gemini response cache read failed: %s", exc)
+        cached = None
+    if cached is not None:
+        return cached
+
+    try:
+        text = _generate_with_retry(get_backend(), prompt)
     except Exception as e:
         return {"error": str(e)}
 
+    if text:
+        try:
+            cache.set(key, text, timeout=settings.GEMINI_RESPONSE_CACHE_TTL)
+        except Exception as exc:
+            logger.warning("Gemini response cache write failed: %s", exc)
+    return text
@@ -1,5 +1,9 @@
 import re
 
+# Bump when the output of parse_resume() changes; cached parses of older versions are ignored
+PARSER_NAME = "keyword"
+PARSER_VERSION = "2"
+
 def clean_text(text):
     return re.sub(r'\s+', ' ', text.replace('\xa0', ' ')).strip()
 
@@ -1,3 +1,7 @@
+# Bump when the prompt changes; cached Gemini parses of older prompts are ignored
+PROMPT_VERSION = "2"
+
+
 def build_resume_prompt(text):
     schema = """
         Return ONLY valid JSON. No explanation. No comments.
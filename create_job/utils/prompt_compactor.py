@@ -0,0 +1,178 @@
+import logging
+import re
+
+from django.conf import settings
+
+from .parser import extract_email, extract_phone
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a Gemini token for English resume text
+CHARS_PER_TOKEN = 4
+# Lines at least this long are dropped when they repeat (bullet boilerplate, page headers)
+DEDUP_MIN_CHARS = 20
+# Shorter lines are page furniture once they repeat this often (e.g. a footer on every page)
+FURNITURE_MIN_REPEATS = 3
+
+PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$|^[-–]\s*\d{1,3}\s*[-–]$", re.I)
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[^\s,;|)]+", re.I)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[^\s,;|)]+", re.I)
+# What is left of a contact line once the details are pulled out
+CONTACT_LABEL_RE = re.compile(r"^(?:(?:e-?mail|phone|mobile|tel|linkedin|github)\s*[:\-]?\s*)+$", re.I)
+BULLET_RE = re.compile(r"^[•●▪◦‣⁃➢*-]+\s*")
+
+# Sections kept first when the text is over budget (lower = more important);
+# the lines before the first header (name, title) always come first
+SECTION_PRIORITY = [
+    ("experience", re.compile(r"^(?:work |professional )?experience|^employment|^work history|^career", re.I)),
+    ("education", re.compile(r"^education|^academic|^qualifications?", re.I)),
+    ("skills", re.compile(r"^(?:technical |key |core )?skills|^technologies|^tech stack", re.I)),
+    ("projects", re.compile(r"^(?:personal |selected |academic )?projects", re.I)),
+    ("summary", re.compile(r"^(?:professional )?summary|^profile|^objective|^about", re.I)),
+    ("certifications", re.compile(r"^certifications?|^courses|^achievements|^awards", re.I)),
+    ("other", re.compile(r"^languages?|^interests|^hobbies|^personal (?:details|information)", re.I)),
+]
+# Boilerplate sections the model does not need at all
+DROP_SECTION_RE = re.compile(r"^declaration|^references?\b", re.I)
+HEADER_MAX_WORDS = 5
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def pull_contact(text):
+    """Contact details found by regex, and the text without them (the model need not echo them)."""
+    email = extract_email(text)
+    phone = extract_phone(text)
+    linkedin = LINKEDIN_RE.search(text)
+    github = GITHUB_RE.search(text)
+    contact = {
+        "email": email or "",
+        "phone": phone or "",
+        "linkedin_url": linkedin.group(0) if linkedin else "",
+        "github_url": github.group(0) if github else "",
+    }
+    for key, value in contact.items():
+        if value:
+            # The phone regexes skip the country code; take it out with the number
+            prefix = r"(?:\+?\d{1,3}[\s-]*)?" if key == "phone" else ""
+            text = re.sub(prefix + re.escape(value), " ", text)
+    return text, contact
+
+
+def _clean_lines(text):
+    lines = []
+    for raw in text.replace("\r", "\n").replace("\xa0", " ").replace("\u200b", "").split("\n"):
+        line = " ".join(BULLET_RE.sub("- ", raw.strip()).split())
+        if line.strip(" -|,;:") and not PAGE_NUMBER_RE.match(line) and not CONTACT_LABEL_RE.match(re.sub(r"[|,;]", " ", line).strip()):
+            lines.append(line)
+    return lines
+
+
+def _is_label(line):
+    """Sub-headings such as "Responsibilities:" repeat under every job and carry the structure."""
+    return line.endswith(":") or _section_of(line) is not None
+
+
+def _dedupe(lines):
+    counts = {}
+    for line in lines:
+        counts[line.lower()] = counts.get(line.lower(), 0) + 1
+    seen = set()
+    out = []
+    for line in lines:
+        key = line.lower()
+        if _is_label(line):
+            out.append(line)
+            continue
+        repeated = len(line) >= DEDUP_MIN_CHARS or counts[key] >= FURNITURE_MIN_REPEATS
+        if repeated and key in seen:
+            continue
+        seen.add(key)
+        out.append(line)
+    return out
+
+
+def _section_of(line):
+    if len(line.split()) > HEADER_MAX_WORDS:
+        return None
+    heading = line.strip(" -:").lower()
+    if DROP_SECTION_RE.match(heading):
+        return "drop"
+    for name, pattern in SECTION_PRIORITY:
+        if pattern.match(heading):
+            return name
+    return None
+
+
+def _split_sections(lines):
+    """[(section, [lines])] in document order; the leading block is "header"."""
+    sections = [("header", [])]
+    for line in lines:
+        name = _section_of(line)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, block) for name, block in sections if block and name != "drop"]
+
+
+def _fit_budget(sections, budget_tokens):
+    """Keep sections by priority; one that does not fit is cut at a line boundary and the
+    lower-priority sections are still tried against what is left of the budget."""
+    rank = {"header": -1, **{name: i for i, (name, _) in enumerate(SECTION_PRIORITY)}}
+    order = sorted(range(len(sections)), key=lambda i: rank[sections[i][0]])
+    budget = budget_tokens * CHARS_PER_TOKEN
+    kept = {}
+    for i in order:
+        name, block = sections[i]
+        size = sum(len(line) + 1 for line in block)
+        if size <= budget:
+            kept[i] = block
+            budget -= size
+            continue
+        partial = []
+        for line in block:
+            if len(line) + 1 > budget:
+                break
+            partial.append(line)
+            budget -= len(line) + 1
+        if partial:
+            kept[i] = partial
+    return [kept[i] for i in range(len(sections)) if i in kept]
+
+
+def compact_resume_text(text, budget_tokens=None):
+    """Shrink extracted resume text before it goes into the prompt.
+
+    Normalises whitespace and bullets, drops page numbers, repeated page headers /
+    footers and duplicate lines, removes the declaration / references boilerplate,
+    pulls out the contact details we can read with regexes, and keeps sections by
+    priority within the token budget (GEMINI_PROMPT_TOKEN_BUDGET).
+    Returns (compact_text, contact, stats).
+    """
+    budget_tokens = budget_tokens or settings.GEMINI_PROMPT_TOKEN_BUDGET
+    stripped, contact = pull_contact(text)
+    sections = _split_sections(_dedupe(_clean_lines(stripped)))
+    compact = "\n".join(line for block in _fit_budget(sections, budget_tokens) for line in block)
+
+    before, after = estimate_tokens(text), estimate_tokens(compact)
+    stats = {
+        "chars_before": len(text),
+        "chars_after": len(compact),
+        "tokens_before": before,
+        "tokens_after": after,
+        "tokens_saved": before - after,
+        "saved_ratio": round((before - after) / before, 3) if before else 0.0,
+    }
+    return compact, contact, stats
+
+
+def fill_contact(parsed, contact):
+    """Put the regex contact details into the model output where it left them empty."""
+    if isinstance(parsed, dict):
+        for key, value in contact.items():
+            if value and not parsed.get(key):
+                parsed[key] = value
+    return parsed
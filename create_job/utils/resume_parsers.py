@@ -0,0 +1,77 @@
+import json
+import logging
+
+from .extractors import extract_text_from_docx, extract_text_from_pdf
+from .llm_gemini import call_gemini_llm
+from .parser import parse_resume
+from .prompt_builder import build_resume_prompt
+from .prompt_compactor import compact_resume_text, fill_contact
+
+logger = logging.getLogger(__name__)
+
+# Extension -> text extractor accepted by each parser
+KEYWORD_EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "doc": extract_text_from_docx,
+}
+AI_EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+}
+
+
+class AIParseError(Exception):
+    """Failed AI parse; carries the error response body (and is never cached)."""
+
+    def __init__(self, payload):
+        super().__init__(payload.get("error"))
+        self.payload = payload
+
+
+def file_extension(filename):
+    return filename.split(".")[-1].lower()
+
+
+def keyword_parse(file_obj, filename):
+    """Regex / heuristic parse of a PDF or DOCX resume. Returns (text, parsed)."""
+    text, diag = KEYWORD_EXTRACTORS[file_extension(filename)](file_obj)
+    return text, parse_resume(text)
+
+
+def gemini_parse(file_obj, filename):
+    """Gemini parse of a PDF or DOCX resume. Returns (text, parsed_json); raises AIParseError."""
+    text, diag = AI_EXTRACTORS[file_extension(filename)](file_obj)
+    if not isinstance(text, str) or not text.strip():
+        raise AIParseError({"error": "Could not extract text"})
+
+    # Smaller prompts: less latency and cost per call
+    compact, contact, stats = compact_resume_text(text)
+    logger.info(
+        "Gemini prompt for %s: %s -> %s tokens (saved %s, %.0f%%)",
+        filename, stats["tokens_before"], stats["tokens_after"], stats["tokens_saved"], stats["saved_ratio"] * 100,
+    )
+    prompt = build_resume_prompt(compact)
+
+    raw_output = call_gemini_llm(prompt)
+    logger.debug("Gemini raw output for %s: %s", filename, raw_output)
+
+    if isinstance(raw_output, dict) and "error" in raw_output:
+        raise AIParseError({"error": raw_output["error"]})
+
+    raw_text = raw_output  # Gemini returns a plain string
+
+    cleaned = (
+        raw_text.replace("```json", "")
+                .replace("```", "")
+                .strip()
+    )
+
+    try:
+        return text, fill_contact(json.loads(cleaned), contact)
+    except Exception as e:
+        raise AIParseError({
+            "error": "Failed to parse JSON",
+            "exception": str(e),
+            "raw_output": raw_text
+        })
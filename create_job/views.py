@@ -7,11 +7,11 @@ from .models import Skills , Country , State,Client
 from .serializers import  SkillsSerializer , CountryWithStatesSerializer,ClientSerializer
 
 from rest_framework.parsers import MultiPartParser
-from .utils.extractors import extract_text_from_pdf, extract_text_from_docx
-from .utils.parser import parse_resume
-import json
-from .utils.prompt_builder import build_resume_prompt
-from .utils.llm_gemini import call_gemini_llm
+from .utils import llm_gemini, parser as keyword_parser
+from .utils.resume_parsers import (
+    AI_EXTRACTORS, KEYWORD_EXTRACTORS, AIParseError, file_extension, gemini_parse, keyword_parse,
+)
+from form_data.parse_cache import cached_parse, read_upload
 
 # -------------------- SKILLS API --------------------
 class SkillsAPIView(APIView):
@@ -76,64 +76,35 @@ class ResumeParserView(APIView):
         if not file:
             return Response({"error": "No file uploaded"}, status=400)
 
-        ext = file.name.split(".")[-1].lower()
-        if ext == "pdf":
-            text, diag = extract_text_from_pdf(file)
-            parsed = {"raw_text": text[:4000]}
-        elif ext in ("docx", "doc"):
-            text, diag = extract_text_from_docx(file)
-            parsed = {"raw_text": text[:4000]}
-        else:
+        if file_extension(file.name) not in KEYWORD_EXTRACTORS:
             return Response({"error": "Unsupported file type"}, status=400)
-        
-        parsed_data = parse_resume(text)
+
+        # Keyed by the file's SHA-256: re-opening or re-running a CV skips extraction
+        _, parsed_data, _ = cached_parse(
+            keyword_parser.PARSER_NAME, keyword_parser.PARSER_VERSION, read_upload(file),
+            lambda: keyword_parse(file, file.name),
+        )
 
         return Response({"response": parsed_data})
 
+
 class ResumeAIParserView(APIView):
     def post(self, request):
         file = request.FILES.get("resume")
         if not file:
             return Response({"error": "No file uploaded"}, status=400)
 
-        ext = file.name.split(".")[-1].lower()
-        file.seek(0)
-
-        if ext == "pdf":
-            text, diag = extract_text_from_pdf(file)
-        elif ext == "docx":
-            text, diag = extract_text_from_docx(file)
-        else:
+        if file_extension(file.name) not in AI_EXTRACTORS:
             return Response({"error": "Only PDF and DOCX supported"}, status=400)
 
-        if not isinstance(text, str) or not text.strip():
-            return Response({"error": "Could not extract text"}, status=500)
-
-        prompt = build_resume_prompt(text)
-
-        raw_output = call_gemini_llm(prompt)
-        print("Gemini Raw Output:", raw_output)
-
-
-        if isinstance(raw_output, dict) and "error" in raw_output:
-            return Response({"error": raw_output["error"]}, status=500)
-
-        raw_text = raw_output  # Gemini returns a plain string
-
-        cleaned = (
-            raw_text.replace("```json", "")
-                    .replace("```", "")
-                    .strip()
-        )
-
+        # A cache hit skips both the extraction and the Gemini call
         try:
-            parsed_json = json.loads(cleaned)
-        except Exception as e:
-            return Response({
-                "error": "Failed to parse JSON",
-                "exception": str(e),
-                "raw_output": raw_text
-            }, status=500)
+            _, parsed_json, _ = cached_parse(
+                llm_gemini.PARSER_NAME, llm_gemini.PARSER_VERSION, read_upload(file),
+                lambda: gemini_parse(file, file.name),
+            )
+        except AIParseError as exc:
+            return Response(exc.payload, status=500)
 
         return Response({"parsed": parsed_json}, status=200)
 
@@ -11,81 +11,327 @@ Enhanced CV extractor that explicitly extracts:
 - SKILLS (list)
 
 Exports:
-- process_file(path, phone_region=None, out_dir=None) -> result_meta (writes <stem>_CV.json and CV.json)
+- process_file(path_or_buffer, phone_region=None, out_dir=None, filename=None, save=None) -> result_meta
+  (writes <stem>_CV.json and CV.json for paths; for in-memory buffers only when out_dir is given)
 - extract_all(text, phone_region=None) -> dict (structured)
+- parse_paths(paths_or_buffers, phone_region=None) -> [result_meta | failure] (NER batched via nlp.pipe)
+- extract_names_many(texts) -> [[name, ...], ...]
+- run_batch(source, sink, workers=None) -> stats (directory / manifest -> JSONL, resumable)
 """
 
 import sys
+import os
 import re
 import json
+import hashlib
+import multiprocessing
+import threading
+import time
 import argparse
+from functools import lru_cache
+from io import BytesIO
+from bisect import bisect_right
 from pathlib import Path
 from collections import Counter
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-# OCR & PDF
-import pytesseract
-from pdf2image import convert_from_path
+# OCR & PDF (pytesseract / pdf2image are imported where OCR runs: text-layer PDFs, DOCX and
+# TXT do not need them)
 from PIL import Image
-from PyPDF2 import PdfReader
 
-# NLP & utilities
-import spacy
+# Text layer of PDF / DOCX files (shared with the web app's parsers)
+import text_extraction
+
+# NLP & utilities (spaCy is imported by get_nlp(), on first use)
 import phonenumbers
-import dateparser
-from dateutil import parser as date_parser
 
-nlp = spacy.load("en_core_web_sm")
+# spaCy is only used for PERSON entities: import and load it lazily, without the other components
+SPACY_MODEL = os.getenv("CV_SPACY_MODEL", "en_core_web_sm")
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+# Names are looked for in the CV header only
+NAME_HEADER_LINES = 15
+NAME_HEADER_CHARS = 1500
+
+_nlp = None
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        import spacy
+
+        nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+        # tok2vec only costs time unless NER listens to it (en_core_web_sm's NER has its own)
+        if "tok2vec" in nlp.pipe_names and "ner" not in nlp.get_pipe("tok2vec").listening_components:
+            nlp.disable_pipe("tok2vec")
+        _nlp = nlp
+    return _nlp
+
+
+def model_loaded():
+    return _nlp is not None
+
+
+def warm_up():
+    """Load the spaCy model and check tesseract now instead of on the first CV.
+
+    Servers call this before forking workers so they all share the loaded model.
+    """
+    import pytesseract
+
+    get_nlp()
+    pytesseract.get_tesseract_version()
+
+_dateparser = None
+
+
+def get_dateparser():
+    global _dateparser
+    if _dateparser is None:
+        import dateparser
+        _dateparser = dateparser
+    return _dateparser
 
 # ---------------- regex / keywords ----------------
 EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 YEAR_RANGE_RE = re.compile(r"\b(19|20)\d{2}(?:\s*[-–—]\s*(?:19|20)\d{2})?\b")
 SINGLE_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
 
-SECTION_HEADERS = [
-    "contact", "contact info", "contact information",
-    "languages", "language",
-    "projects", "personal projects", "selected projects",
-    "experience", "work experience", "professional experience", "employment history",
-    "education", "qualifications", "academic",
-    "skills", "technical skills", "key skills", "core skills",
-    "summary", "profile", "objective"
-]
+# Dates: the common resume formats are normalised by these patterns; anything else
+# inside a matched span goes to dateparser (imported on first use)
+MONTHS = {
+    name: i + 1 for i, name in enumerate(
+        ["january", "february", "march", "april", "may", "june",
+         "july", "august", "september", "october", "november", "december"])
+}
+MONTHS_BY_ABBR = {name[:3]: number for name, number in MONTHS.items()}
+_MONTH = "|".join(sorted({n for m in MONTHS for n in (m, m[:3])} | {"sept"}, key=len, reverse=True))
+_YEAR = r"(?:19|20)\d{2}"
+_ORDINAL_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+# "Jan'20" / "Mar ’21": two-digit years only after an apostrophe
+_SHORT_YEAR = r"['’]\s*\d{2}"
+_DATE = (
+    rf"(?:(?:{_ORDINAL_DAY}\s+)?\b(?:{_MONTH})\b\.?(?:\s+{_ORDINAL_DAY})?\s*(?:[,'’]?\s*{_YEAR}|{_SHORT_YEAR})"
+    rf"|\b(?:0?[1-9]|1[0-2])[/.\-]{_YEAR}"
+    rf"|\b{_YEAR}[/.](?:0?[1-9]|1[0-2])\b"
+    rf"|\b{_YEAR}-(?:0[1-9]|1[0-2])\b"
+    rf"|\b{_YEAR})\b"
+)
+_PRESENT = r"present|current|currently|now|ongoing|till date|to date"
+DATE_SPAN_RE = re.compile(
+    rf"(?P<start>{_DATE})(?:\s*(?:-|–|—|~|\bto\b|\btill\b|\buntil\b)\s*"
+    rf"(?P<end>{_DATE}|\b(?:{_PRESENT})\b|\d{{2}}\b(?![/.\-]\d)))?",
+    re.I,
+)
+# "2008-12" is 2008 to 2012 when the two digits are past the start year, else December 2008
+YEAR_SHORT_RANGE_RE = re.compile(rf"({_YEAR})\s*[-–—]\s*(\d{{2}})")
+MONTH_YEAR_RE = re.compile(
+    rf"(?:{_ORDINAL_DAY}\s+)?({_MONTH})\.?(?:\s+{_ORDINAL_DAY})?\s*(?:[,'’]?\s*({_YEAR})|['’]\s*(\d{{2}}))"
+)
+NUM_MONTH_YEAR_RE = re.compile(rf"(0?[1-9]|1[0-2])[/.\-]({_YEAR})")
+YEAR_NUM_MONTH_RE = re.compile(rf"({_YEAR})[/.\-](0?[1-9]|1[0-2])")
+PRESENT_RE = re.compile(rf"(?:{_PRESENT})")
+# fast: normalised by the patterns; fallback: sent to dateparser; failed: dateparser gave up too
+DATE_STATS = Counter()
+
+# Section key -> header keywords (matched as substrings of the lower-cased line)
+SECTION_KEYWORDS = {
+    "contact": ["contact", "contact information", "contact info"],
+    "languages": ["languages", "language"],
+    "projects": ["projects", "personal projects", "selected projects"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "work history"],
+    "education": ["education", "academic", "qualifications", "qualification"],
+    "skills": ["skills", "technical skills", "key skills", "core skills"],
+    "profile": ["profile", "summary", "professional summary", "objective"],
+}
+SECTION_HEADERS = [kw for kws in SECTION_KEYWORDS.values() for kw in kws]
+_SECTION_OF_KEYWORD = {kw: key for key, kws in SECTION_KEYWORDS.items() for kw in kws}
+# One alternation for every keyword, longest first, so each line is scanned once
+SECTION_RE = re.compile("|".join(re.escape(kw) for kw in sorted(SECTION_HEADERS, key=len, reverse=True)))
+# Longer lines are body text even when they mention a keyword ("5 years of experience")
+SECTION_HEADER_MAX_WORDS = 4
+# "Languages: English, Hindi": a section label with its content on the same line
+INLINE_HEADER_RE = re.compile(rf"\s*({SECTION_RE.pattern})\s*:\s*(.*)", re.I)
 
 # Additional heuristics:
 ADDRESS_KEYWORDS = ["address", "location", "city", "state", "country", "pin", "zipcode", "postal"]
+ADDRESS_RE = re.compile("|".join(ADDRESS_KEYWORDS))
+
+# OCR: pages are rendered one at a time at the first DPI of the ladder and re-rendered at
+# the next one while tesseract's mean word confidence stays below CV_OCR_MIN_CONFIDENCE
+OCR_DPI_LADDER = [int(d) for d in os.getenv("CV_OCR_DPI_LADDER", "150,300").split(",") if d.strip()]
+OCR_MIN_CONFIDENCE = float(os.getenv("CV_OCR_MIN_CONFIDENCE", 70))
+OCR_WORKERS = int(os.getenv("CV_OCR_WORKERS", min(4, os.cpu_count() or 1)))
+# A page whose text layer has fewer characters than this is OCRed
+MIN_PAGE_TEXT_CHARS = 20
+
+# Bump when extraction or field parsing changes; cached results of older versions are ignored
+PARSER_VERSION = "8"
+# Parsed CVs are cached here by SHA-256 of the file bytes (unset = no cache)
+CACHE_DIR = os.getenv("CV_CACHE_DIR")
+
+
+# ---------------- parse cache ----------------
+def cache_path(cache_dir, data: bytes, phone_region=None):
+    digest = hashlib.sha256(data).hexdigest()
+    key = f"{digest}-v{PARSER_VERSION}-{(phone_region or '').upper()}"
+    return Path(cache_dir) / digest[:2] / f"{key}.json"
+
+
+def read_cache(path: Path):
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(path: Path, entry):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def clear_cache(cache_dir):
+    """Delete every cached parse (use after changing parser logic without a version bump)."""
+    removed = 0
+    for path in Path(cache_dir).glob("*/*.json"):
+        path.unlink()
+        removed += 1
+    return removed
 
 
 # ---------------- PDF / OCR helpers ----------------
 def pdf_has_text(path: Path) -> bool:
     try:
-        reader = PdfReader(str(path))
-        for p in reader.pages:
-            txt = p.extract_text()
-            if txt and txt.strip():
-                return True
-        return False
+        return bool(text_extraction.extract_file(path, fmt=text_extraction.PDF).text.strip())
     except Exception:
         return False
 
 
-def extract_text_from_pdf(path: Path):
-    try:
-        reader = PdfReader(str(path))
-        pages = [p.extract_text() for p in reader.pages]
-        text = "\n\n".join([p for p in pages if p])
-        if text.strip():
-            return text
-    except Exception:
-        pass
-    return ocr_pdf(path)
+def _ocr_image(image):
+    """OCR one image; returns (text, mean word confidence)."""
+    import pytesseract
 
+    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+    lines = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+        conf = float(data["conf"][i])
+        if conf >= 0:
+            confidences.append(conf)
 
-def ocr_pdf(path: Path, dpi=300):
-    pages = convert_from_path(str(path), dpi=dpi)
     parts = []
-    for page in pages:
-        parts.append(pytesseract.image_to_string(page))
-    return "\n\n".join(parts)
+    previous_block = None
+    for (block, par, line), words in lines.items():
+        if previous_block is not None and block != previous_block:
+            parts.append("")
+        parts.append(" ".join(words))
+        previous_block = block
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return "\n".join(parts), confidence
+
+
+# PyMuPDF keeps global state and is not thread-safe: render one page at a time
+_render_lock = threading.Lock()
+
+
+def _is_path(source):
+    return isinstance(source, (str, Path))
+
+
+def render_page(source, page_number: int, dpi: int):
+    """One PDF page (1-based) as a grayscale image, or None past the last page.
+
+    Paths are rendered by poppler; in-memory PDFs by PyMuPDF, so nothing touches the disk.
+    """
+    from pdf2image import convert_from_bytes, convert_from_path
+
+    if _is_path(source):
+        images = convert_from_path(str(source), dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True)
+        return images[0] if images else None
+    try:
+        import pymupdf
+    except ImportError:
+        try:
+            import fitz as pymupdf
+        except ImportError:
+            images = convert_from_bytes(bytes(source), dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True)
+            return images[0] if images else None
+    with _render_lock:
+        with pymupdf.open(stream=source, filetype="pdf") as doc:
+            if page_number > doc.page_count:
+                return None
+            pix = doc[page_number - 1].get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY)
+            return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def pdf_page_count(source):
+    from pdf2image import pdfinfo_from_bytes, pdfinfo_from_path
+
+    if _is_path(source):
+        return pdfinfo_from_path(str(source))["Pages"]
+    return pdfinfo_from_bytes(bytes(source))["Pages"]
+
+
+def ocr_page(source, page_number: int, dpi_ladder=None):
+    """OCR one page (1-based), stepping up the DPI ladder until the confidence is good enough."""
+    best = ("", -1.0)
+    for dpi in dpi_ladder or OCR_DPI_LADDER:
+        image = render_page(source, page_number, dpi)
+        if image is None:
+            break
+        text, confidence = _ocr_image(image)
+        image.close()
+        if confidence > best[1]:
+            best = (text, confidence)
+        if confidence >= OCR_MIN_CONFIDENCE:
+            break
+    return best[0]
+
+
+def ocr_pages(source, page_numbers, workers=None, dpi_ladder=None):
+    """OCR the given pages in parallel; only `workers` rendered pages are in memory at once."""
+    workers = max(1, min(workers or OCR_WORKERS, len(page_numbers)))
+    if workers == 1:
+        return [ocr_page(source, n, dpi_ladder) for n in page_numbers]
+    # tesseract and pdftoppm run as subprocesses, so threads are enough to use several cores
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda n: ocr_page(source, n, dpi_ladder), page_numbers))
+
+
+def extract_text_from_pdf(source):
+    """Text layer of every page, OCR for the pages that have none. `source`: a path or the PDF's bytes."""
+    if _is_path(source):
+        extracted = text_extraction.extract_file(source, fmt=text_extraction.PDF)
+    else:
+        extracted = text_extraction.extract(source, fmt=text_extraction.PDF)
+    if extracted.pages is not None:
+        pages = list(extracted.pages)
+    else:
+        # No backend could read the PDF; poppler may still render it for OCR
+        pages = [""] * pdf_page_count(source)
+
+    missing = [i for i, text in enumerate(pages) if len(text.strip()) < MIN_PAGE_TEXT_CHARS]
+    if missing:
+        print(f"OCR on {len(missing)} of {len(pages)} PDF page(s) without a text layer.")
+        for i, text in zip(missing, ocr_pages(source, [i + 1 for i in missing])):
+            if len(text.strip()) > len(pages[i].strip()):
+                pages[i] = text
+    return "\n\n".join([p for p in pages if p])
+
+
+def ocr_pdf(source, dpi=None):
+    """OCR every page of a PDF (page by page, in parallel)."""
+    page_count = pdf_page_count(source)
+    return "\n\n".join(ocr_pages(source, range(1, page_count + 1), dpi_ladder=[dpi] if dpi else None))
 
 
 def load_text_file(path: Path):
@@ -95,19 +341,38 @@ def load_text_file(path: Path):
 def load_file(path: Path):
     ext = path.suffix.lower()
     if ext == ".pdf":
-        if pdf_has_text(path):
-            print("PDF has selectable text — extracting without OCR.")
-        else:
-            print("No selectable text detected — using OCR on PDF.")
         return extract_text_from_pdf(path)
     if ext in (".txt", ".md"):
         return load_text_file(path)
+    if ext == ".docx":
+        return text_extraction.extract_file(path, fmt=text_extraction.DOCX).text
     # try image
+    import pytesseract
+
     try:
         img = Image.open(str(path))
         return pytesseract.image_to_string(img)
     except Exception:
-        raise ValueError("Unsupported file type. Provide PDF/TXT/Image.")
+        raise ValueError("Unsupported file type. Provide PDF/DOCX/TXT/Image.")
+
+
+def load_bytes(data, filename: str):
+    """load_file() for a file held in memory (bytes / bytearray / memoryview); no temp files."""
+    ext = Path(filename).suffix.lower()
+    if ext == ".pdf":
+        return extract_text_from_pdf(data)
+    if ext in (".txt", ".md"):
+        return str(data, "utf-8", errors="ignore")
+    if ext == ".docx":
+        return text_extraction.extract(data, fmt=text_extraction.DOCX).text
+    # try image
+    import pytesseract
+
+    try:
+        img = Image.open(BytesIO(data))
+        return pytesseract.image_to_string(img)
+    except Exception:
+        raise ValueError("Unsupported file type. Provide PDF/DOCX/TXT/Image.")
 
 
 # ---------------- basic extractors ----------------
@@ -128,51 +393,159 @@ def extract_urls(text: str):
     return list(dict.fromkeys(re.findall(r"https?://[^\s,)\]]+", text)))
 
 
-def extract_names(text: str, top_n=5):
-    doc = nlp(text)
+def header_region(text: str):
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    return "\n".join(lines[:NAME_HEADER_LINES])[:NAME_HEADER_CHARS]
+
+
+def _person_names(doc, top_n):
     people = [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
     freq = Counter(people)
     return [name for name, _ in freq.most_common(top_n)]
 
 
-# ---------------- section helper ----------------
-def find_section(lines, start_idx):
-    """Return section block from start_idx until next likely section header.
-    lines: list of stripped lines.
-    start_idx: index of header line."""
-    block = []
-    for i in range(start_idx + 1, len(lines)):
-        ln = lines[i]
-        # if next line looks like another header -> stop
-        low = ln.strip().lower()
-        # treat lines that look like headers: short and alphabetic OR contain one of known section keywords
-        if (len(ln.split()) <= 4 and ln.isupper()) or any(h in low for h in SECTION_HEADERS):
-            break
-        block.append(ln)
-    return block
+def extract_names(text: str, top_n=5):
+    return _person_names(get_nlp()(header_region(text)), top_n)
+
+
+def extract_names_many(texts, top_n=5, batch_size=32):
+    """extract_names() for many CVs at once, batched through nlp.pipe."""
+    docs = get_nlp().pipe((header_region(t) for t in texts), batch_size=batch_size)
+    return [_person_names(doc, top_n) for doc in docs]
+
+
+# ---------------- dates ----------------
+@lru_cache(maxsize=4096)
+def normalize_date(fragment: str):
+    """"Jan 2021" / "1st Jan 2021" / "Jan'21" -> "2021-01", "03/2020" -> "2020-03", "2019" -> "2019",
+    "Present" -> "present".
+
+    Returns None when even dateparser cannot read it. Memoised: resumes repeat dates a lot.
+    """
+    s = " ".join(fragment.lower().split())
+    if PRESENT_RE.fullmatch(s):
+        DATE_STATS["fast"] += 1
+        return "present"
+    m = MONTH_YEAR_RE.fullmatch(s)
+    if m:
+        DATE_STATS["fast"] += 1
+        # Two-digit years follow strptime's %y pivot: 69-99 -> 19xx, 00-68 -> 20xx
+        year = m.group(2) or datetime.strptime(m.group(3), "%y").year
+        return f"{year}-{MONTHS_BY_ABBR[m.group(1)[:3]]:02d}"
+    m = NUM_MONTH_YEAR_RE.fullmatch(s)
+    if m:
+        DATE_STATS["fast"] += 1
+        return f"{m.group(2)}-{int(m.group(1)):02d}"
+    m = YEAR_NUM_MONTH_RE.fullmatch(s)
+    if m:
+        DATE_STATS["fast"] += 1
+        return f"{m.group(1)}-{int(m.group(2)):02d}"
+    if SINGLE_YEAR_RE.fullmatch(s):
+        DATE_STATS["fast"] += 1
+        return s
+
+    DATE_STATS["fallback"] += 1
+    parsed = get_dateparser().parse(s, languages=["en"], settings={"REQUIRE_PARTS": ["year"]})
+    if parsed is None:
+        DATE_STATS["failed"] += 1
+        return None
+    return parsed.strftime("%Y-%m")
+
+
+def date_stats():
+    """Counters of normalize_date(): fast-path vs dateparser fallbacks, plus memo hits."""
+    stats = dict(DATE_STATS)
+    stats["memo_hits"] = normalize_date.cache_info().hits
+    parsed = DATE_STATS["fast"] + DATE_STATS["fallback"]
+    stats["fallback_ratio"] = round(DATE_STATS["fallback"] / parsed, 4) if parsed else 0.0
+    return stats
+
+
+def find_date_span(text: str):
+    """First date or date range in the text: {"text", "start", "end"} (end None for a single date)."""
+    m = DATE_SPAN_RE.search(text)
+    if not m:
+        return None
+    start, end = m.group("start"), m.group("end")
+    short = YEAR_SHORT_RANGE_RE.fullmatch(f"{start}-{end}" if end else start)
+    short_end = _short_range_end(*short.groups()) if short else None
+    if short_end:
+        return {"text": m.group(0), "start": short.group(1), "end": short_end}
+    if end and len(end) == 2:
+        # Two digits only end a bare-year range ("2015-19"); anything else is not a date
+        return {"text": m.group(0)[:m.end("start") - m.start()], "start": normalize_date(start), "end": None}
+    return {
+        "text": m.group(0),
+        "start": normalize_date(start),
+        "end": normalize_date(end) if end else None,
+    }
 
 
-def locate_section_by_keywords(lines, keywords):
-    """Return tuple (start_index, header_line) or (None, None)."""
+def _short_range_end(year, yy):
+    """"2008", "12" -> "2012"; None when the two digits are not past the start year."""
+    if int(yy) <= int(year) % 100:
+        return None
+    return str(int(year) // 100 * 100 + int(yy))
+
+
+# ---------------- section segmenter ----------------
+def line_sections(line):
+    """Section keys whose header keywords occur in the line (one regex scan)."""
+    return [_SECTION_OF_KEYWORD[m.group(0)] for m in SECTION_RE.finditer(line.lower())]
+
+
+def segment_lines(lines):
+    """Label every line once and cut the section blocks.
+
+    Header-like lines are those of at most SECTION_HEADER_MAX_WORDS words and inline
+    labels ("Languages: English, Hindi", whose text after the colon opens the block).
+    A section is made of the blocks under each of its header-like lines, so a heading
+    repeated on a later page continues it; without such a header it starts at the
+    first line mentioning one of its keywords. A block runs until the next header-like
+    line with a section keyword, or all caps. Returns {key: {"header": line, "lines": [...]}}.
+    """
+    starts = {}
+    mentioned = {}
+    boundaries = []
     for i, ln in enumerate(lines):
-        low = ln.lower()
-        for k in keywords:
-            if k in low:
-                return i, ln
-    return None, None
+        inline = INLINE_HEADER_RE.match(ln)
+        # An inline label names its own section; keywords in its content do not count
+        keys = [_SECTION_OF_KEYWORD[inline.group(1).lower()]] if inline else line_sections(ln)
+        header_like = inline is not None or len(ln.split()) <= SECTION_HEADER_MAX_WORDS
+        if header_like and (keys or ln.isupper()):
+            boundaries.append(i)
+        for key in keys:
+            if header_like:
+                starts.setdefault(key, []).append(i)
+            else:
+                mentioned.setdefault(key, i)
+    for key, i in mentioned.items():
+        starts.setdefault(key, [i])
+
+    sections = {}
+    for key, indices in starts.items():
+        block = []
+        for idx in dict.fromkeys(indices):
+            inline = INLINE_HEADER_RE.match(lines[idx])
+            if inline and inline.group(2).strip():
+                block.append(inline.group(2).strip())
+            nxt = bisect_right(boundaries, idx)
+            end = boundaries[nxt] if nxt < len(boundaries) else len(lines)
+            block.extend(lines[idx + 1:end])
+        sections[key] = {"header": lines[indices[0]], "lines": block}
+    return sections
 
 
 # ---------------- parse specific sections ----------------
-def parse_contact(text, region_hint=None):
+def parse_contact(text, region_hint=None, lines=None):
     emails = extract_emails(text)
     phones = extract_phones(text, region_hint)
     # Heuristic address extraction: lines containing address keywords or long lines near top of resume
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    lines = [l.strip() for l in (lines if lines is not None else text.splitlines()) if l.strip()]
     address_lines = []
     # search near top for lines containing address keywords or numbers (pin)
     for ln in lines[:12]:
-        low = ln.lower()
-        if any(k in low for k in ADDRESS_KEYWORDS) or re.search(r"\b\d{5,6}\b", ln):
+        if ADDRESS_RE.search(ln.lower()) or re.search(r"\b\d{5,6}\b", ln):
             address_lines.append(ln)
     # fallback: lines between name/header and "Summary" or "Experience"
     if not address_lines and len(lines) >= 6:
@@ -219,7 +592,13 @@ def parse_education(block_lines):
         yr_match = SINGLE_YEAR_RE.search(ln)
         if yr_match:
             year = yr_match.group(0)
-        items.append({"text": ln.strip(), "year": year})
+        span = find_date_span(ln)
+        items.append({
+            "text": ln.strip(),
+            "year": year,
+            "start": span["start"] if span else None,
+            "end": span["end"] if span else None,
+        })
     return items
 
 
@@ -265,12 +644,7 @@ def parse_experience(block_lines):
     parsed = []
     for e in entries_text:
         # Try to extract dates and role/company
-        dates = YEAR_RANGE_RE.findall(e)
-        # find first year-range or single years
-        date_hit = YEAR_RANGE_RE.search(e)
-        if not date_hit:
-            date_hit = SINGLE_YEAR_RE.search(e)
-        date_text = date_hit.group(0) if date_hit else None
+        span = find_date_span(e)
 
         # Try to split first line by "—" or "-" or " at " or "," to get role and company
         first_line = e.splitlines()[0] if e.splitlines() else e
@@ -300,7 +674,9 @@ def parse_experience(block_lines):
             "raw": e,
             "role": role,
             "company": company,
-            "dates": date_text,
+            "dates": span["text"] if span else None,
+            "start": span["start"] if span else None,
+            "end": span["end"] if span else None,
         })
     return parsed
 
@@ -339,37 +715,12 @@ def parse_projects(block_lines):
 # ---------------- overall extraction ----------------
 def find_sections_blocks(text: str):
     lines = [l.rstrip() for l in text.splitlines() if l.strip()]
-    # make lower map for quick header detection
-    lower_lines = [l.lower() for l in lines]
-    sections = {}
-    # For each header we care about, try to find it
-    desired = {
-        "contact": ["contact", "contact information", "contact info"],
-        "languages": ["languages", "language"],
-        "projects": ["projects", "personal projects", "selected projects"],
-        "experience": ["experience", "work experience", "professional experience", "employment history", "work history"],
-        "education": ["education", "academic", "qualifications", "qualification"],
-        "skills": ["skills", "technical skills", "key skills", "core skills"],
-        "profile": ["profile", "summary", "professional summary", "objective"]
-    }
-    # find indices
-    header_indices = {}
-    for i, low in enumerate(lower_lines):
-        for key, kws in desired.items():
-            for kw in kws:
-                if kw in low:
-                    # prefer first occurrence
-                    if key not in header_indices:
-                        header_indices[key] = i
-    # Now capture blocks for each header using find_section logic
-    for key, idx in header_indices.items():
-        block = find_section(lines, idx)
-        sections[key] = {"header": lines[idx], "lines": block}
     # Also return whole lines for fallback parsing
-    return sections, lines
+    return segment_lines(lines), lines
 
 
-def extract_all(text: str, phone_region: str = None):
+def extract_all(text: str, phone_region: str = None, name_candidates=None):
+    """`name_candidates` may be passed in when they were computed in a batch (extract_names_many)."""
     # basic normalizations
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     result = {}
@@ -377,13 +728,13 @@ def extract_all(text: str, phone_region: str = None):
     result["emails"] = extract_emails(text)
     result["phones"] = extract_phones(text, phone_region)
     result["urls"] = extract_urls(text)
-    result["name_candidates"] = extract_names(text, top_n=8)
+    result["name_candidates"] = name_candidates if name_candidates is not None else extract_names(text, top_n=8)
 
     # find section blocks
     sections_map, all_lines = find_sections_blocks(text)
 
     # CONTACT
-    contact_data = parse_contact(text, phone_region)
+    contact_data = parse_contact(text, phone_region, all_lines)
     # prefer contact block lines if present
     contact_block = sections_map.get("contact", {}).get("lines")
     if contact_block:
@@ -398,8 +749,7 @@ def extract_all(text: str, phone_region: str = None):
         # capture address-like lines
         addr = []
         for ln in contact_block:
-            low = ln.lower()
-            if any(k in low for k in ADDRESS_KEYWORDS) or re.search(r"\d{5,6}", ln) or (len(ln.split()) > 3 and any(c.isdigit() for c in ln)):
+            if ADDRESS_RE.search(ln.lower()) or re.search(r"\d{5,6}", ln) or (len(ln.split()) > 3 and any(c.isdigit() for c in ln)):
                 addr.append(ln)
         if addr:
             contact_data["addresses"] = list(dict.fromkeys(addr))
@@ -454,37 +804,258 @@ def extract_all(text: str, phone_region: str = None):
 
 
 # ---------------- save / process ----------------
-def process_file(path, phone_region=None, out_dir=None):
-    path = Path(path)
+def _result_meta(source, fields):
+    return {
+        "source_file": str(source),
+        "extracted_with": "cv_extractor_save.py (enhanced sections)",
+        "fields": fields
+    }
+
+
+class CVParseError(ValueError):
+    """A CV that could not be parsed; error_type names the exception raised inside cv."""
+
+    def __init__(self, message, error_type):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+
+def _failure(source, exc):
+    return {"source_file": str(source), "error": str(exc), "error_type": exc.__class__.__name__}
+
+
+def parse_paths(files, phone_region=None, cache_dir=CACHE_DIR):
+    """Extract the fields of several CVs without writing any output files.
+
+    `files` holds paths and/or (filename, bytes | memoryview) pairs for CVs already in
+    memory. Name candidates of the files that are not cached come from one nlp.pipe batch.
+    Returns one entry per file: its result dict, or a failure dict ({"source_file",
+    "error", "error_type"}). No exception objects are kept: their tracebacks would hold
+    the callers' buffers alive.
+    """
+    results = [None] * len(files)
+    pending = []
+    for i, item in enumerate(files):
+        try:
+            if isinstance(item, tuple):
+                source, data = item
+            else:
+                source, data = Path(item), None
+            entry_path = None
+            if cache_dir:
+                entry_path = cache_path(cache_dir, source.read_bytes() if data is None else data, phone_region)
+            cached = read_cache(entry_path) if entry_path else None
+            if cached is not None:
+                results[i] = _result_meta(source, cached["fields"])
+            else:
+                text = load_file(source) if data is None else load_bytes(data, source)
+                pending.append((i, source, text, entry_path))
+        except Exception as exc:
+            results[i] = _failure(item[0] if isinstance(item, tuple) else item, exc)
+
+    names = extract_names_many([text for _, _, text, _ in pending], top_n=8)
+    for (i, source, text, entry_path), name_candidates in zip(pending, names):
+        try:
+            fields = extract_all(text, phone_region, name_candidates=name_candidates)
+            if entry_path:
+                write_cache(entry_path, {"text": text, "fields": fields})
+            results[i] = _result_meta(source, fields)
+        except Exception as exc:
+            results[i] = _failure(source, exc)
+    return results
+
+
+def _as_input(source, filename=None):
+    if _is_path(source):
+        return source
+    return (filename or "upload", source)
+
+
+def parse_path(source, phone_region=None, cache_dir=CACHE_DIR, filename=None):
+    """Extract the fields of one CV (a path, or its bytes named by `filename`) without writing any output files."""
+    result = parse_paths([_as_input(source, filename)], phone_region, cache_dir)[0]
+    if "error" in result:
+        raise CVParseError(result["error"], result["error_type"])
+    return result
+
+
+def _write_json(path: Path, data):
+    # Write then rename, so concurrent writers never leave a half-written file behind
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def write_outputs(result_meta, out_dir):
+    path = Path(result_meta["source_file"])
     out_dir = Path(out_dir) if out_dir else path.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    text = load_file(path)
-    fields = extract_all(text, phone_region)
+    _write_json(out_dir / f"{path.stem}_CV.json", result_meta)
+    _write_json(out_dir / "CV.json", result_meta)
 
-    result_meta = {
-        "source_file": str(path),
-        "extracted_with": "cv_extractor_save.py (enhanced sections)",
-        "fields": fields
-    }
 
-    per_file = out_dir / f"{path.stem}_CV.json"
-    generic = out_dir / "CV.json"
-    with per_file.open("w", encoding="utf-8") as f:
-        json.dump(result_meta, f, indent=2, ensure_ascii=False)
-    with generic.open("w", encoding="utf-8") as f:
-        json.dump(result_meta, f, indent=2, ensure_ascii=False)
+def process_file(source, phone_region=None, out_dir=None, cache_dir=CACHE_DIR, filename=None, save=None):
+    """Parse one CV: a path, or its bytes / memoryview (named by `filename`).
 
+    Result files are written when `save` is true. By default they are for paths (into
+    out_dir or next to the file) and, for in-memory CVs, only when out_dir is given.
+    """
+    result_meta = parse_path(source, phone_region, cache_dir, filename)
+    if save is None:
+        save = _is_path(source) or out_dir is not None
+    if save:
+        write_outputs(result_meta, out_dir)
     return result_meta
 
 
+# ---------------- batch mode ----------------
+BATCH_SUFFIXES = {".pdf", ".docx", ".txt", ".md", ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp"}
+
+# Per-worker settings, filled in by _init_batch_worker()
+_batch_options = {}
+
+
+def iter_batch_inputs(source):
+    """CV paths from a directory (recursive) or a manifest file (one path per line, # comments)."""
+    source = Path(source)
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.is_file() and path.suffix.lower() in BATCH_SUFFIXES:
+                yield path
+        return
+    with source.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                path = Path(line)
+                yield path if path.is_absolute() else source.parent / path
+
+
+def load_completed(sink):
+    """source_file of every successful record already in the JSONL sink."""
+    done = set()
+    sink = Path(sink)
+    if not sink.exists():
+        return done
+    with sink.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line of an interrupted run
+            if record.get("ok"):
+                done.add(record["source_file"])
+    return done
+
+
+def _end_with_newline(sink: Path):
+    """Do not glue the first new record onto a line torn by an interruption."""
+    if not sink.exists() or not sink.stat().st_size:
+        return
+    with sink.open("rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _init_batch_worker(phone_region, cache_dir):
+    global OCR_WORKERS
+    _batch_options.update(phone_region=phone_region, cache_dir=cache_dir)
+    # Files are already spread over processes; OCR pages of one file sequentially
+    OCR_WORKERS = 1
+    # Load the spaCy model once per worker, not once per file
+    get_nlp()
+
+
+def _batch_parse(paths):
+    started = time.perf_counter()
+    dates_before = Counter(DATE_STATS)
+    try:
+        results = parse_paths(paths, _batch_options.get("phone_region"), _batch_options.get("cache_dir"))
+    except Exception as exc:
+        results = [_failure(path, exc) for path in paths]
+    seconds = round((time.perf_counter() - started) / len(paths), 3)
+
+    records = []
+    for path, result in zip(paths, results):
+        if "error" in result:
+            record = {"source_file": str(path), "ok": False, "error": f"{result['error_type']}: {result['error']}"}
+        else:
+            record = dict(result, ok=True)
+        record["seconds"] = seconds
+        records.append(record)
+    # Date counters live in the worker process; hand this chunk's share back to the parent
+    return records, DATE_STATS - dates_before
+
+
+def run_batch(source, sink, workers=None, phone_region=None, cache_dir=CACHE_DIR, chunksize=8):
+    """Parse every CV under `source` into one JSONL file, one record per line.
+
+    Workers take `chunksize` files at a time and run NER over them in one batch. Files already recorded as ok in `sink` are skipped, so an interrupted run can
+    simply be started again; failed files are retried. Returns the run statistics.
+    """
+    sink = Path(sink)
+    sink.parent.mkdir(parents=True, exist_ok=True)
+    done = load_completed(sink)
+    paths = [str(p) for p in iter_batch_inputs(source)]
+    todo = [p for p in paths if p not in done]
+    stats = {"total": len(paths), "skipped": len(paths) - len(todo), "ok": 0, "failed": 0}
+    dates = Counter()
+
+    started = time.perf_counter()
+    if todo:
+        workers = workers or os.cpu_count() or 1
+        _end_with_newline(sink)
+        with sink.open("a", encoding="utf-8") as out:
+            with multiprocessing.Pool(workers, _init_batch_worker, (phone_region, cache_dir)) as pool:
+                chunks = [todo[i:i + chunksize] for i in range(0, len(todo), chunksize)]
+                for records, chunk_dates in pool.imap_unordered(_batch_parse, chunks):
+                    dates.update(chunk_dates)
+                    for record in records:
+                        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        stats["ok" if record["ok"] else "failed"] += 1
+                    out.flush()
+
+    elapsed = time.perf_counter() - started
+    processed = stats["ok"] + stats["failed"]
+    stats["seconds"] = round(elapsed, 2)
+    stats["files_per_second"] = round(processed / elapsed, 2) if elapsed > 0 else 0.0
+    parsed_dates = dates["fast"] + dates["fallback"]
+    stats["date_fallbacks"] = dates["fallback"]
+    stats["date_fallback_ratio"] = round(dates["fallback"] / parsed_dates, 4) if parsed_dates else 0.0
+    return stats
+
+
 # ---------------- CLI ----------------
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("path", help="Path to PDF/TXT/Image resume")
+    parser.add_argument("path", nargs="?", help="Path to PDF/TXT/Image resume (with --batch: a directory or manifest)")
     parser.add_argument("--phone-region", default=None, help="Phone region hint e.g., IN, US")
     parser.add_argument("--output-dir", default=None, help="Directory to save JSON outputs")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Cache parsed CVs by content hash in this directory")
+    parser.add_argument("--clear-cache", action="store_true", help="Empty --cache-dir and exit")
+    parser.add_argument("--batch", action="store_true", help="Parse every CV in a directory / manifest in parallel")
+    parser.add_argument("--sink", default="cv_batch.jsonl", help="JSONL output of --batch (re-run to resume)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --batch (default: CPU count)")
     args = parser.parse_args()
 
-    meta = process_file(args.path, phone_region=args.phone_region, out_dir=args.output_dir)
+    if args.clear_cache:
+        if not args.cache_dir:
+            parser.error("--clear-cache needs --cache-dir (or CV_CACHE_DIR)")
+        print(f"Removed {clear_cache(args.cache_dir)} cached parse(s).")
+        sys.exit(0)
+    if not args.path:
+        parser.error("the following arguments are required: path")
+
+    if args.batch:
+        stats = run_batch(args.path, args.sink, workers=args.workers,
+                          phone_region=args.phone_region, cache_dir=args.cache_dir)
+        print(f"{stats['ok']} ok, {stats['failed']} failed, {stats['skipped']} already done "
+              f"of {stats['total']} in {stats['seconds']}s ({stats['files_per_second']} files/s), "
+              f"{stats['date_fallbacks']} dates via dateparser ({stats['date_fallback_ratio']:.1%})")
+        sys.exit(1 if stats["failed"] else 0)
+
+    meta = process_file(args.path, phone_region=args.phone_region, out_dir=args.output_dir, cache_dir=args.cache_dir)
     print(json.dumps(meta, indent=2, ensure_ascii=False))
@@ -0,0 +1,88 @@
+import logging
+import threading
+from collections import Counter
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+FORMDATA_GROUP = "formdata_realtime"
+
+
+class CoalescingBroadcaster:
+    """Merge FormData change notifications and push them to a channel group at most every N ms.
+
+    record() only updates an in-memory batch, so the request that caused the change never
+    waits on the channel layer or on a recount; a timer thread sends one merged
+    "formdata_update_event" per group per interval.
+    """
+
+    def __init__(self, interval_ms=None):
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timers = {}
+
+    @property
+    def interval(self):
+        interval_ms = self.interval_ms
+        if interval_ms is None:
+            interval_ms = getattr(settings, "FORMDATA_BROADCAST_INTERVAL_MS", 250)
+        return interval_ms / 1000.0
+
+    def record(self, group=FORMDATA_GROUP, changed_ids=(), deleted_ids=(), status_deltas=None):
+        with self._lock:
+            batch = self._pending.get(group)
+            if batch is None:
+                batch = self._pending[group] = {
+                    "changed_ids": set(),
+                    "deleted_ids": set(),
+                    "status_deltas": Counter(),
+                }
+            batch["changed_ids"].update(changed_ids)
+            batch["deleted_ids"].update(deleted_ids)
+            batch["changed_ids"].difference_update(batch["deleted_ids"])
+            batch["status_deltas"].update(status_deltas or {})
+
+            if group not in self._timers:
+                timer = threading.Timer(self.interval, self.flush, args=(group,))
+                timer.daemon = True
+                self._timers[group] = timer
+                timer.start()
+
+    def flush(self, group=FORMDATA_GROUP):
+        with self._lock:
+            batch = self._pending.pop(group, None)
+            timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        if not batch:
+            return
+
+        from .counters import status_counts
+
+        try:
+            changed = sorted(batch["changed_ids"])
+            deleted = sorted(batch["deleted_ids"])
+            async_to_sync(get_channel_layer().group_send)(
+                group,
+                {
+                    "type": "formdata_update_event",
+                    "message": f"FormData records updated: {len(changed)} changed, {len(deleted)} deleted",
+                    "changed_ids": changed,
+                    "deleted_ids": deleted,
+                    "status_deltas": {k: v for k, v in batch["status_deltas"].items() if v},
+                    "status_counts": status_counts(),
+                },
+            )
+        except Exception:
+            logger.exception("FormData broadcast to %s failed", group)
+        finally:
+            # The timer thread has its own DB connection; don't leak it
+            connection.close()
+
+
+formdata_broadcaster = CoalescingBroadcaster()
@@ -2,6 +2,7 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from asgiref.sync import sync_to_async
 from django.db.models import Q
+from ..counters import status_counts
 from ..models import FormData
 
 
@@ -71,11 +72,14 @@ class FormDataRealtimeConsumer(AsyncWebsocketConsumer):
     # --------------------------
     async def formdata_update_event(self, event):
         """
-        Called when Django signal broadcasts FormData change.
+        Called with a merged batch of FormData changes (see form_data.broadcast).
         """
         await self.send_json({
             "type": "update",
             "message": event["message"],
+            "changed_ids": event.get("changed_ids", []),
+            "deleted_ids": event.get("deleted_ids", []),
+            "status_deltas": event.get("status_deltas", {}),
             "status_counts": event["status_counts"]
         })
 
@@ -84,29 +88,23 @@ class FormDataRealtimeConsumer(AsyncWebsocketConsumer):
     # --------------------------
     @sync_to_async
     def get_status_counts(self):
-        """Aggregate FormData.status counts from JSONField."""
-        all_forms = FormData.objects.values_list("submission_data", flat=True)
-        counts = {"Scouting": 0, "Ongoing": 0, "Hired": 0, "Reject": 0}
-        for data in all_forms.iterator():
-            if isinstance(data, dict):
-                s = data.get("status", "Scouting")
-                counts[s] = counts.get(s, 0) + 1
-        return counts
+        """FormData status counts from the maintained counters table."""
+        return status_counts()
 
     @sync_to_async
     def get_filtered_data(self, status_value):
         """Filter candidates by status."""
         results = []
-        forms = FormData.objects.values("id", "form_name", "submission_data", "submitted_at")
+        forms = FormData.objects.filter(status=status_value).values("id", "form_name", "status", "submission_data", "submitted_at")
         for form in forms.iterator():
             data = form.get("submission_data", {})
-            if data.get("status") == status_value:
+            if isinstance(data, dict):
                 results.append({
                     "id": form["id"],
                     "Name": data.get("Name"),
                     "Email": data.get("Email"),
                     "Role": data.get("Role"),
-                    "Status": data.get("status"),
+                    "Status": form["status"],
                     "Location": data.get("Location"),
                     "Submitted_At_IST": data.get("Submitted_At_IST"),
                 })
@@ -72,25 +72,28 @@ class FormDataModelRealtimeConsumer(AsyncWebsocketConsumer):
     @sync_to_async
     def get_all_formdata(self):
         """Return all FormData records serialized"""
-        queryset = FormData.objects.all().order_by("-submitted_at")[:100]  # latest 100 records
+        queryset = (
+            FormData.objects.order_by("-submitted_at")
+            .prefetch_related("notes", "status_events", "sent_messages")[:100]  # latest 100 records
+        )
         serializer = FormDataSerializer(queryset, many=True)
         return serializer.data
 
     @sync_to_async
     def get_filtered_data(self, status_value):
-        """Filter FormData by status (inside submission_data)"""
+        """Filter FormData by the indexed status column"""
         results = []
-        queryset = FormData.objects.values("id", "form_name", "submission_data", "submitted_at")
+        queryset = FormData.objects.filter(status=status_value).values("id", "form_name", "status", "submission_data", "submitted_at")
 
         for form in queryset.iterator():
             data = form.get("submission_data", {})
-            if data.get("status") == status_value:
+            if isinstance(data, dict):
                 results.append({
                     "id": form["id"],
                     "Name": data.get("Name"),
                     "Email": data.get("Email"),
                     "Role": data.get("Role"),
-                    "Status": data.get("status"),
+                    "Status": form["status"],
                     "Submitted_At_IST": data.get("Submitted_At_IST"),
                 })
         return results
@@ -0,0 +1,39 @@
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
+from ..imports import import_group
+from ..models import CandidateImportJob
+
+
+class CandidateImportConsumer(AsyncWebsocketConsumer):
+    """
+    Progress of one candidate import (ws/candidate-imports/<id>/).
+    Sends the current state on connect, then one "progress" message per committed chunk.
+    """
+
+    async def connect(self):
+        self.import_id = int(self.scope["url_route"]["kwargs"]["import_id"])
+        self.group_name = import_group(self.import_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        progress = await self.get_progress()
+        if progress is None:
+            await self.send_json({"type": "error", "message": "Import not found"})
+            await self.close()
+            return
+        await self.send_json({"type": "progress", "job": progress})
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def import_progress(self, event):
+        await self.send_json({"type": "progress", "job": event["job"]})
+
+    @sync_to_async
+    def get_progress(self):
+        job = CandidateImportJob.objects.filter(pk=self.import_id).first()
+        return job.progress() if job else None
+
+    async def send_json(self, content):
+        await self.send(text_data=json.dumps(content))
@@ -0,0 +1,39 @@
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
+from ..models import ResumeParseJob
+from ..resume_jobs import job_group
+
+
+class ResumeParseJobConsumer(AsyncWebsocketConsumer):
+    """
+    Updates of one resume parse job (ws/resume-parse-jobs/<id>/).
+    Sends the current state on connect, then one "progress" message per status change.
+    """
+
+    async def connect(self):
+        self.job_id = int(self.scope["url_route"]["kwargs"]["job_id"])
+        self.group_name = job_group(self.job_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        progress = await self.get_progress()
+        if progress is None:
+            await self.send_json({"type": "error", "message": "Parse job not found"})
+            await self.close()
+            return
+        await self.send_json({"type": "progress", "job": progress})
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def parse_progress(self, event):
+        await self.send_json({"type": "progress", "job": event["job"]})
+
+    @sync_to_async
+    def get_progress(self):
+        job = ResumeParseJob.objects.filter(pk=self.job_id).first()
+        return job.progress() if job else None
+
+    async def send_json(self, content):
+        await self.send(text_data=json.dumps(content))
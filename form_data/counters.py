@@ -0,0 +1,66 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from .models import CandidateCounter, FormData
+
+DEFAULT_STATUSES = ("Scouting", "Ongoing", "Hired", "Reject")
+
+
+def status_counts():
+    """Candidates per status, read from the counters table."""
+    counts = dict.fromkeys(DEFAULT_STATUSES, 0)
+    rows = CandidateCounter.objects.filter(count__gt=0).values("status").annotate(total=Sum("count"))
+    for row in rows:
+        counts[row["status"]] = row["total"]
+    return counts
+
+
+def role_type_counts():
+    """Candidates per non-empty Role_Type, read from the counters table."""
+    rows = (
+        CandidateCounter.objects
+        .filter(count__gt=0)
+        .exclude(role_type="")
+        .values("role_type")
+        .annotate(total=Sum("count"))
+    )
+    return {row["role_type"]: row["total"] for row in rows}
+
+
+def record_bulk_insert(forms):
+    """bulk_create() skips FormData.save(); call this in the same transaction."""
+    CandidateCounter.apply(Counter(form.counter_key for form in forms))
+
+
+def reconcile():
+    """Rebuild the counters from FormData; returns {key: (stored, actual)} for rows that drifted."""
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Writers queue behind this lock, so their deltas land on top of the rebuilt rows
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {connection.ops.quote_name(CandidateCounter._meta.db_table)} IN EXCLUSIVE MODE")
+        actual = {
+            (row["status"], row["role_type"], row["job_id"] or 0): row["total"]
+            for row in (
+                FormData.objects.order_by()
+                .values("status", "role_type", "job_id")
+                .annotate(total=Count("id"))
+            )
+        }
+        stored = {
+            (c.status, c.role_type, c.job_key): c.count
+            for c in CandidateCounter.objects.all()
+        }
+        drift = {
+            key: (stored.get(key, 0), actual.get(key, 0))
+            for key in set(actual) | set(stored)
+            if stored.get(key, 0) != actual.get(key, 0)
+        }
+        CandidateCounter.objects.all().delete()
+        CandidateCounter.objects.bulk_create(
+            CandidateCounter(status=s, role_type=r, job_key=j, count=n)
+            for (s, r, j), n in actual.items()
+        )
+    return drift
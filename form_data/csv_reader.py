@@ -1,8 +1,8 @@
 # utils/csv_reader.py
+import codecs
 import csv
-from io import TextIOWrapper, BytesIO
 import logging
-from io import TextIOWrapper, BytesIO, StringIO
+from io import TextIOWrapper
 import openpyxl
 import xlrd
 
@@ -10,92 +10,140 @@ logger = logging.getLogger(__name__)
 
 ENCODINGS_TO_TRY = ["utf-8", "utf-8-sig", "cp1252", "latin-1"]
 
-def read_csv_file(uploaded_file):
-    raw = uploaded_file.read()
+# Encoding and dialect are picked from the first block only; rows are then streamed
+SAMPLE_SIZE = 64 * 1024
+
+
+def _cp1252_fallback(error):
+    """Decode stray non-UTF-8 bytes further down a file as cp1252 instead of failing."""
+    bad = error.object[error.start:error.end]
+    return bad.decode("cp1252", errors="replace"), error.end
+
+
+codecs.register_error("csv_reader_cp1252", _cp1252_fallback)
+
+
+def detect_encoding(sample):
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for enc in ENCODINGS_TO_TRY:
+        try:
+            # final=False: the block may end in the middle of a multi-byte character
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError as e:
+            logger.debug("Decoding with %s failed: %s", enc, e)
+    return "latin-1"
+
+
+def iter_csv_rows(uploaded_file):
     try:
         uploaded_file.seek(0)
     except Exception:
         pass
+    sample = uploaded_file.read(SAMPLE_SIZE)
+    uploaded_file.seek(0)
 
-    for enc in ENCODINGS_TO_TRY:
-        try:
-            text = raw.decode(enc)
-        except Exception as e:
-            logger.debug("Decoding with %s failed: %s", enc, e)
-            continue
+    encoding = detect_encoding(sample)
+    try:
+        dialect = csv.Sniffer().sniff(sample.decode(encoding, errors="ignore")[:8192])
+    except Exception:
+        dialect = csv.excel
 
-        try:
-            sample = text[:8192]
-            dialect = csv.Sniffer().sniff(sample)
-        except Exception:
-            dialect = csv.excel
+    errors = "csv_reader_cp1252" if encoding.startswith("utf-8") else "replace"
+    text = TextIOWrapper(uploaded_file, encoding=encoding, errors=errors, newline="")
+    try:
+        yield from csv.DictReader(text, dialect=dialect)
+    finally:
+        # Don't let the wrapper close the caller's file
+        text.detach()
 
-        try:
-            f = StringIO(text)
-            reader = csv.DictReader(f, dialect=dialect)
-            return list(reader)
-        except Exception as e:
-            logger.debug("CSV parsing with %s failed: %s", enc, e)
-
-    # fallback
-    text = raw.decode("latin-1", errors="replace")
-    f = StringIO(text)
-    reader = csv.DictReader(f)
-    return list(reader)
 
-# ---------- XLSX READER ----------
-def read_xlsx_file(uploaded_file):
-    wb = openpyxl.load_workbook(uploaded_file, data_only=True)
-    ws = wb.active
+def read_csv_file(uploaded_file):
+    return list(iter_csv_rows(uploaded_file))
 
-    rows = list(ws.values)
-    if not rows:
-        return []
+# ---------- XLSX READER ----------
+def iter_xlsx_rows(uploaded_file):
+    wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            return
 
-    header = [str(h).strip() if h else "" for h in rows[0]]
-    result = []
+        header = [str(h).strip() if h else "" for h in first]
+        for row in rows:
+            row_dict = {}
+            for key, value in zip(header, row):
+                row_dict[key] = value if value is not None else ""
+            yield row_dict
+    finally:
+        wb.close()
 
-    for row in rows[1:]:
-        row_dict = {}
-        for key, value in zip(header, row):
-            row_dict[key] = value if value is not None else ""
-        result.append(row_dict)
 
-    return result
+def read_xlsx_file(uploaded_file):
+    return list(iter_xlsx_rows(uploaded_file))
 
 # ---------- XLS READER ----------
-def read_xls_file(uploaded_file):
-    book = xlrd.open_workbook(file_contents=uploaded_file.read())
-    sheet = book.sheet_by_index(0)
+def _open_xls(uploaded_file):
+    # Files already on disk are memory-mapped by xlrd instead of read into a bytes copy
+    path = None
+    if hasattr(uploaded_file, "temporary_file_path"):
+        path = uploaded_file.temporary_file_path()
+    elif hasattr(uploaded_file, "path"):
+        try:
+            path = uploaded_file.path
+        except (NotImplementedError, ValueError):
+            path = None
+    if path:
+        return xlrd.open_workbook(path, on_demand=True)
+    return xlrd.open_workbook(file_contents=uploaded_file.read(), on_demand=True)
 
-    header = [str(sheet.cell_value(0, col)).strip() for col in range(sheet.ncols)]
-    result = []
 
-    for row_idx in range(1, sheet.nrows):
-        row_dict = {}
-        for col_idx, key in enumerate(header):
-            value = sheet.cell_value(row_idx, col_idx)
-            row_dict[key] = value if value else ""
-        result.append(row_dict)
+def iter_xls_rows(uploaded_file):
+    book = _open_xls(uploaded_file)
+    try:
+        sheet = book.sheet_by_index(0)
+        if sheet.nrows == 0:
+            return
+
+        header = [str(value).strip() for value in sheet.row_values(0)]
+        for row_idx in range(1, sheet.nrows):
+            row_dict = {}
+            for key, value in zip(header, sheet.row_values(row_idx)):
+                row_dict[key] = value if value else ""
+            yield row_dict
+    finally:
+        book.release_resources()
 
-    return result
+
+def read_xls_file(uploaded_file):
+    return list(iter_xls_rows(uploaded_file))
 
 # ---------- MASTER READER ----------
-def read_uploaded_file(uploaded_file):
+def iter_uploaded_file(uploaded_file):
+    """Yield the rows of an uploaded CSV / XLSX / XLS file as dicts, one at a time.
+
+    Memory use is bounded by a row (plus the reader's buffers), not by the file.
+    """
     filename = uploaded_file.name.lower()
 
     if filename.endswith(".csv"):
-        return read_csv_file(uploaded_file)
+        return iter_csv_rows(uploaded_file)
 
     elif filename.endswith(".xlsx"):
-        return read_xlsx_file(uploaded_file)
+        return iter_xlsx_rows(uploaded_file)
 
     elif filename.endswith(".xls"):
-        return read_xls_file(uploaded_file)
+        return iter_xls_rows(uploaded_file)
 
     else:
         raise ValueError("Unsupported file type. Only CSV, XLSX, and XLS are allowed.")
 
+
+def read_uploaded_file(uploaded_file):
+    return list(iter_uploaded_file(uploaded_file))
+
 from create_job.models import add_job
 
 def get_or_create_job_by_title(title):
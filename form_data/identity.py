@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import CandidateIdentity, FormData
+from .normalize import as_submission_dict, submission_job_id
+
+# Pipeline state lives in FormData columns and child tables; a repeat application
+# must not reset it through the submission blob
+PIPELINE_KEYS = {
+    'status', 'phase', 'reject_reason', 'interview_date', 'interview_time', 'offer_letter_date',
+    'joining_date', 'archived', 'note', 'note_author', 'notes_history', 'status_history', 'email_message',
+}
+# Who the candidate is and what they applied for; a repeat application never changes them
+IDENTITY_KEYS = {'Name', 'Email', 'Role_Type', 'job_id', 'job_title'}
+
+
+class DuplicateCandidate(Exception):
+    """A concurrent ingest registered the same e-mail for the same job first."""
+
+    def __init__(self, form_id):
+        super().__init__(form_id)
+        self.form_id = form_id
+
+
+def merge_submission(form_id, submission_data):
+    """Fold a repeat application to the same job into the one already on file.
+
+    Non-empty answers overwrite the stored ones; pipeline state and the candidate's
+    name, e-mail, role and job are left alone. New phone / name + DOB keys are
+    registered so later look-alikes are flagged.
+    """
+    with transaction.atomic():
+        form = FormData.objects.select_for_update().get(pk=form_id)
+        data = dict(as_submission_dict(form.submission_data))
+        data.update({
+            key: value for key, value in as_submission_dict(submission_data).items()
+            if key not in PIPELINE_KEYS and key not in IDENTITY_KEYS and value not in (None, "", [], {})
+        })
+        form.submission_data = data
+        form.save(update_fields=['submission_data'])
+        registered = set(form.identities.values_list('kind', 'value'))
+        CandidateIdentity.claim([
+            (kind, value, form.job_id or 0, form.pk)
+            for kind, value in CandidateIdentity.keys_for(data) if (kind, value) not in registered
+        ])
+    return form
+
+
+def save_or_merge(serializer, submission_data):
+    """serializer.save() a new application, or merge into the same e-mail's application to the same job.
+
+    "Already applied?" is one indexed lookup on (e-mail, job). A concurrent insert of
+    the same application is caught by the identity claim in FormData.save(); the new
+    row is rolled back and merged instead. Applying to another job, or without an
+    e-mail, always creates a new row. Returns (form, created).
+    """
+    email = CandidateIdentity.email_of(CandidateIdentity.keys_for(submission_data))
+    job_key = submission_job_id(submission_data) or 0
+    form_id = CandidateIdentity.find_form_id(email, job_key)
+    if form_id is None:
+        try:
+            with transaction.atomic():
+                form = serializer.save()
+                if not getattr(form, '_identity_conflicts', None):
+                    return form, True
+                raise DuplicateCandidate(CandidateIdentity.find_form_id(email, job_key))
+        except DuplicateCandidate as exc:
+            form_id = exc.form_id
+    return merge_submission(form_id, submission_data), False
+
+
+def possible_duplicates(form):
+    """Other applications sharing this one's phone number or name + date of birth.
+
+    These are only flagged for a recruiter to check, never merged.
+    Returns [{"id": form_id, "matched_on": [kind, ...]}] in id order (one query).
+    """
+    own = CandidateIdentity.objects.filter(form_id=form.pk, kind=OuterRef('kind'), value=OuterRef('value'))
+    rows = (
+        CandidateIdentity.objects.filter(kind__in=CandidateIdentity.DUPLICATE_KINDS)
+        .filter(Exists(own))
+        .exclude(form_id=form.pk)
+        .order_by('form_id', 'kind')
+        .values_list('form_id', 'kind')
+        .distinct()
+    )
+    matches = {}
+    for form_id, kind in rows:
+        matches.setdefault(form_id, []).append(kind)
+    return [{"id": form_id, "matched_on": kinds} for form_id, kinds in matches.items()]
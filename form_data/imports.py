@@ -0,0 +1,264 @@
+import logging
+from collections import Counter
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .broadcast import FORMDATA_GROUP, formdata_broadcaster
+from .counters import record_bulk_insert
+from .csv_reader import iter_uploaded_file
+from .models import CandidateIdentity, CandidateImportJob, FormData
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = [
+    "Name",
+    "Email",
+    "Phone",
+    "Total Experience",
+    "Current Salary",
+    "Highest Qualification",
+    "University",
+    "Organisation",
+    "Available To Join (in days)",
+]
+
+# Only the most recent row errors are kept on the job
+MAX_STORED_ERRORS = 100
+
+
+class ImportSuperseded(Exception):
+    """Another worker committed a chunk of the same import first."""
+
+
+def import_group(import_id):
+    return f"candidate_import_{import_id}"
+
+
+def missing_columns(row):
+    columns = set(row.keys()) if row else set()
+    return [col for col in REQUIRED_COLUMNS if col not in columns]
+
+
+def clean_value(value):
+    if value is None:
+        return ""
+    value_str = str(value).strip()
+    if value_str.lower() in ["not available", "n/a", "na", "none", "not specified"]:
+        return ""
+    return value_str
+
+
+def build_submission(row, job):
+    """Map one spreadsheet row onto the submission_data layout used by the forms."""
+    university = row.get("University", "")
+    highest_qualification = row.get("Highest Qualification", "")
+
+    education_history = []
+    if university or highest_qualification:
+        education_history.append({
+            "Qualification": highest_qualification,
+            "University": university,
+            "Start_Date": "",
+            "End_Date": "",
+            "Score": ""
+        })
+
+    organisation = row.get("Organisation", "")
+
+    professional_experience = []
+    if organisation:
+        professional_experience.append({
+            "Role": "",
+            "Organisation": organisation,
+            "Start_Date": "",
+            "End_Date": "",
+            "Location": "",
+            "CTC_INR": "",
+            "Responsibilities": ""
+        })
+
+    submission_json = {}
+
+    for k, v in row.items():
+        key_lower = k.lower()
+
+        if key_lower == "job title":
+            continue
+        if key_lower.startswith("education_"):
+            continue
+        if key_lower.startswith("experience_"):
+            continue
+
+        if key_lower == "available to join (in days)":
+            submission_json["Notice_Period"] = clean_value(v)
+            continue
+        if key_lower == "current location":
+            submission_json["Location"] = clean_value(v)
+            continue
+        if key_lower == "nationality":
+            submission_json["Country"] = clean_value(v)
+            continue
+
+        clean_key = k.replace(" ", "_")
+        submission_json[clean_key] = clean_value(v)
+
+    submission_json["status"] = "Scouting"
+    submission_json["State"] = row.get("State", "")
+
+    submission_json["Education_History"] = education_history
+    submission_json["Professional_Experience"] = professional_experience
+
+    submission_json["Role_Type"] = job.title if job else ""
+    submission_json["job_id"] = job.id if job else None
+    submission_json["job_title"] = job.title if job else None
+    return submission_json
+
+
+def insert_new_candidates(forms):
+    """bulk_create() the forms whose e-mail has not applied to the same job yet.
+
+    Repeats within the batch and against CandidateIdentity are skipped up front;
+    the identity insert (ON CONFLICT DO NOTHING) settles races with concurrent
+    ingests, and rows that lose are removed again. Rows that only share a phone
+    number or name + DOB with a candidate on file are imported (and flagged, see
+    form_data.identity.possible_duplicates). Must run inside a transaction.
+    Returns (inserted_forms, duplicate_count).
+    """
+    seen = set()
+    unique = []
+    for form in forms:
+        form._identity_keys = CandidateIdentity.keys_for(form.submission_data)
+        email = CandidateIdentity.email_of(form._identity_keys)
+        form._application = (email, form.job_id or 0) if email else None
+        if form._application:
+            if form._application in seen:
+                continue
+            seen.add(form._application)
+        unique.append(form)
+
+    existing = CandidateIdentity.lookup(seen)
+    fresh = [form for form in unique if form._application not in existing]
+    if not fresh:
+        return [], len(forms)
+
+    FormData.objects.bulk_create(fresh)
+    claimed = CandidateIdentity.claim([
+        (kind, value, f.job_id or 0, f.pk) for f in fresh for kind, value in f._identity_keys
+    ])
+    lost = [
+        f.pk for f in fresh
+        if f._application and (CandidateIdentity.EMAIL, *f._application) not in claimed
+    ]
+    if lost:
+        # Raw deletes: these rows were never counted or broadcast, so no signals
+        placeholders = ", ".join(["%s"] * len(lost))
+        identity_table = connection.ops.quote_name(CandidateIdentity._meta.db_table)
+        table = connection.ops.quote_name(FormData._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {identity_table} WHERE "form_id" IN ({placeholders})', lost)
+            cursor.execute(f'DELETE FROM {table} WHERE "id" IN ({placeholders})', lost)
+        lost = set(lost)
+        fresh = [f for f in fresh if f.pk not in lost]
+
+    record_bulk_insert(fresh)
+    return fresh, len(forms) - len(fresh)
+
+
+def publish_progress(import_job):
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            import_group(import_job.pk),
+            {"type": "import_progress", "job": import_job.progress()},
+        )
+    except Exception:
+        logger.exception("Could not publish progress for candidate import %s", import_job.pk)
+
+
+def _commit_chunk(import_job, forms, rows, errors, finished=False):
+    """Insert one chunk and advance the job's counters in the same transaction."""
+    with transaction.atomic():
+        locked = CandidateImportJob.objects.select_for_update().get(pk=import_job.pk)
+        if locked.committed_rows != import_job.committed_rows or locked.status != CandidateImportJob.RUNNING:
+            raise ImportSuperseded(import_job.pk)
+
+        inserted, duplicates = insert_new_candidates(forms) if forms else ([], 0)
+        import_job.rows_read += rows
+        import_job.committed_rows += rows
+        import_job.created += len(inserted)
+        import_job.duplicates += duplicates
+        import_job.failed += len(errors)
+        import_job.errors = (import_job.errors + errors)[-MAX_STORED_ERRORS:]
+        if finished:
+            import_job.status = CandidateImportJob.COMPLETED
+            import_job.finished_at = timezone.now()
+        import_job.save(update_fields=[
+            "rows_read", "committed_rows", "created", "duplicates", "failed", "errors", "status", "finished_at",
+        ])
+
+        # bulk_create sends no signals: push one summary update per chunk
+        if inserted:
+            status_deltas = Counter(form.status for form in inserted)
+            changed_ids = [form.pk for form in inserted]
+            transaction.on_commit(lambda: formdata_broadcaster.record(
+                FORMDATA_GROUP, changed_ids=changed_ids, status_deltas=status_deltas,
+            ))
+    publish_progress(import_job)
+
+
+def run_import(import_id):
+    """Stream an uploaded file into FormData in chunks; resumes after committed_rows."""
+    chunk_size = getattr(settings, "CANDIDATE_IMPORT_CHUNK_SIZE", 500)
+
+    with transaction.atomic():
+        import_job = CandidateImportJob.objects.select_for_update().select_related("job").get(pk=import_id)
+        if import_job.status == CandidateImportJob.COMPLETED:
+            return import_job
+        import_job.status = CandidateImportJob.RUNNING
+        import_job.error = ""
+        import_job.started_at = import_job.started_at or timezone.now()
+        import_job.save(update_fields=["status", "error", "started_at"])
+    publish_progress(import_job)
+
+    target_job = import_job.job
+    skip = import_job.committed_rows
+    forms, errors, rows = [], [], 0
+    try:
+        with import_job.file.open("rb") as upload:
+            for index, row in enumerate(iter_uploaded_file(upload)):
+                if index < skip:
+                    continue
+                rows += 1
+                try:
+                    form = FormData(form_name="gxi_form", submission_data=build_submission(row, target_job))
+                    # bulk_create() bypasses save(), so fill the indexed columns here
+                    form.sync_indexed_fields()
+                    forms.append(form)
+                except Exception as e:
+                    # +2: spreadsheet line numbers start at 1 and include the header
+                    errors.append(f"Row {index + 2}: {str(e)}")
+
+                if rows >= chunk_size:
+                    _commit_chunk(import_job, forms, rows, errors)
+                    forms, errors, rows = [], [], 0
+
+        _commit_chunk(import_job, forms, rows, errors, finished=True)
+    except ImportSuperseded:
+        logger.info("Candidate import %s is being processed by another worker", import_id)
+        raise
+    except Exception as exc:
+        logger.exception("Candidate import %s failed after %s rows", import_id, import_job.committed_rows)
+        CandidateImportJob.objects.filter(pk=import_id).update(
+            status=CandidateImportJob.FAILED, error=str(exc)[:2000], finished_at=timezone.now(),
+        )
+        import_job.refresh_from_db()
+        publish_progress(import_job)
+        raise
+
+    # Every row is committed, nothing will resume from the upload any more
+    import_job.file.delete(save=False)
+    import_job.save(update_fields=["file"])
+    return import_job
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from form_data.parse_cache import invalidate, parser_versions
+
+
+class Command(BaseCommand):
+    help = "Drop cached resume parses (Redis and DB), e.g. after changing parser logic."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--parser", choices=sorted(parser_versions()), help="Only drop this parser's entries.")
+        parser.add_argument(
+            "--stale", action="store_true",
+            help="Only drop entries written by an older version of their parser.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = invalidate(parser=options["parser"], stale_only=options["stale"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} cached resume parse(s)."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from form_data.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Rebuild the candidate status/role/job counters from FormData and report any drift."
+
+    def handle(self, *args, **options):
+        drift = reconcile()
+        for (status, role_type, job_key), (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"{status} / {role_type or '-'} / job {job_key}: {stored} -> {actual}")
+        self.stdout.write(self.style.SUCCESS(f"Counters reconciled ({len(drift)} key(s) corrected)."))
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:23
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def backfill_indexed_fields(apps, schema_editor):
+    """Copy Role_Type / status / Email / job_id from submission_data into the new columns."""
+    import json
+
+    FormData = apps.get_model('form_data', 'FormData')
+    batch = []
+    for form in FormData.objects.only('id', 'submission_data').iterator(chunk_size=2000):
+        data = form.submission_data
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                data = {}
+        if not isinstance(data, dict):
+            data = {}
+
+        form.role_type = str(data.get('Role_Type') or '').strip()[:255]
+        form.status = str(data.get('status') or 'Scouting').strip()[:50]
+        form.email = str(data.get('Email') or '').strip().lower()[:254]
+        try:
+            form.job_id = int(data.get('job_id')) if data.get('job_id') not in (None, '') else None
+        except (TypeError, ValueError):
+            form.job_id = None
+
+        batch.append(form)
+        if len(batch) >= 2000:
+            FormData.objects.bulk_update(batch, ['role_type', 'status', 'email', 'job'])
+            batch = []
+
+    if batch:
+        FormData.objects.bulk_update(batch, ['role_type', 'status', 'email', 'job'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0018_location_address_location_country_location_state'),
+        ('form_data', '0005_alter_formdata_cv_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formdata',
+            name='email',
+            field=models.CharField(blank=True, default='', max_length=254),
+        ),
+        migrations.AddField(
+            model_name='formdata',
+            name='job',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='form_submissions', to='create_job.add_job'),
+        ),
+        migrations.AddField(
+            model_name='formdata',
+            name='role_type',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='formdata',
+            name='status',
+            field=models.CharField(default='Scouting', max_length=50),
+        ),
+        migrations.RunPython(backfill_indexed_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(fields=['status', '-submitted_at'], name='formdata_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(fields=['role_type', '-submitted_at'], name='formdata_role_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(fields=['job', 'status'], name='formdata_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(fields=['email'], name='formdata_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(django.db.models.functions.text.Upper('role_type'), name='formdata_role_upper_idx'),
+        ),
+    ]
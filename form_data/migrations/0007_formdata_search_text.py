@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:25
+
+import json
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def _search_text(data, form_name):
+    parts = [form_name] + [data.get(k) for k in ('Name', 'Email', 'Phone', 'Role_Type', 'Organisation', 'University', 'note')]
+    for key, sub in (('Professional_Experience', 'Organisation'), ('Education_History', 'University'), ('notes_history', 'note')):
+        items = data.get(key)
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict):
+                parts.append(item.get(sub))
+
+    seen, words = set(), []
+    for part in parts:
+        text = str(part).strip().lower() if part not in (None, '') else ''
+        if text and text not in seen:
+            seen.add(text)
+            words.append(text)
+    return ' '.join(words)
+
+
+def backfill_search_text(apps, schema_editor):
+    FormData = apps.get_model('form_data', 'FormData')
+    batch = []
+    for form in FormData.objects.only('id', 'form_name', 'submission_data').iterator(chunk_size=2000):
+        data = form.submission_data
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                data = {}
+        form.search_text = _search_text(data if isinstance(data, dict) else {}, form.form_name)
+        batch.append(form)
+        if len(batch) >= 2000:
+            FormData.objects.bulk_update(batch, ['search_text'])
+            batch = []
+
+    if batch:
+        FormData.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0018_location_address_location_country_location_state'),
+        ('form_data', '0006_formdata_indexed_fields'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='formdata',
+            name='search_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('search_text', name='gin_trgm_ops'), name='formdata_search_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('search_text', config='simple'), name='formdata_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0018_location_address_location_country_location_state'),
+        ('form_data', '0007_formdata_search_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(fields=['-submitted_at', '-id'], name='formdata_submitted_id_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    FormData = apps.get_model('form_data', 'FormData')
+    CandidateCounter = apps.get_model('form_data', 'CandidateCounter')
+    rows = FormData.objects.order_by().values('status', 'role_type', 'job_id').annotate(total=Count('id'))
+    CandidateCounter.objects.bulk_create(
+        CandidateCounter(status=r['status'], role_type=r['role_type'], job_key=r['job_id'] or 0, count=r['total'])
+        for r in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form_data', '0008_formdata_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('role_type', models.CharField(blank=True, default='', max_length=255)),
+                ('job_key', models.BigIntegerField(default=0, help_text='add_job id, 0 when the candidate has no job')),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('status', 'role_type', 'job_key'), name='candidate_counter_key_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,225 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:34
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+STATE_KEYS = (
+    'reject_reason', 'interview_date', 'interview_time', 'offer_letter_date',
+    'joining_date', 'archived', 'note', 'note_author',
+)
+
+
+def _as_list(value):
+    return [v for v in value if isinstance(v, dict)] if isinstance(value, list) else []
+
+
+def _parse_ts(value, default):
+    from django.utils import timezone
+    from django.utils.dateparse import parse_datetime
+
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        return default
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def move_histories(apps, schema_editor):
+    """Move notes_history / status_history / email_message into the child tables.
+
+    The current phase and status details move to their columns; the histories are
+    removed from submission_data so later writes no longer rewrite them.
+    """
+    import json
+
+    FormData = apps.get_model('form_data', 'FormData')
+    CandidateNote = apps.get_model('form_data', 'CandidateNote')
+    CandidateStatusEvent = apps.get_model('form_data', 'CandidateStatusEvent')
+    CandidateSentMessage = apps.get_model('form_data', 'CandidateSentMessage')
+
+    forms, notes, events, messages = [], [], [], []
+
+    def flush():
+        CandidateNote.objects.bulk_create(notes)
+        CandidateStatusEvent.objects.bulk_create(events)
+        CandidateSentMessage.objects.bulk_create(messages)
+        FormData.objects.bulk_update(forms, ['submission_data', 'phase', 'status_details'])
+        for batch in (forms, notes, events, messages):
+            batch.clear()
+
+    queryset = FormData.objects.only('id', 'submission_data', 'submitted_at')
+    for form in queryset.iterator(chunk_size=500):
+        data = form.submission_data
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                continue
+        if not isinstance(data, dict):
+            continue
+
+        for entry in _as_list(data.pop('notes_history', None)):
+            notes.append(CandidateNote(
+                form_id=form.pk,
+                note=str(entry.get('note') or ''),
+                author=str(entry.get('author') or '')[:255],
+                created_at=_parse_ts(entry.get('updated_at'), form.submitted_at),
+            ))
+        for entry in _as_list(data.pop('status_history', None)):
+            entry = dict(entry)
+            events.append(CandidateStatusEvent(
+                form_id=form.pk,
+                from_status=str(entry.pop('from', '') or '')[:50],
+                to_status=str(entry.pop('to', '') or '')[:50],
+                phase=str(entry.pop('phase', '') or '')[:100],
+                reason=str(entry.pop('reason', '') or ''),
+                action=str(entry.pop('action', '') or '')[:50],
+                created_at=_parse_ts(entry.pop('updated_at', None), form.submitted_at),
+                details=entry,
+            ))
+        for entry in _as_list(data.pop('email_message', None)):
+            messages.append(CandidateSentMessage(
+                form_id=form.pk,
+                subject=str(entry.get('subject') or '')[:255],
+                message=str(entry.get('message') or ''),
+                cc=entry.get('cc') if isinstance(entry.get('cc'), list) else [],
+                attachments=entry.get('attachments') if isinstance(entry.get('attachments'), list) else [],
+                created_at=_parse_ts(entry.get('timestamp'), form.submitted_at),
+            ))
+
+        form.phase = str(data.pop('phase', '') or '').strip()[:100]
+        form.status_details = {key: data.pop(key) for key in STATE_KEYS if key in data}
+        form.submission_data = data
+        forms.append(form)
+        if len(forms) >= 500:
+            flush()
+
+    flush()
+
+
+def restore_histories(apps, schema_editor):
+    """Reverse of move_histories: fold the child rows back into submission_data."""
+    import json
+
+    FormData = apps.get_model('form_data', 'FormData')
+    forms = []
+    queryset = FormData.objects.only('id', 'submission_data', 'status', 'phase', 'status_details').prefetch_related(
+        'notes', 'status_events', 'sent_messages'
+    )
+    for form in queryset.iterator(chunk_size=500):
+        data = form.submission_data
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                continue
+        if not isinstance(data, dict):
+            continue
+
+        data.update(form.status_details or {})
+        data['status'] = form.status
+        if form.phase:
+            data['phase'] = form.phase
+        notes = sorted(form.notes.all(), key=lambda n: (n.created_at, n.pk))
+        if notes:
+            data['notes_history'] = [
+                {'note': n.note, 'author': n.author, 'updated_at': n.created_at.isoformat()} for n in notes
+            ]
+        events = sorted(form.status_events.all(), key=lambda e: (e.created_at, e.pk))
+        if events:
+            data['status_history'] = []
+            for e in events:
+                entry = {'from': e.from_status, 'to': e.to_status}
+                entry.update({k: getattr(e, k) for k in ('phase', 'reason', 'action') if getattr(e, k)})
+                entry.update(e.details or {})
+                entry['updated_at'] = e.created_at.isoformat()
+                data['status_history'].append(entry)
+        messages = sorted(form.sent_messages.all(), key=lambda m: (m.created_at, m.pk))
+        if messages:
+            data['email_message'] = [
+                {'subject': m.subject, 'message': m.message, 'cc': m.cc, 'attachments': m.attachments}
+                for m in messages
+            ]
+
+        form.submission_data = data
+        forms.append(form)
+        if len(forms) >= 500:
+            FormData.objects.bulk_update(forms, ['submission_data'])
+            forms = []
+
+    if forms:
+        FormData.objects.bulk_update(forms, ['submission_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form_data', '0009_candidatecounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formdata',
+            name='phase',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='formdata',
+            name='status_details',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.CreateModel(
+            name='CandidateNote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note', models.TextField()),
+                ('author', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('form', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='notes', to='form_data.formdata')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['form', 'created_at'], name='candidate_note_form_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateSentMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(blank=True, default='', max_length=255)),
+                ('message', models.TextField(blank=True, default='')),
+                ('cc', models.JSONField(blank=True, default=list)),
+                ('attachments', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('form', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_messages', to='form_data.formdata')),
+                ('sent_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['form', 'created_at'], name='candidate_message_form_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(max_length=50)),
+                ('to_status', models.CharField(max_length=50)),
+                ('phase', models.CharField(blank=True, default='', max_length=100)),
+                ('reason', models.TextField(blank=True, default='')),
+                ('action', models.CharField(blank=True, default='', max_length=50)),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('form', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='form_data.formdata')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['form', 'created_at'], name='candidate_status_form_idx')],
+            },
+        ),
+        migrations.RunPython(move_histories, restore_histories),
+    ]
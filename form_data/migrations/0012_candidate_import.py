@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_email_identities(apps, schema_editor):
+    """Register each existing e-mail once, owned by the earliest submission."""
+    FormData = apps.get_model('form_data', 'FormData')
+    CandidateIdentity = apps.get_model('form_data', 'CandidateIdentity')
+
+    seen = set()
+    batch = []
+    queryset = FormData.objects.exclude(email='').order_by('submitted_at', 'id').values_list('id', 'email')
+    for form_id, email in queryset.iterator(chunk_size=2000):
+        if email in seen:
+            continue
+        seen.add(email)
+        batch.append(CandidateIdentity(kind='email', value=email[:255], form_id=form_id))
+        if len(batch) >= 2000:
+            CandidateIdentity.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    if batch:
+        CandidateIdentity.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0018_location_address_location_country_location_state'),
+        ('form_data', '0011_statusemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='candidate_imports/')),
+                ('original_name', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('rows_read', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('duplicates', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('committed_rows', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='create_job.add_job')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateIdentity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('email', 'E-mail')], max_length=10)),
+                ('value', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='identities', to='form_data.formdata')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'value'), name='candidate_identity_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_email_identities, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,183 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:40
+
+import hashlib
+import json
+import re
+from datetime import datetime
+
+from django.db import migrations, models
+
+# Frozen copy of form_data.normalize as of this migration, so later changes to the
+# live normalisation do not change what this migration writes
+
+DEFAULT_COUNTRY_CODE = '91'
+PHONE_KEYS = ('Phone', 'phone', 'phone_number', 'Mobile', 'mobile', 'mobile_phone')
+DOB_KEYS = ('DOB', 'Dob', 'dob', 'Date_of_Birth', 'Date_Of_Birth', 'date_of_birth')
+DOB_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y', '%Y/%m/%d', '%d %b %Y', '%d %B %Y')
+KINDS = ('email', 'phone', 'name_dob')
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def as_submission_dict(value):
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+
+def normalize_email(value):
+    if not value:
+        return ''
+    return str(value).strip().lower()
+
+
+def normalize_phone(value):
+    if not value:
+        return ''
+    raw = str(value).strip()
+    digits = _NON_DIGITS.sub('', raw)
+    if raw.startswith('00'):
+        digits = digits[2:]
+    elif not raw.startswith('+'):
+        digits = digits.lstrip('0')
+        if len(digits) == 10:
+            digits = DEFAULT_COUNTRY_CODE + digits
+    if not 8 <= len(digits) <= 15:
+        return ''
+    return '+' + digits
+
+
+def normalize_dob(value):
+    if not value:
+        return ''
+    text = ' '.join(str(value).split())
+    for fmt in DOB_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text.lower()
+
+
+def name_dob_key(name, dob):
+    name = ' '.join(str(name or '').lower().split())
+    dob = normalize_dob(dob)
+    if not name or not dob:
+        return ''
+    return hashlib.sha256(f'{name}|{dob}'.encode('utf-8')).hexdigest()
+
+
+def _first(data, keys):
+    for key in keys:
+        if data.get(key):
+            return data[key]
+    return ''
+
+
+def identity_values(data):
+    data = as_submission_dict(data)
+    name = data.get('Name') or ' '.join(
+        str(part) for part in (data.get('First_Name'), data.get('Last_Name')) if part
+    )
+    return (
+        normalize_email(data.get('Email') or data.get('email'))[:254],
+        normalize_phone(_first(data, PHONE_KEYS)),
+        name_dob_key(name, _first(data, DOB_KEYS)),
+    )
+
+
+def register_identities(apps, schema_editor):
+    """Re-register the keys of every FormData row, earliest submission first.
+
+    E-mails are unique per job (the merge key); phone and name + DOB keys are kept for
+    every row, as they only flag possible duplicates.
+    """
+    FormData = apps.get_model('form_data', 'FormData')
+    CandidateIdentity = apps.get_model('form_data', 'CandidateIdentity')
+    CandidateIdentity.objects.all().delete()
+
+    seen = set()
+    batch = []
+    queryset = FormData.objects.order_by('submitted_at', 'id').values_list('id', 'job_id', 'submission_data')
+    for form_id, job_id, submission_data in queryset.iterator(chunk_size=2000):
+        job_key = job_id or 0
+        for kind, value in zip(KINDS, identity_values(submission_data)):
+            if not value:
+                continue
+            if kind == 'email':
+                if (value, job_key) in seen:
+                    continue
+                seen.add((value, job_key))
+            batch.append(CandidateIdentity(kind=kind, value=value, job_key=job_key, form_id=form_id))
+        if len(batch) >= 2000:
+            CandidateIdentity.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        CandidateIdentity.objects.bulk_create(batch)
+
+
+def restore_email_identities(apps, schema_editor):
+    """The 0012 layout: each e-mail once across all jobs, owned by the earliest submission."""
+    FormData = apps.get_model('form_data', 'FormData')
+    CandidateIdentity = apps.get_model('form_data', 'CandidateIdentity')
+    CandidateIdentity.objects.all().delete()
+
+    seen = set()
+    batch = []
+    queryset = FormData.objects.exclude(email='').order_by('submitted_at', 'id').values_list('id', 'email')
+    for form_id, email in queryset.iterator(chunk_size=2000):
+        if email in seen:
+            continue
+        seen.add(email)
+        batch.append(CandidateIdentity(kind='email', value=email[:255], form_id=form_id))
+        if len(batch) >= 2000:
+            CandidateIdentity.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        CandidateIdentity.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+    """Not atomic: PostgreSQL refuses to alter a table in the transaction that rewrote its
+    rows (pending FK trigger events), so the rebuild runs in a transaction of its own
+    between the schema changes."""
+
+    atomic = False
+
+    dependencies = [
+        ('form_data', '0012_candidate_import'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidateidentity',
+            name='kind',
+            field=models.CharField(choices=[('email', 'E-mail'), ('phone', 'Phone'), ('name_dob', 'Name and date of birth')], max_length=10),
+        ),
+        migrations.RemoveConstraint(
+            model_name='candidateidentity',
+            name='candidate_identity_uniq',
+        ),
+        migrations.AddField(
+            model_name='candidateidentity',
+            name='job_key',
+            field=models.BigIntegerField(default=0, help_text='add_job id of the application, 0 when it has no job'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateidentity',
+            index=models.Index(fields=['kind', 'value'], name='candidate_identity_value_idx'),
+        ),
+        migrations.RunPython(register_identities, restore_email_identities, atomic=True),
+        migrations.AddConstraint(
+            model_name='candidateidentity',
+            constraint=models.UniqueConstraint(condition=models.Q(('kind', 'email')), fields=('kind', 'value', 'job_key'), name='candidate_identity_email_job_uniq'),
+        ),
+    ]
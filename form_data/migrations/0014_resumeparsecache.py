@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form_data', '0013_candidate_identity_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeParseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('parser', models.CharField(max_length=50)),
+                ('parser_version', models.CharField(max_length=50)),
+                ('text', models.TextField(blank=True, default='')),
+                ('result', models.JSONField(default=dict)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['parser', 'parser_version'], name='resume_parse_cache_parser_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'parser', 'parser_version'), name='resume_parse_cache_key_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def parse_string_submissions(apps, schema_editor):
+    """Store submission_data saved as a JSON string scalar as the object it encodes.
+
+    The form ingest views have passed json.dumps(submission_data) to the serializer from
+    the start, so any row, including those from before the first migration here, may
+    hold a string, and ->> returns NULL for every key. Every row whose value is a string
+    encoding an object is rewritten; objects and other strings are left alone. The
+    reverse is a no-op: rows stay objects, which every reader accepts.
+    """
+    import json
+
+    FormData = apps.get_model('form_data', 'FormData')
+    forms = []
+    for form in FormData.objects.only('id', 'submission_data').iterator(chunk_size=500):
+        if not isinstance(form.submission_data, str):
+            continue
+        try:
+            data = json.loads(form.submission_data)
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        form.submission_data = data
+        forms.append(form)
+        if len(forms) >= 500:
+            FormData.objects.bulk_update(forms, ['submission_data'])
+            forms.clear()
+    FormData.objects.bulk_update(forms, ['submission_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form_data', '0015_resumeparsejob'),
+    ]
+
+    operations = [
+        migrations.RunPython(parse_string_submissions, migrations.RunPython.noop),
+    ]
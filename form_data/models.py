@@ -1,4 +1,15 @@
-from django.db import models
+import json
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connection, models, transaction
+from django.conf import settings
+from django.db.models.functions import Upper
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .normalize import as_submission_dict, identity_values, normalize_email, submission_job_id
+from .search import build_search_text, search_vector
+
 
 class FormData(models.Model):
     form_name = models.CharField(max_length=255 , default='gxi_form')
@@ -13,14 +24,575 @@ class FormData(models.Model):
     meeting_start = models.DateTimeField(blank=True, null=True)
     meeting_end = models.DateTimeField(blank=True, null=True)
 
+    #### Indexed copies of hot submission_data keys (kept in sync by save()) #####
+    role_type = models.CharField(max_length=255, blank=True, default='')
+    status = models.CharField(max_length=50, default='Scouting')
+    email = models.CharField(max_length=254, blank=True, default='')
+    job = models.ForeignKey(
+        'create_job.add_job',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        db_index=False,
+        related_name='form_submissions',
+    )
+    # Lower-cased name/email/phone/role/organisation/university/notes for candidate search
+    search_text = models.TextField(blank=True, default='')
+
+    #### Pipeline state (owned by FormDataAPIView.put, history lives in the child tables) #####
+    phase = models.CharField(max_length=100, blank=True, default='')
+    # reject_reason, interview/offer/joining dates, archived flag, latest note and its author
+    status_details = models.JSONField(default=dict, blank=True)
+
+    INDEXED_FIELDS = ('role_type', 'email', 'job', 'search_text')
+    PIPELINE_FIELDS = ('status', 'phase', 'status_details')
+    # Child tables submission_with_history() reads; prefetch them when serialising many rows
+    HISTORY_RELATIONS = ('notes', 'status_events', 'sent_messages')
+
     class Meta:
         indexes = [
             models.Index(fields=['form_name']),
             models.Index(fields=['submitted_at']),
             models.Index(fields=['candidate_email']),
+            models.Index(fields=['-submitted_at', '-id'], name='formdata_submitted_id_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='formdata_status_submitted_idx'),
+            models.Index(fields=['role_type', '-submitted_at'], name='formdata_role_submitted_idx'),
+            models.Index(fields=['job', 'status'], name='formdata_job_status_idx'),
+            models.Index(fields=['email'], name='formdata_email_idx'),
+            models.Index(Upper('role_type'), name='formdata_role_upper_idx'),
+            GinIndex(OpClass('search_text', name='gin_trgm_ops'), name='formdata_search_trgm_idx'),
+            GinIndex(search_vector(), name='formdata_search_vector_idx'),
         ]
         ordering = ['-submitted_at']
 
 
     def __str__(self):
         return f"{self.form_name} submitted at {self.submitted_at}"
+
+    def sync_indexed_fields(self, search_text=True):
+        """Copy Role_Type / Email / job_id and the search document out of submission_data.
+
+        status and phase are only taken from submission_data when the row is created;
+        after that the columns are the source of truth. Called from save(); bulk_create()
+        skips save(), so bulk writers must call it themselves.
+        """
+        data = as_submission_dict(self.submission_data)
+        self.role_type = str(data.get('Role_Type') or '').strip()[:255]
+        self.email = normalize_email(data.get('Email'))[:254]
+        self.job_id = submission_job_id(data)
+        if self._state.adding:
+            self.status = str(data.get('status') or self.status or 'Scouting').strip()[:50]
+            self.phase = str(data.get('phase') or self.phase or '').strip()[:100]
+        if search_text:
+            notes = self.notes.values_list('note', flat=True) if self.pk else ()
+            self.search_text = build_search_text(data, self.form_name, notes=notes)
+
+    def submission_with_history(self):
+        """submission_data in the shape clients have always seen.
+
+        Current status/phase/details and the notes, status and e-mail histories are
+        merged back in from their columns and child tables: three queries unless
+        HISTORY_RELATIONS were prefetched.
+        """
+        data = dict(as_submission_dict(self.submission_data))
+        data.update(self.status_details or {})
+        data['status'] = self.status
+        if self.phase:
+            data['phase'] = self.phase
+        data['notes_history'] = [n.as_history_entry() for n in self.notes.all()]
+        data['status_history'] = [e.as_history_entry() for e in self.status_events.all()]
+        data['email_message'] = [m.as_history_entry() for m in self.sent_messages.all()]
+        return data
+
+    @property
+    def counter_key(self):
+        return (self.status, self.role_type, self.job_id or 0)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted (status, role, job) so save() can move the counters
+        if all(f in instance.__dict__ for f in ('status', 'role_type', 'job_id')):
+            instance._persisted_counter_key = instance.counter_key
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if isinstance(self.submission_data, str):
+            # Ingest views hand the serializer the raw JSON text; keep it as an object so
+            # ->> lookups (candidate cards, bulk transitions) can read its keys
+            try:
+                parsed = json.loads(self.submission_data)
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, dict):
+                self.submission_data = parsed
+        if update_fields is not None and 'submission_data' in update_fields:
+            kwargs['update_fields'] = update_fields = set(update_fields) | set(self.INDEXED_FIELDS)
+        self.sync_indexed_fields(search_text=update_fields is None or 'search_text' in update_fields)
+        tracks_counters = update_fields is None or bool({'status', 'role_type', 'job'} & set(update_fields))
+        adding = self._state.adding
+
+        with transaction.atomic():
+            old_key = None
+            if not adding and tracks_counters:
+                old_key = getattr(self, '_persisted_counter_key', None)
+                if old_key is None:
+                    row = (
+                        FormData.objects.filter(pk=self.pk)
+                        .values_list('status', 'role_type', 'job_id')
+                        .first()
+                    )
+                    old_key = row and (row[0], row[1], row[2] or 0)
+                    self._persisted_counter_key = old_key
+            super().save(*args, **kwargs)
+            if adding:
+                job_key = self.job_id or 0
+                keys = CandidateIdentity.keys_for(self.submission_data)
+                claimed = CandidateIdentity.claim([(kind, value, job_key, self.pk) for kind, value in keys])
+                # The e-mail already applied to this job; ingest views use this to merge
+                self._identity_conflicts = [key for key in keys if (*key, job_key) not in claimed]
+            new_key = self.counter_key
+            if tracks_counters and (adding or old_key != new_key):
+                deltas = {new_key: 1}
+                if old_key:
+                    deltas[old_key] = -1
+                CandidateCounter.apply(deltas)
+        self._persisted_counter_key = new_key
+
+
+class CandidateCounter(models.Model):
+    """Number of FormData rows per (status, role_type, job).
+
+    Maintained in the same transaction as every FormData insert, status/role/job change
+    and delete; `manage.py reconcile_candidate_counters` rebuilds it from FormData.
+    """
+
+    status = models.CharField(max_length=50)
+    role_type = models.CharField(max_length=255, blank=True, default='')
+    job_key = models.BigIntegerField(default=0, help_text='add_job id, 0 when the candidate has no job')
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['status', 'role_type', 'job_key'], name='candidate_counter_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.status} / {self.role_type or '-'} / job {self.job_key}: {self.count}"
+
+    @classmethod
+    def apply(cls, deltas):
+        """Add {(status, role_type, job_key): delta} atomically (INSERT .. ON CONFLICT)."""
+        rows = [(*key, delta) for key, delta in sorted(deltas.items()) if delta]
+        if not rows:
+            return
+        table = connection.ops.quote_name(cls._meta.db_table)
+        sql = (
+            f'INSERT INTO {table} ("status", "role_type", "job_key", "count") VALUES (%s, %s, %s, %s) '
+            f'ON CONFLICT ("status", "role_type", "job_key") DO UPDATE SET "count" = {table}."count" + EXCLUDED."count"'
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+
+def _as_datetime(value, default=None):
+    if hasattr(value, 'tzinfo'):
+        return value
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        return default or timezone.now()
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class CandidateNote(models.Model):
+    """Append-only note on a candidate (formerly submission_data["notes_history"])."""
+
+    form = models.ForeignKey(FormData, on_delete=models.CASCADE, related_name='notes', db_index=False)
+    note = models.TextField()
+    author = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['form', 'created_at'], name='candidate_note_form_idx'),
+        ]
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"Note on {self.form_id} by {self.author or '-'}"
+
+    def as_history_entry(self):
+        return {"note": self.note, "author": self.author, "updated_at": self.created_at.isoformat()}
+
+
+class CandidateStatusEvent(models.Model):
+    """Append-only status transition (formerly submission_data["status_history"])."""
+
+    form = models.ForeignKey(FormData, on_delete=models.CASCADE, related_name='status_events', db_index=False)
+    from_status = models.CharField(max_length=50)
+    to_status = models.CharField(max_length=50)
+    phase = models.CharField(max_length=100, blank=True, default='')
+    reason = models.TextField(blank=True, default='')
+    action = models.CharField(max_length=50, blank=True, default='')
+    # interview/offer/joining dates recorded with the transition
+    details = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['form', 'created_at'], name='candidate_status_form_idx'),
+        ]
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"{self.form_id}: {self.from_status} -> {self.to_status}"
+
+    @classmethod
+    def from_history_entry(cls, form, entry):
+        """Build an event from a legacy status_history dict ({"from", "to", "phase", ...})."""
+        entry = dict(entry)
+        return cls(
+            form=form,
+            from_status=str(entry.pop('from', '') or '')[:50],
+            to_status=str(entry.pop('to', '') or '')[:50],
+            phase=str(entry.pop('phase', '') or '')[:100],
+            reason=str(entry.pop('reason', '') or ''),
+            action=str(entry.pop('action', '') or '')[:50],
+            created_at=_as_datetime(entry.pop('updated_at', None)),
+            details=entry,
+        )
+
+    def as_history_entry(self):
+        entry = {"from": self.from_status, "to": self.to_status}
+        for key in ('phase', 'reason', 'action'):
+            if getattr(self, key):
+                entry[key] = getattr(self, key)
+        entry.update(self.details or {})
+        entry["updated_at"] = self.created_at.isoformat()
+        return entry
+
+
+class CandidateSentMessage(models.Model):
+    """Append-only log of e-mails composed to a candidate (formerly submission_data["email_message"])."""
+
+    form = models.ForeignKey(FormData, on_delete=models.CASCADE, related_name='sent_messages', db_index=False)
+    subject = models.CharField(max_length=255, blank=True, default='')
+    message = models.TextField(blank=True, default='')
+    cc = models.JSONField(default=list, blank=True)
+    attachments = models.JSONField(default=list, blank=True)
+    sent_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['form', 'created_at'], name='candidate_message_form_idx'),
+        ]
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"Message to {self.form_id}: {self.subject or '(no subject)'}"
+
+    def as_history_entry(self):
+        entry = {"message": self.message, "cc": self.cc, "attachments": self.attachments}
+        if self.subject:
+            entry["subject"] = self.subject
+        entry["timestamp"] = self.created_at.isoformat()
+        return entry
+
+
+class StatusEmail(models.Model):
+    """Transactional outbox for candidate welcome / status e-mails.
+
+    Rows are written in the same transaction as the change that triggers them and
+    delivered by the form_data.tasks.drain_status_email_outbox Celery task; the row
+    doubles as the per-candidate delivery record.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    form = models.ForeignKey(FormData, on_delete=models.CASCADE, related_name='status_emails', db_index=False)
+    to_email = models.CharField(max_length=254)
+    # build_status_email() keyword arguments other than candidate_email
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='status_email_due_idx'),
+            models.Index(fields=['form', 'created_at'], name='status_email_form_idx'),
+        ]
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"{self.payload.get('current_status', '-')} e-mail to {self.to_email} ({self.status})"
+
+
+class CandidateIdentity(models.Model):
+    """Normalized identity key of one FormData row (one application).
+
+    Keys are the lower-cased e-mail, the E.164 phone number and a SHA-256 of name plus
+    date of birth. Only the e-mail identifies a candidate: it is unique per job (the
+    partial unique constraint is the ON CONFLICT target ingest paths use to find an
+    earlier application to the same job). Phone and name + DOB are shared by relatives
+    and namesakes, so every application registers them and matches are only flagged as
+    possible duplicates. FormData.save() registers the keys of every new row; bulk
+    writers call claim() themselves.
+    """
+
+    EMAIL = 'email'
+    PHONE = 'phone'
+    NAME_DOB = 'name_dob'
+    KIND_CHOICES = [
+        (EMAIL, 'E-mail'),
+        (PHONE, 'Phone'),
+        (NAME_DOB, 'Name and date of birth'),
+    ]
+    KINDS = (EMAIL, PHONE, NAME_DOB)
+    # Keys that flag a possible duplicate but never merge two applications
+    DUPLICATE_KINDS = (PHONE, NAME_DOB)
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=255)
+    job_key = models.BigIntegerField(default=0, help_text='add_job id of the application, 0 when it has no job')
+    form = models.ForeignKey(FormData, on_delete=models.CASCADE, related_name='identities')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'value', 'job_key'],
+                condition=models.Q(kind='email'),
+                name='candidate_identity_email_job_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'value'], name='candidate_identity_value_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.value} (job {self.job_key}) -> {self.form_id}"
+
+    @classmethod
+    def keys_for(cls, submission):
+        """[(kind, value)] identity keys of a submission, e-mail first."""
+        return [(kind, value) for kind, value in zip(cls.KINDS, identity_values(submission)) if value]
+
+    @classmethod
+    def email_of(cls, keys):
+        """The e-mail among keys_for() keys ("" when the submission has none)."""
+        return next((value for kind, value in keys if kind == cls.EMAIL), '')
+
+    @classmethod
+    def lookup(cls, applications):
+        """{(email, job_key): form_id} for the (email, job_key) pairs already on file (one query)."""
+        applications = list(applications)
+        if not applications:
+            return {}
+        query = models.Q()
+        for job_key in {job_key for _, job_key in applications}:
+            query |= models.Q(job_key=job_key, value__in=[email for email, j in applications if j == job_key])
+        rows = cls.objects.filter(query, kind=cls.EMAIL).values_list('value', 'job_key', 'form_id')
+        return {(email, job_key): form_id for email, job_key, form_id in rows}
+
+    @classmethod
+    def find_form_id(cls, email, job_key):
+        """Id of the application this e-mail already made to the job, or None."""
+        if not email:
+            return None
+        return cls.lookup([(email, job_key)]).get((email, job_key))
+
+    @classmethod
+    def latest_by_email(cls, emails):
+        """{email: id of the most recent application with that e-mail, any job} (one query)."""
+        emails = list(emails)
+        if not emails:
+            return {}
+        rows = cls.objects.filter(kind=cls.EMAIL, value__in=emails).order_by('form_id').values_list('value', 'form_id')
+        return dict(rows)
+
+    @classmethod
+    def claim(cls, rows):
+        """Insert (kind, value, job_key, form_id) rows.
+
+        An e-mail already registered for the same job is skipped; phone and name + DOB
+        rows are always inserted. Returns the set of (kind, value, job_key) this call
+        inserted.
+        """
+        rows = [row for row in rows if row[1]]
+        if not rows:
+            return set()
+        now = timezone.now()
+        table = connection.ops.quote_name(cls._meta.db_table)
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+        params = [p for kind, value, job_key, form_id in rows for p in (kind, value[:255], job_key, form_id, now)]
+        sql = (
+            f'INSERT INTO {table} ("kind", "value", "job_key", "form_id", "created_at") VALUES {values} '
+            f'ON CONFLICT ("kind", "value", "job_key") WHERE "kind" = \'{cls.EMAIL}\' DO NOTHING '
+            f'RETURNING "kind", "value", "job_key"'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return {tuple(row) for row in cursor.fetchall()}
+
+
+class CandidateImportJob(models.Model):
+    """Background CSV / XLSX / XLS candidate import (see form_data.imports).
+
+    Progress counters are committed together with each chunk of rows, so an
+    interrupted import resumes after committed_rows.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    ]
+
+    file = models.FileField(upload_to='candidate_imports/')
+    original_name = models.CharField(max_length=255, blank=True, default='')
+    job = models.ForeignKey('create_job.add_job', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    rows_read = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    # Data rows (header excluded) covered by committed chunks; resume starts after these
+    committed_rows = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import {self.pk} ({self.original_name}): {self.status}"
+
+    def progress(self):
+        return {
+            "id": self.pk,
+            "file_name": self.original_name,
+            "job_id": self.job_id,
+            "status": self.status,
+            "rows_read": self.rows_read,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "committed_rows": self.committed_rows,
+            "errors": self.errors[-20:],
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ResumeParseCache(models.Model):
+    """Durable copy of a resume parse, keyed by the SHA-256 of the file bytes.
+
+    One row per (content_hash, parser, parser_version); bumping a parser's version
+    makes its old rows unreachable. Hot entries are also kept in Redis, see
+    form_data.parse_cache. `manage.py invalidate_resume_cache` clears both.
+    """
+
+    content_hash = models.CharField(max_length=64)
+    parser = models.CharField(max_length=50)
+    parser_version = models.CharField(max_length=50)
+    text = models.TextField(blank=True, default='')
+    result = models.JSONField(default=dict)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_hash', 'parser', 'parser_version'], name='resume_parse_cache_key_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['parser', 'parser_version'], name='resume_parse_cache_parser_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.parser}@{self.parser_version}: {self.content_hash[:12]}"
+
+
+class ResumeParseJob(models.Model):
+    """Resume parse run by the parse_resume_job Celery task (see form_data.resume_jobs).
+
+    Clients submit a file, then poll the job or follow ws/resume-parse-jobs/<id>/.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    ]
+
+    parser = models.CharField(max_length=50)
+    # Emptied once the job completes; the parse itself lives on in ResumeParseCache
+    file = models.FileField(upload_to='resume_parse_jobs/', blank=True)
+    original_name = models.CharField(max_length=255, blank=True, default='')
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    cached = models.BooleanField(default=False)
+    result = models.JSONField(null=True, blank=True)
+    error = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Resume parse {self.pk} ({self.parser}): {self.status}"
+
+    def progress(self):
+        return {
+            "id": self.pk,
+            "parser": self.parser,
+            "file_name": self.original_name,
+            "status": self.status,
+            "cached": self.cached,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import re
+from datetime import datetime
+
+# Numbers without a country code are assumed to be Indian, as in the WATI integration
+DEFAULT_COUNTRY_CODE = "91"
+
+PHONE_KEYS = ("Phone", "phone", "phone_number", "Mobile", "mobile", "mobile_phone")
+DOB_KEYS = ("DOB", "Dob", "dob", "Date_of_Birth", "Date_Of_Birth", "date_of_birth")
+DOB_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y/%m/%d", "%d %b %Y", "%d %B %Y")
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_email(value):
+    """Lower-cased, trimmed e-mail used for indexed lookups ("" when missing)."""
+    if not value:
+        return ""
+    return str(value).strip().lower()
+
+
+def normalize_phone(value, default_cc=DEFAULT_COUNTRY_CODE):
+    """E.164 form of a phone number ("+919876543210"), or "" when it is not plausible."""
+    if not value:
+        return ""
+    raw = str(value).strip()
+    digits = _NON_DIGITS.sub("", raw)
+    if raw.startswith("00"):
+        digits = digits[2:]
+    elif not raw.startswith("+"):
+        digits = digits.lstrip("0")
+        if len(digits) == 10:
+            digits = default_cc + digits
+    if not 8 <= len(digits) <= 15:
+        return ""
+    return "+" + digits
+
+
+def normalize_dob(value):
+    """ISO date for a date of birth in one of the common formats, else the trimmed text."""
+    if not value:
+        return ""
+    text = " ".join(str(value).split())
+    for fmt in DOB_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text.lower()
+
+
+def name_dob_key(name, dob):
+    """SHA-256 of the normalized name and date of birth ("" unless both are present)."""
+    name = " ".join(str(name or "").lower().split())
+    dob = normalize_dob(dob)
+    if not name or not dob:
+        return ""
+    return hashlib.sha256(f"{name}|{dob}".encode("utf-8")).hexdigest()
+
+
+def _first(data, keys):
+    for key in keys:
+        if data.get(key):
+            return data[key]
+    return ""
+
+
+def identity_values(data):
+    """(email, phone, name_dob) identity values of a submission, "" for the missing ones."""
+    data = as_submission_dict(data)
+    name = data.get("Name") or " ".join(
+        str(part) for part in (data.get("First_Name"), data.get("Last_Name")) if part
+    )
+    return (
+        normalize_email(data.get("Email") or data.get("email"))[:254],
+        normalize_phone(_first(data, PHONE_KEYS)),
+        name_dob_key(name, _first(data, DOB_KEYS)),
+    )
+
+
+def submission_job_id(data):
+    """add_job id a submission applies to (its job_id answer), or None."""
+    value = as_submission_dict(data).get("job_id")
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def as_submission_dict(value):
+    """submission_data is normally a dict, but some write paths store the raw JSON string."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from .normalize import as_submission_dict
+
+
+def build_status_email(candidate_email, candidate_name, current_status, phase=None,
+                       interview_date=None, interview_time=None, joining_date=None, is_new_candidate=False):
+    """Render the welcome / status-update e-mail for a candidate (None without an address)."""
+    if not candidate_email:
+        return None
+
+    if is_new_candidate:
+        template_name = "application_welcome.html"
+        subject = "Thank You For Applying - GXI Networks"
+    else:
+        template_name = "application_status.html"
+        subject = f"Update: Your Application Status - {current_status}"
+
+    context = {
+        "candidate_name": candidate_name,
+        "current_status": current_status,
+        "phase": phase,
+        "interview_date": interview_date,
+        "interview_time": interview_time,
+        "joining_date": joining_date,
+    }
+
+    html_message = render_to_string(template_name, context)
+    text_message = strip_tags(html_message) if html_message else "Your application status has been updated."
+
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text_message,
+        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None) or "",
+        to=[candidate_email],
+    )
+    if html_message:
+        message.attach_alternative(html_message, "text/html")
+    return message
+
+
+def submission_notification(submission, is_new_candidate=False):
+    """build_status_email() kwargs for a form that has just been submitted."""
+    submission = as_submission_dict(submission)
+    return {
+        "candidate_email": submission.get("Email"),
+        "candidate_name": submission.get("Name"),
+        "current_status": submission.get("status", "Applied"),
+        "phase": submission.get("phase"),
+        "interview_date": submission.get("interview_date"),
+        "interview_time": submission.get("interview_time"),
+        "joining_date": submission.get("joining_date"),
+        "is_new_candidate": is_new_candidate,
+    }
@@ -0,0 +1,120 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import StatusEmail
+from .notifications import build_status_email
+
+logger = logging.getLogger(__name__)
+
+# Retry n waits RETRY_BASE_SECONDS * 2**(n-1) (+/-20% jitter), capped at RETRY_MAX_SECONDS
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 60 * 60
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def queue_status_emails(items):
+    """Write status e-mails to the outbox as part of the caller's transaction.
+
+    `items` are (form, notification) pairs, notification being build_status_email()
+    keyword arguments. The drain task is kicked once the transaction commits; the
+    periodic beat run picks up anything that kick misses.
+    """
+    rows = []
+    for form, notification in items:
+        payload = dict(notification)
+        to_email = payload.pop("candidate_email", None)
+        if to_email:
+            rows.append(StatusEmail(form=form, to_email=str(to_email).strip()[:254], payload=payload))
+    if not rows:
+        return []
+
+    StatusEmail.objects.bulk_create(rows)
+    transaction.on_commit(_kick_drain, robust=True)
+    return rows
+
+
+def _kick_drain():
+    from .tasks import drain_status_email_outbox
+
+    drain_status_email_outbox.delay()
+
+
+def retry_delay(attempts):
+    delay = min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def deliver_due_emails(batch_size=None):
+    """Send one batch of due outbox rows over a single SMTP connection.
+
+    Rows are claimed with SELECT .. FOR UPDATE SKIP LOCKED so several workers can
+    drain in parallel. Returns {"sent": n, "retry": n, "failed": n}.
+    """
+    batch_size = batch_size or _setting("STATUS_EMAIL_BATCH_SIZE", 50)
+    max_attempts = _setting("STATUS_EMAIL_MAX_ATTEMPTS", 5)
+    result = {"sent": 0, "retry": 0, "failed": 0}
+
+    with transaction.atomic():
+        rows = list(
+            StatusEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=StatusEmail.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if not rows:
+            return result
+
+        connection = get_connection(fail_silently=False)
+        connection_error = None
+        try:
+            connection.open()
+        except Exception as exc:
+            connection_error = exc
+            logger.warning("SMTP connection failed, rescheduling %d status email(s): %s", len(rows), exc)
+
+        try:
+            for row in rows:
+                error = connection_error
+                if error is None:
+                    try:
+                        message = build_status_email(candidate_email=row.to_email, **row.payload)
+                        connection.send_messages([message])
+                    except Exception as exc:
+                        error = exc
+                        # The server may have dropped us; start the next message on a fresh connection
+                        connection.close()
+                        try:
+                            connection.open()
+                        except Exception as reopen_exc:
+                            connection_error = reopen_exc
+
+                row.attempts += 1
+                if error is None:
+                    row.status = StatusEmail.SENT
+                    row.sent_at = timezone.now()
+                    row.last_error = ""
+                    result["sent"] += 1
+                    continue
+
+                row.last_error = str(error)[:2000]
+                if row.attempts >= max_attempts:
+                    row.status = StatusEmail.FAILED
+                    result["failed"] += 1
+                    logger.error("Giving up on status email %s to %s: %s", row.pk, row.to_email, error)
+                else:
+                    row.next_attempt_at = timezone.now() + retry_delay(row.attempts)
+                    result["retry"] += 1
+        finally:
+            connection.close()
+
+        StatusEmail.objects.bulk_update(rows, ["status", "attempts", "last_error", "next_attempt_at", "sent_at"])
+    return result
+
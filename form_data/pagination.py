@@ -0,0 +1,167 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """User-supplied page_size, clamped to 1..MAX_PAGE_SIZE."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(submitted_at, pk):
+    raw = json.dumps({"t": submitted_at.isoformat(), "id": pk}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def estimated_count(queryset):
+    """Row count from planner statistics for unfiltered Postgres querysets.
+
+    Returns None when no estimate is available (filtered queryset, other backends,
+    or a table that has never been analysed); callers then fall back to COUNT(*).
+    """
+    if connection.vendor != "postgresql" or queryset.query.has_filters():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that takes its total from planner statistics when it can."""
+
+    is_estimate = False
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None:
+            return super().count
+        self.is_estimate = True
+        return estimate
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE, descending=True):
+    """Return (rows, next_cursor) ordered on (submitted_at, id).
+
+    Seeks past the cursor instead of using OFFSET, so every page costs the same.
+    """
+    if descending:
+        queryset = queryset.order_by("-submitted_at", "-id")
+    else:
+        queryset = queryset.order_by("submitted_at", "id")
+
+    if cursor:
+        submitted_at, pk = decode_cursor(cursor)
+        if descending:
+            queryset = queryset.filter(Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, id__lt=pk))
+        else:
+            queryset = queryset.filter(Q(submitted_at__gt=submitted_at) | Q(submitted_at=submitted_at, id__gt=pk))
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if isinstance(last, dict):  # .values() projection
+            next_cursor = encode_cursor(last["submitted_at"], last["id"])
+        else:
+            next_cursor = encode_cursor(last.submitted_at, last.pk)
+    return rows, next_cursor
+
+
+def keyset_descending(queryset):
+    """Direction of a queryset ordered on submitted_at, for keyset_page().
+
+    Raises InvalidCursor for any other ordering (search relevance, form_name): the
+    cursor only seeks on (submitted_at, id), so those pages would come back reordered.
+    """
+    ordering = tuple(queryset.query.order_by)
+    if ordering and ordering[-1].lstrip("-") in ("id", "pk"):
+        ordering = ordering[:-1]
+    if ordering in ((), ("-submitted_at",)):
+        return True
+    if ordering == ("submitted_at",):
+        return False
+    raise InvalidCursor(
+        "Cursor pagination needs the list ordered on submitted_at; "
+        "use page pagination with search relevance or other sort_by values"
+    )
+
+
+def paginate_candidates(request, queryset):
+    """Paginate a FormData list for the list endpoints; returns (rows, response_meta).
+
+    ?pagination=cursor (or any ?cursor=) switches to keyset mode. It follows the
+    queryset's submitted_at ordering (newest first unless sort_by=submitted_at) and is
+    rejected with InvalidCursor when the queryset is ordered on anything else, such as
+    a search without sort_by (relevance) or sort_by=form_name. ?count=estimate uses
+    planner statistics for the total instead of COUNT(*) on unfiltered lists; in cursor
+    mode the total is only computed when ?count=exact or ?count=estimate is passed.
+    """
+    params = request.query_params
+    page_size = parse_page_size(params.get("page_size"))
+    count_mode = params.get("count", "").lower()
+
+    if params.get("pagination") == "cursor" or "cursor" in params:
+        rows, next_cursor = keyset_page(
+            queryset,
+            cursor=params.get("cursor") or None,
+            page_size=page_size,
+            descending=keyset_descending(queryset),
+        )
+        meta = {"page_size": page_size, "next_cursor": next_cursor, "has_more": next_cursor is not None}
+        if count_mode in ("exact", "estimate"):
+            total = estimated_count(queryset) if count_mode == "estimate" else None
+            meta["total_is_estimate"] = total is not None
+            meta["total_records"] = total if total is not None else queryset.count()
+        return rows, meta
+
+    paginator_class = EstimatedCountPaginator if count_mode == "estimate" else Paginator
+    paginator = paginator_class(queryset, page_size)
+    try:
+        page = paginator.page(params.get("page", 1))
+    except PageNotAnInteger:
+        page = paginator.page(1)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
+
+    meta = {
+        "total_records": paginator.count,
+        "total_pages": paginator.num_pages,
+        "current_page": page.number,
+        "page_size": page_size,
+    }
+    if count_mode == "estimate":
+        meta["total_is_estimate"] = paginator.is_estimate
+    return page, meta
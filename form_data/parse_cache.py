@@ -0,0 +1,136 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ResumeParseCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "resume_parse"
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_upload(file_obj):
+    """All bytes of an uploaded file, leaving it rewound for the parser."""
+    file_obj.seek(0)
+    data = file_obj.read()
+    file_obj.seek(0)
+    return data
+
+
+def _cache_key(parser, version, digest):
+    return f"{CACHE_PREFIX}:{parser}:{version}:{digest}"
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception as exc:
+        # Redis being down must not break parsing; the DB copy still answers
+        logger.warning("Resume parse cache read failed for %s: %s", key, exc)
+        return None
+
+
+def _cache_set(key, entry):
+    try:
+        cache.set(key, entry, timeout=getattr(settings, "RESUME_PARSE_CACHE_TTL", 7 * 24 * 3600))
+    except Exception as exc:
+        logger.warning("Resume parse cache write failed for %s: %s", key, exc)
+
+
+def get_cached(parser, version, digest):
+    """{"text", "result"} for a cached parse (Redis first, then the DB), else None."""
+    key = _cache_key(parser, version, digest)
+    entry = _cache_get(key)
+    if entry is not None:
+        return entry
+
+    row = (
+        ResumeParseCache.objects.filter(content_hash=digest, parser=parser, parser_version=version)
+        .values("pk", "text", "result")
+        .first()
+    )
+    if row is None:
+        return None
+    ResumeParseCache.objects.filter(pk=row["pk"]).update(hits=F("hits") + 1, last_used_at=timezone.now())
+    entry = {"text": row["text"], "result": row["result"]}
+    _cache_set(key, entry)
+    return entry
+
+
+def store(parser, version, digest, text, result):
+    entry = {"text": text or "", "result": result}
+    try:
+        ResumeParseCache.objects.update_or_create(
+            content_hash=digest, parser=parser, parser_version=version,
+            defaults={"text": entry["text"], "result": result, "last_used_at": timezone.now()},
+        )
+    except IntegrityError:
+        # A concurrent parse of the same file stored it first
+        pass
+    _cache_set(_cache_key(parser, version, digest), entry)
+    return entry
+
+
+def cached_parse(parser, version, data, parse):
+    """Run `parse()` -> (text, result) unless this file was already parsed.
+
+    Keyed by the SHA-256 of `data` plus parser name and version. Returns
+    (text, result, hit). Raise from `parse()` to keep a failed parse out of the cache.
+    """
+    digest = content_hash(data)
+    entry = get_cached(parser, version, digest)
+    if entry is not None:
+        return entry["text"], entry["result"], True
+
+    text, result = parse()
+    store(parser, version, digest, text, result)
+    return text, result, False
+
+
+def parser_versions():
+    """Current version of every parser that caches through this module."""
+    from .resume_jobs import PARSERS
+
+    return {name: spec.version for name, spec in PARSERS.items()}
+
+
+def invalidate(parser=None, stale_only=False):
+    """Delete cached parses, optionally of one parser or only of outdated parser versions.
+
+    Returns the number of DB rows removed; matching Redis keys are dropped as well.
+    """
+    queryset = ResumeParseCache.objects.all()
+    if parser:
+        queryset = queryset.filter(parser=parser)
+
+    if stale_only:
+        for name, version in parser_versions().items():
+            queryset = queryset.exclude(parser=name, parser_version=version)
+        keys = [_cache_key(*row) for row in queryset.values_list("parser", "parser_version", "content_hash")]
+        try:
+            cache.delete_many(keys)
+        except Exception as exc:
+            logger.warning("Could not drop stale resume parse cache keys: %s", exc)
+    else:
+        delete_pattern = getattr(cache, "delete_pattern", None)
+        pattern = f"{CACHE_PREFIX}:{parser}:*" if parser else f"{CACHE_PREFIX}:*"
+        try:
+            if delete_pattern is not None:
+                delete_pattern(pattern)
+            else:
+                keys = [_cache_key(*row) for row in queryset.values_list("parser", "parser_version", "content_hash")]
+                cache.delete_many(keys)
+        except Exception as exc:
+            logger.warning("Could not drop resume parse cache keys %s: %s", pattern, exc)
+
+    deleted, _ = queryset.delete()
+    return deleted
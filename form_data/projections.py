@@ -0,0 +1,55 @@
+from django.db.models import F
+from django.db.models.fields.json import KT
+
+# Card field -> None for a model column of the same name, otherwise an expression
+# evaluated by the database. JSON keys are pulled out with ->> so the
+# submission_data blob itself is never sent to Django.
+CANDIDATE_CARD_FIELDS = {
+    "id": None,
+    "name": KT("submission_data__Name"),
+    "email": None,
+    "role": F("role_type"),
+    "status": None,
+    "phase": None,
+    "location": KT("submission_data__Location"),
+    "submitted_at": None,
+    # opt-in via ?fields=
+    "phone": KT("submission_data__Phone"),
+    "form_name": None,
+    "job_id": None,
+}
+
+DEFAULT_CARD_FIELDS = ("id", "name", "email", "role", "status", "phase", "location", "submitted_at")
+
+# Always selected: keyset pagination reads them from the last row of a page
+_CURSOR_FIELDS = ("id", "submitted_at")
+
+
+class InvalidFieldset(ValueError):
+    pass
+
+
+def parse_card_fields(param):
+    """Resolve ?fields=a,b,c into card field names (id is always included)."""
+    if not param:
+        return DEFAULT_CARD_FIELDS
+    fields = [f.strip() for f in param.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in CANDIDATE_CARD_FIELDS]
+    if unknown:
+        raise InvalidFieldset(
+            f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(CANDIDATE_CARD_FIELDS)}."
+        )
+    return tuple(dict.fromkeys(["id"] + fields))
+
+
+def candidate_cards(queryset, fields=DEFAULT_CARD_FIELDS):
+    """Project a FormData queryset to card dicts computed in the database."""
+    columns = []
+    expressions = {}
+    for name in dict.fromkeys(_CURSOR_FIELDS + tuple(fields)):
+        source = CANDIDATE_CARD_FIELDS[name]
+        if source is None:
+            columns.append(name)
+        else:
+            expressions[name] = source
+    return queryset.values(*columns, **expressions)
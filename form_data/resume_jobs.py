@@ -0,0 +1,105 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+
+from create_job.utils import llm_gemini, parser as keyword_parser
+from create_job.utils.resume_parsers import (
+    AI_EXTRACTORS, KEYWORD_EXTRACTORS, AIParseError, gemini_parse, keyword_parse,
+)
+
+from . import resume_parser
+from .models import ResumeParseJob
+from .parse_cache import cached_parse
+
+logger = logging.getLogger(__name__)
+
+
+class ParserSpec:
+    """A resume parser usable by parse jobs: cache version, parse(file, name) -> (text, result)
+    and the extensions it accepts (None: anything resume_parser.extract_text can read)."""
+
+    def __init__(self, version, parse, extensions=None):
+        self.version = version
+        self.parse = parse
+        self.extensions = extensions
+
+    def accepts(self, filename):
+        return self.extensions is None or filename.split(".")[-1].lower() in self.extensions
+
+
+def _basic_parse(file_obj, filename):
+    parsed = resume_parser.parse_resume(file_obj, filename)
+    return parsed["raw_text"], parsed
+
+
+PARSERS = {
+    resume_parser.PARSER_NAME: ParserSpec(resume_parser.PARSER_VERSION, _basic_parse),
+    keyword_parser.PARSER_NAME: ParserSpec(keyword_parser.PARSER_VERSION, keyword_parse, KEYWORD_EXTRACTORS),
+    llm_gemini.PARSER_NAME: ParserSpec(llm_gemini.PARSER_VERSION, gemini_parse, AI_EXTRACTORS),
+}
+
+
+def job_group(job_id):
+    return f"resume_parse_job_{job_id}"
+
+
+def publish_progress(job):
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            job_group(job.pk), {"type": "parse_progress", "job": job.progress()},
+        )
+    except Exception:
+        logger.exception("Could not publish progress for resume parse job %s", job.pk)
+
+
+def _finish(job, status, result=None, error=None, cached=False):
+    job.status = status
+    job.result = result
+    job.error = error
+    job.cached = cached
+    job.finished_at = timezone.now()
+    update_fields = ["status", "result", "error", "cached", "finished_at"]
+    if status == ResumeParseJob.COMPLETED and job.file:
+        job.file.delete(save=False)
+        update_fields.append("file")
+    job.save(update_fields=update_fields)
+    publish_progress(job)
+
+
+def run_parse_job(job_id):
+    """Parse the job's file (through the content-hash cache) and record the outcome.
+
+    Parse errors (AIParseError) fail the job for good; anything else is re-raised
+    so the Celery task can retry.
+    """
+    with transaction.atomic():
+        job = ResumeParseJob.objects.select_for_update().get(pk=job_id)
+        if job.status == ResumeParseJob.COMPLETED:
+            return job
+        job.status = ResumeParseJob.RUNNING
+        job.error = None
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "error", "started_at"])
+    publish_progress(job)
+
+    spec = PARSERS[job.parser]
+    try:
+        with job.file.open("rb") as upload:
+            data = upload.read()
+            upload.seek(0)
+            _, result, hit = cached_parse(
+                job.parser, spec.version, data, lambda: spec.parse(upload, job.original_name),
+            )
+    except AIParseError as exc:
+        _finish(job, ResumeParseJob.FAILED, error=exc.payload)
+        return job
+    except Exception as exc:
+        logger.exception("Resume parse job %s failed", job_id)
+        _finish(job, ResumeParseJob.FAILED, error={"error": str(exc) or exc.__class__.__name__})
+        raise
+
+    _finish(job, ResumeParseJob.COMPLETED, result=result, cached=hit)
+    return job
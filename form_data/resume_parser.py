@@ -1,91 +1,33 @@
 import re
-from io import BytesIO
 from typing import List, Optional
 
-import pdfplumber
-import docx
-from pypdf import PdfReader
+import text_extraction
+
+# Bump when the output of parse_resume() changes; cached parses of older versions are ignored
+PARSER_NAME = "resume_parser"
+PARSER_VERSION = "2"
 
 # -------------------------
-# Text extraction functions
+# Text extraction functions (text_extraction picks and times the backends)
 # -------------------------
 def extract_text_from_pdf(file_obj) -> str:
-    # pdfplumber accepts a file-like object, but make sure we use BytesIO for django UploadedFile
-    if not hasattr(file_obj, "read"):
-        # if a path string passed
-        with pdfplumber.open(file_obj) as pdf:
-            return "\n".join((page.extract_text() or "") for page in pdf.pages)
-
-    data = file_obj.read()
-    # keep a BytesIO copy so callers can still access file if needed
-    buf = BytesIO(data)
-    with pdfplumber.open(buf) as pdf:
-        text = "\n".join((page.extract_text() or "") for page in pdf.pages)
-    # ensure file pointer position reset for Django (optional)
-    try:
-        file_obj.seek(0)
-    except Exception:
-        pass
-    return text
+    return text_extraction.extract_file(file_obj, fmt=text_extraction.PDF).text
 
 
 def extract_text_from_docx(file_obj) -> str:
-    """
-    Accepts file-like object (UploadedFile). python-docx needs a file path OR file-like with .read
-    """
-    # python-docx can accept a file-like object that supports seek()
-    if hasattr(file_obj, "read"):
-        data = file_obj.read()
-        buf = BytesIO(data)
-        doc = docx.Document(buf)
-        try:
-            file_obj.seek(0)
-        except Exception:
-            pass
-    else:
-        doc = docx.Document(file_obj)
-
-    return "\n".join(p.text for p in doc.paragraphs)
+    return text_extraction.extract_file(file_obj, fmt=text_extraction.DOCX).text
 
 
 def extract_text_from_txt(file_obj) -> str:
-    if hasattr(file_obj, "read"):
-        raw = file_obj.read()
-        if isinstance(raw, bytes):
-            try:
-                return raw.decode("utf-8", errors="ignore")
-            finally:
-                try:
-                    file_obj.seek(0)
-                except Exception:
-                    pass
-        return raw
-    else:
-        with open(file_obj, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+    return text_extraction.extract_file(file_obj, fmt=text_extraction.TXT).text
 
 
 def extract_text(file_obj, filename: str) -> str:
     """
-    Convenience wrapper - detect file type by extension and extract text.
+    Convenience wrapper - detect file type by extension (else by content) and extract text.
     filename should be the uploaded file name (file.name).
     """
-    name_lower = filename.lower()
-    if name_lower.endswith(".pdf"):
-        return extract_text_from_pdf(file_obj)
-    elif name_lower.endswith(".docx"):
-        return extract_text_from_docx(file_obj)
-    elif name_lower.endswith(".txt"):
-        return extract_text_from_txt(file_obj)
-    else:
-        # fallback: try pdf first, then docx, then raw decode
-        try:
-            return extract_text_from_pdf(file_obj)
-        except Exception:
-            try:
-                return extract_text_from_docx(file_obj)
-            except Exception:
-                return extract_text_from_txt(file_obj)
+    return text_extraction.extract_file(file_obj, filename=filename).text
 
 
 # -------------------------
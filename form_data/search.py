@@ -0,0 +1,96 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, Q
+
+# "simple" keeps names, e-mails and phone numbers intact (no stemming / stop words)
+SEARCH_CONFIG = "simple"
+
+SEARCH_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _as_list(value):
+    return value if isinstance(value, list) else []
+
+
+def build_search_text(data, form_name="", notes=()):
+    """Flatten the searchable parts of a submission into one lower-cased document.
+
+    Covers name, e-mail, phone, role, organisation, university and the candidate's
+    notes (passed in from CandidateNote; legacy notes_history is still read).
+    """
+    parts = [
+        form_name,
+        data.get("Name"),
+        data.get("Email"),
+        data.get("Phone"),
+        data.get("Role_Type"),
+        data.get("Organisation"),
+        data.get("University"),
+        data.get("note"),
+    ]
+    for exp in _as_list(data.get("Professional_Experience")):
+        if isinstance(exp, dict):
+            parts.append(exp.get("Organisation"))
+    for edu in _as_list(data.get("Education_History")):
+        if isinstance(edu, dict):
+            parts.append(edu.get("University"))
+    for entry in _as_list(data.get("notes_history")):
+        if isinstance(entry, dict):
+            parts.append(entry.get("note"))
+    parts.extend(notes)
+
+    seen = set()
+    words = []
+    for part in parts:
+        text = str(part).strip().lower() if part not in (None, "") else ""
+        if text and text not in seen:
+            seen.add(text)
+            words.append(text)
+    return " ".join(words)
+
+
+def search_vector():
+    # Must match the expression of formdata_search_vector_idx for the index to be used
+    return SearchVector("search_text", config=SEARCH_CONFIG)
+
+
+def _prefix_query(term):
+    tokens = SEARCH_TOKEN_RE.findall(term)
+    if not tokens:
+        return None
+    # Prefix match on every token so results show up while the user is still typing
+    return SearchQuery(" & ".join(f"{t}:*" for t in tokens), config=SEARCH_CONFIG, search_type="raw")
+
+
+def search_candidates(queryset, term, rank=True):
+    """Filter FormData rows matching a free-text search term, best matches first.
+
+    On Postgres this combines the tsvector index (prefix matching) and the trigram index
+    (substring and typo-tolerant matching), ranking by both when rank=True. Other
+    backends fall back to a plain substring match on search_text.
+    """
+    term = (term or "").strip().lower()
+    if not term:
+        return queryset
+
+    if connection.vendor != "postgresql":
+        return queryset.filter(search_text__contains=term)
+
+    ts_query = _prefix_query(term)
+    condition = Q(search_text__contains=term) | Q(search_text__trigram_word_similar=term)
+    if ts_query is not None:
+        queryset = queryset.alias(search_document=search_vector())
+        condition |= Q(search_document=ts_query)
+    queryset = queryset.filter(condition)
+
+    if not rank:
+        return queryset
+
+    similarity = TrigramWordSimilarity(term, "search_text")
+    if ts_query is not None:
+        score = SearchRank(F("search_document"), ts_query) + similarity
+    else:
+        score = similarity
+    return queryset.annotate(search_rank=score).order_by("-search_rank", "-submitted_at")
@@ -1,9 +1,55 @@
 from rest_framework import serializers
+from django.db.models import QuerySet, prefetch_related_objects
+from django.db.models.manager import BaseManager
 from django.utils import timezone
 from .models import FormData
 
+
+class FormDataListSerializer(serializers.ListSerializer):
+    """many=True: load the history tables once for the whole list, not three queries per row."""
+
+    def to_representation(self, data):
+        if isinstance(data, BaseManager):
+            data = data.all()
+        if isinstance(data, QuerySet):
+            data = data.prefetch_related(*FormData.HISTORY_RELATIONS)
+        else:
+            data = list(data)
+            prefetch_related_objects(data, *FormData.HISTORY_RELATIONS)
+        return super().to_representation(data)
+
+
 class FormDataSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = FormData
-        fields = "__all__"
\ No newline at end of file
+        exclude = ("search_text",)
+        read_only_fields = FormData.INDEXED_FIELDS + FormData.PIPELINE_FIELDS
+        list_serializer_class = FormDataListSerializer
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Histories live in child tables; FormDataListSerializer prefetches them for lists
+        data["submission_data"] = instance.submission_with_history()
+        return data
+
+class CandidateCardSerializer(serializers.Serializer):
+    """Compact list row built from form_data.projections.candidate_cards() dicts."""
+
+    id = serializers.IntegerField()
+    name = serializers.CharField(allow_null=True)
+    email = serializers.CharField(allow_blank=True)
+    role = serializers.CharField(allow_blank=True)
+    status = serializers.CharField()
+    phase = serializers.CharField(allow_blank=True)
+    location = serializers.CharField(allow_null=True)
+    submitted_at = serializers.DateTimeField()
+    phone = serializers.CharField(allow_null=True)
+    form_name = serializers.CharField()
+    job_id = serializers.IntegerField(allow_null=True)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
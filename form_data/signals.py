@@ -1,31 +1,43 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-from .models import FormData
+from .broadcast import FORMDATA_GROUP, formdata_broadcaster
+from .counters import status_counts
+from .models import CandidateCounter, FormData
 
 
 def get_status_counts():
     """Helper for computing counts in sync context (for signal)"""
-    all_forms = FormData.objects.values_list("submission_data", flat=True)
-    counts = {"Scouting": 0, "Ongoing": 0, "Hired": 0, "Reject": 0}
-    for data in all_forms.iterator():
-        if isinstance(data, dict):
-            status = data.get("status", "Scouting")
-            counts[status] = counts.get(status, 0) + 1
-    return counts
-
-
-@receiver([post_save, post_delete], sender=FormData)
-def broadcast_formdata_update(sender, instance, **kwargs):
-    """Broadcast update to WebSocket group when any FormData changes."""
-    channel_layer = get_channel_layer()
-    counts = get_status_counts()
-    async_to_sync(channel_layer.group_send)(
-        "formdata_realtime",
-        {
-            "type": "formdata_update_event",
-            "message": f"FormData record updated: {instance.id}",
-            "status_counts": counts,
-        }
+    return status_counts()
+
+
+@receiver(post_delete, sender=FormData)
+def release_candidate_counter(sender, instance, **kwargs):
+    """Inserts and status changes are counted in FormData.save(); deletes land here."""
+    CandidateCounter.apply({instance.counter_key: -1})
+
+
+@receiver(post_save, sender=FormData)
+def queue_formdata_save(sender, instance, created, **kwargs):
+    """Queue a realtime update once the saving transaction commits."""
+    # FormData.save() still holds the pre-save key while post_save runs
+    old_key = None if created else getattr(instance, "_persisted_counter_key", None)
+    if created:
+        deltas = {instance.status: 1}
+    elif old_key and old_key[0] != instance.status:
+        deltas = {old_key[0]: -1, instance.status: 1}
+    else:
+        deltas = {}
+
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: formdata_broadcaster.record(FORMDATA_GROUP, changed_ids=[pk], status_deltas=deltas)
+    )
+
+
+@receiver(post_delete, sender=FormData)
+def queue_formdata_delete(sender, instance, **kwargs):
+    pk, old_status = instance.pk, instance.status
+    transaction.on_commit(
+        lambda: formdata_broadcaster.record(FORMDATA_GROUP, deleted_ids=[pk], status_deltas={old_status: -1})
     )
@@ -0,0 +1,65 @@
+import logging
+
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+
+from .imports import ImportSuperseded, run_import
+from .outbox import deliver_due_emails
+from .resume_jobs import run_parse_job
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on batches per run so one task never monopolises a worker
+MAX_BATCHES_PER_RUN = 20
+
+
+@shared_task(bind=True, max_retries=3)
+def drain_status_email_outbox(self, batch_size=None):
+    """Deliver due outbox e-mails; kicked after each commit and run by beat every minute."""
+    totals = {"sent": 0, "retry": 0, "failed": 0}
+    try:
+        for _ in range(MAX_BATCHES_PER_RUN):
+            result = deliver_due_emails(batch_size)
+            for key, value in result.items():
+                totals[key] += value
+            if not any(result.values()):
+                break
+        else:
+            # More due rows than one run handles; continue in a fresh task
+            drain_status_email_outbox.delay(batch_size)
+    except Exception as exc:
+        logger.error(f"Error draining status email outbox: {exc}")
+        self.retry(exc=exc, countdown=10)
+
+    return totals
+
+
+@shared_task(bind=True, acks_late=True, max_retries=3)
+def run_candidate_import(self, import_id):
+    """Run (or resume) a candidate import; a retry picks up after the last committed chunk."""
+    try:
+        job = run_import(import_id)
+    except ImportSuperseded:
+        return None
+    except Exception as exc:
+        logger.error(f"Error running candidate import {import_id}: {exc}")
+        self.retry(exc=exc, countdown=30)
+    return job.progress()
+
+
+@shared_task(
+    bind=True, acks_late=True, max_retries=2,
+    soft_time_limit=getattr(settings, "RESUME_PARSE_TIME_LIMIT", 120),
+)
+def parse_resume_job(self, job_id):
+    """Run a ResumeParseJob; routed to the resume parsing queue (CELERY_TASK_ROUTES)."""
+    try:
+        job = run_parse_job(job_id)
+    except SoftTimeLimitExceeded:
+        # Already marked failed; a file that hits the time limit would hit it again
+        return None
+    except Exception as exc:
+        logger.error(f"Error running resume parse job {job_id}: {exc}")
+        self.retry(exc=exc, countdown=15)
+    return job.progress()
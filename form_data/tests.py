@@ -1,3 +1,464 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone
+from smtplib import SMTPException
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.db.models import QuerySet
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone as dj_timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from .identity import possible_duplicates, save_or_merge
+from .imports import insert_new_candidates
+from .counters import reconcile, status_counts
+from .models import CandidateCounter, CandidateIdentity, CandidateStatusEvent, FormData, StatusEmail
+from .outbox import RETRY_BASE_SECONDS, RETRY_MAX_SECONDS, deliver_due_emails, retry_delay
+from .pagination import (
+    MAX_PAGE_SIZE, EstimatedCountPaginator, InvalidCursor, decode_cursor, encode_cursor, paginate_candidates,
+)
+from .projections import candidate_cards
+from .tasks import drain_status_email_outbox
+from .transitions import TransitionError, apply_transition, get_transition
+from .views import MAX_BULK_TRANSITION_IDS
+from .serializers import FormDataSerializer
+
+
+def apply(submission):
+    serializer = FormDataSerializer(data={"form_name": "gxi_form", "submission_data": submission})
+    serializer.is_valid(raise_exception=True)
+    return save_or_merge(serializer, submission)
+
+
+class SaveOrMergeTests(TestCase):
+    def test_repeat_application_to_the_same_job_is_merged(self):
+        first, created = apply({"Name": "Asha Rao", "Email": "asha@example.com", "job_id": 7, "Skills": "python"})
+        self.assertTrue(created)
+        FormData.objects.filter(pk=first.pk).update(status="Ongoing")
+
+        form, created = apply({
+            "Name": "A. Rao", "Email": "ASHA@example.com ", "job_id": "7",
+            "Role_Type": "Intern", "Skills": "python, sql", "status": "Applied",
+        })
+
+        self.assertFalse(created)
+        self.assertEqual(form.pk, first.pk)
+        self.assertEqual(FormData.objects.count(), 1)
+        form.refresh_from_db()
+        self.assertEqual(form.submission_data["Skills"], "python, sql")
+        self.assertEqual(form.submission_data["Name"], "Asha Rao")
+        self.assertEqual(form.submission_data["Email"], "asha@example.com")
+        self.assertNotIn("Role_Type", form.submission_data)
+        self.assertEqual(form.status, "Ongoing")
+
+    def test_application_to_another_job_is_a_new_row(self):
+        job_a, _ = apply({"Name": "Asha Rao", "Email": "asha@example.com", "job_id": 7, "Role_Type": "Backend"})
+        FormData.objects.filter(pk=job_a.pk).update(status="Reject")
+
+        job_b, created = apply({"Name": "Asha Rao", "Email": "asha@example.com", "job_id": 8, "Role_Type": "Data"})
+
+        self.assertTrue(created)
+        self.assertNotEqual(job_b.pk, job_a.pk)
+        job_a.refresh_from_db()
+        job_b.refresh_from_db()
+        self.assertEqual((job_a.job_id, job_a.role_type, job_a.status), (7, "Backend", "Reject"))
+        self.assertEqual((job_b.job_id, job_b.role_type, job_b.status), (8, "Data", "Scouting"))
+
+    def test_shared_phone_and_name_dob_are_flagged_not_merged(self):
+        first, _ = apply({"Name": "Ravi Kumar", "Email": "ravi@example.com", "Phone": "98765 43210", "DOB": "01/02/1990"})
+        second, created = apply({
+            "Name": "Ravi  Kumar", "Email": "ravi.k@example.com", "Phone": "+91 98765-43210", "DOB": "1990-02-01",
+        })
+
+        self.assertTrue(created)
+        first.refresh_from_db()
+        self.assertEqual(first.submission_data["Email"], "ravi@example.com")
+        self.assertEqual(
+            possible_duplicates(second),
+            [{"id": first.pk, "matched_on": [CandidateIdentity.NAME_DOB, CandidateIdentity.PHONE]}],
+        )
+
+    def test_application_without_email_is_never_merged(self):
+        apply({"Name": "No Mail", "Phone": "9876500000"})
+        _, created = apply({"Name": "No Mail", "Phone": "9876500000"})
+
+        self.assertTrue(created)
+        self.assertEqual(FormData.objects.count(), 2)
+
+    def test_concurrent_claim_is_rolled_back_and_merged(self):
+        first, _ = apply({"Name": "Asha Rao", "Email": "asha@example.com", "job_id": 7})
+
+        # The other ingest commits between our lookup and our insert
+        real_find = CandidateIdentity.find_form_id
+        lookups = iter([None])
+
+        def racing_find(email, job_key):
+            return next(lookups, None) or real_find(email, job_key)
+
+        with mock.patch.object(CandidateIdentity, "find_form_id", side_effect=racing_find):
+            form, created = apply({"Name": "Asha Rao", "Email": "asha@example.com", "job_id": 7, "Notice": "30"})
+
+        self.assertFalse(created)
+        self.assertEqual(form.pk, first.pk)
+        self.assertEqual(FormData.objects.count(), 1)
+        self.assertEqual(CandidateIdentity.objects.filter(kind=CandidateIdentity.EMAIL).count(), 1)
+        form.refresh_from_db()
+        self.assertEqual(form.submission_data["Notice"], "30")
+
+
+class InsertNewCandidatesTests(TestCase):
+    def build(self, email, job_id, phone="9876543210"):
+        form = FormData(form_name="gxi_form", submission_data={"Name": email, "Email": email, "Phone": phone, "job_id": job_id})
+        form.sync_indexed_fields()
+        return form
+
+    def test_skips_only_repeat_applications_to_the_same_job(self):
+        apply({"Name": "Asha Rao", "Email": "asha@example.com", "job_id": 7})
+
+        inserted, duplicates = insert_new_candidates([
+            self.build("asha@example.com", 7),
+            self.build("asha@example.com", 8),
+            self.build("asha@example.com", 8),
+            self.build("ravi@example.com", 7),
+        ])
+
+        self.assertEqual(duplicates, 2)
+        self.assertEqual(
+            sorted((form.email, form.job_id) for form in inserted),
+            [("asha@example.com", 8), ("ravi@example.com", 7)],
+        )
+
+    def test_row_losing_the_claim_is_removed(self):
+        winner = self.build("asha@example.com", 7)
+        loser = self.build("asha@example.com", 7)
+
+        # Both rows pass the up-front lookup, as with two concurrent imports
+        with mock.patch.object(CandidateIdentity, "lookup", return_value={}):
+            inserted, duplicates = insert_new_candidates([winner])
+            inserted_again, duplicates_again = insert_new_candidates([loser])
+
+        self.assertEqual((len(inserted), duplicates), (1, 0))
+        self.assertEqual((inserted_again, duplicates_again), ([], 1))
+        self.assertEqual(list(FormData.objects.values_list("pk", flat=True)), [winner.pk])
+
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        for i in range(5):
+            form = FormData.objects.create(form_name=f"form {i}", submission_data={"Name": f"C{i}", "Email": f"c{i}@example.com"})
+        # Two rows share a timestamp, so the id tie-breaker is exercised
+        FormData.objects.filter(form_name__in=["form 2", "form 3"]).update(
+            submitted_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+
+    def paginate(self, queryset=None, **params):
+        request = Request(RequestFactory().get("/formdata/", params))
+        if queryset is None:
+            queryset = FormData.objects.order_by("-submitted_at")
+        return paginate_candidates(request, candidate_cards(queryset))
+
+    def test_cursor_round_trip(self):
+        submitted_at = datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(submitted_at, 42)), (submitted_at, 42))
+
+    def test_invalid_cursors_are_rejected(self):
+        for cursor in ["not-base64!", "e30", encode_cursor(datetime(2024, 1, 1), 1)[:-4]]:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+        with self.assertRaises(InvalidCursor):
+            self.paginate(pagination="cursor", cursor="e30")
+
+    def test_cursor_pages_cover_every_row_once_in_page_order(self):
+        expected = [row["id"] for row in self.paginate(page_size=10)[0]]
+        seen, cursor = [], None
+        while True:
+            params = {"pagination": "cursor", "page_size": 2}
+            if cursor:
+                params["cursor"] = cursor
+            rows, meta = self.paginate(**params)
+            seen += [row["id"] for row in rows]
+            cursor = meta["next_cursor"]
+            self.assertEqual(meta["has_more"], cursor is not None)
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_cursor_follows_ascending_submitted_at(self):
+        rows, _ = self.paginate(FormData.objects.order_by("submitted_at"), pagination="cursor", page_size=10)
+        expected = list(FormData.objects.order_by("submitted_at", "id").values_list("id", flat=True))
+        self.assertEqual([row["id"] for row in rows], expected)
+
+    def test_cursor_rejects_other_orderings(self):
+        for ordering in ["form_name", "-form_name"]:
+            with self.subTest(ordering=ordering), self.assertRaises(InvalidCursor):
+                self.paginate(FormData.objects.order_by(ordering), pagination="cursor")
+        # Page mode keeps honouring them
+        rows, _ = self.paginate(FormData.objects.order_by("-form_name"), page_size=10)
+        self.assertEqual(
+            [row["id"] for row in rows], list(FormData.objects.order_by("-form_name").values_list("id", flat=True))
+        )
+
+    def test_page_size_is_capped(self):
+        _, meta = self.paginate(page_size=MAX_PAGE_SIZE * 10)
+        self.assertEqual(meta["page_size"], MAX_PAGE_SIZE)
+        _, meta = self.paginate(pagination="cursor", page_size=0)
+        self.assertEqual(meta["page_size"], 1)
+        _, meta = self.paginate(page_size="lots")
+        self.assertEqual(meta["page_size"], 25)
+
+    def test_estimated_count_paginator(self):
+        queryset = FormData.objects.order_by("-submitted_at")
+        paginator = EstimatedCountPaginator(queryset, 2)
+        self.assertEqual((paginator.count, paginator.is_estimate), (5, False))
+
+        with mock.patch("form_data.pagination.estimated_count", return_value=1000):
+            paginator = EstimatedCountPaginator(queryset, 2)
+            self.assertEqual((paginator.count, paginator.num_pages, paginator.is_estimate), (1000, 500, True))
+
+    def test_cursor_mode_counts_only_on_request(self):
+        _, meta = self.paginate(pagination="cursor")
+        self.assertNotIn("total_records", meta)
+        _, meta = self.paginate(pagination="cursor", count="exact")
+        self.assertEqual((meta["total_records"], meta["total_is_estimate"]), (5, False))
+
+
+class TransitionTests(TestCase):
+    def form(self, status, phase=""):
+        return FormData(status=status, phase=phase, submission_data={})
+
+    def test_allowed_transitions(self):
+        form = self.form("Scouting")
+        event, notification = apply_transition(
+            form, "Ongoing", {"interview_date": "2024-05-01"}, candidate_email="asha@example.com",
+        )
+        self.assertEqual((form.status, form.phase), ("Ongoing", "First Round"))
+        self.assertEqual((event.from_status, event.to_status, event.details), ("Scouting", "Ongoing", {"interview_date": "2024-05-01"}))
+        self.assertEqual(notification["current_status"], "Ongoing")
+        self.assertEqual(notification["candidate_email"], "asha@example.com")
+
+        apply_transition(form, "Ongoing", {})
+        self.assertEqual(form.phase, "First Round")
+        apply_transition(form, "Hired", {"joining_date": "2024-06-01"})
+        self.assertEqual((form.status, form.phase, form.status_details["joining_date"]), ("Hired", "Final Selection", "2024-06-01"))
+
+        form = self.form("Scouting")
+        event, _ = apply_transition(form, "Archived", {})
+        self.assertEqual((event.action, form.status_details), ("Archived", {"archived": True}))
+        event, _ = apply_transition(form, "Scouting", {})
+        self.assertEqual((event.action, form.status_details), ("Unarchived", {"archived": False}))
+
+        form = self.form("Ongoing", phase="Second Round")
+        event, notification = apply_transition(form, "Reject", {"reject_reason": "Not a fit"})
+        self.assertEqual((form.status, form.phase, event.reason), ("Reject", "Second Round", "Not a fit"))
+        self.assertEqual(notification["current_status"], "Reject")
+
+    def test_forbidden_transitions(self):
+        cases = [
+            ("Reject", "Ongoing", "Cannot change status after rejection."),
+            ("Hired", "Reject", "Candidate already hired. No further changes allowed."),
+            ("Scouting", "Hired", "Invalid transition from Scouting. Must be 'Ongoing', 'Reject', or 'Archived'."),
+            ("Archived", "Ongoing", "Invalid transition from Archived. Only allowed: 'Scouting' (unarchive)."),
+            ("Ongoing", "Scouting", "Invalid transition from Ongoing to Scouting."),
+            ("Pending", "Ongoing", "Unhandled current status: Pending."),
+        ]
+        for source, target, message in cases:
+            with self.subTest(source=source, target=target):
+                with self.assertRaisesMessage(TransitionError, message):
+                    get_transition(source, target)
+
+    def test_reject_needs_a_reason_and_leaves_the_form_alone(self):
+        form = self.form("Scouting")
+        with self.assertRaisesMessage(TransitionError, "Reject reason required when rejecting from Scouting."):
+            apply_transition(form, "Reject", {})
+        self.assertEqual((form.status, form.status_details), ("Scouting", {}))
+
+
+class BulkStatusTransitionTests(TestCase):
+    url = "/api/form_data/formdata/bulk-status/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(mock.Mock(is_authenticated=True))
+
+    def candidate(self, name, status="Scouting", role_type="Backend"):
+        form = FormData.objects.create(
+            submission_data={"Name": name, "Email": f"{name.lower()}@example.com", "Role_Type": role_type},
+        )
+        if status != "Scouting":
+            FormData.objects.filter(pk=form.pk).update(status=status)
+            reconcile()
+        return form
+
+    def post(self, **data):
+        with mock.patch("form_data.views.formdata_broadcaster") as broadcaster:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.url, data, format="json")
+        return response, broadcaster
+
+    def test_id_cap(self):
+        response, _ = self.post(ids=list(range(1, MAX_BULK_TRANSITION_IDS + 2)), status="Ongoing")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], f"At most {MAX_BULK_TRANSITION_IDS} ids per request.")
+
+        for ids in ([], "1,2", ["x"]):
+            with self.subTest(ids=ids):
+                self.assertEqual(self.post(ids=ids, status="Ongoing")[0].status_code, 400)
+
+    def test_mixed_ids_get_their_own_results(self):
+        scouting = self.candidate("Asha")
+        archived = self.candidate("Ravi", status="Archived")
+        hired = self.candidate("Mira", status="Hired")
+        ongoing = self.candidate("Dev", status="Ongoing")
+        emails_before = StatusEmail.objects.count()
+
+        response, broadcaster = self.post(
+            ids=[scouting.pk, archived.pk, hired.pk, ongoing.pk, 999999, scouting.pk], status="Ongoing", phase="HR Round",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["summary"], {"success": 1, "skipped": 1, "error": 3})
+        self.assertEqual(
+            [(result["id"], result["status"]) for result in body["results"]],
+            [(scouting.pk, "success"), (archived.pk, "error"), (hired.pk, "error"), (ongoing.pk, "skipped"), (999999, "error")],
+        )
+        self.assertEqual(body["results"][0]["phase"], "HR Round")
+        self.assertEqual(body["results"][-1]["message"], "Record not found")
+
+        self.assertEqual(
+            dict(FormData.objects.values_list("pk", "status")),
+            {scouting.pk: "Ongoing", archived.pk: "Archived", hired.pk: "Hired", ongoing.pk: "Ongoing"},
+        )
+        event = CandidateStatusEvent.objects.get(form=scouting)
+        self.assertEqual((event.from_status, event.to_status, event.phase), ("Scouting", "Ongoing", "HR Round"))
+        email = StatusEmail.objects.order_by("-id").first()
+        self.assertEqual(StatusEmail.objects.count(), emails_before + 1)
+        self.assertEqual((email.to_email, email.payload["candidate_name"]), ("asha@example.com", "Asha"))
+        broadcaster.record.assert_called_once()
+        self.assertEqual(broadcaster.record.call_args.kwargs["changed_ids"], [scouting.pk])
+
+    def test_counter_deltas_after_a_bulk_move(self):
+        forms = [self.candidate(f"C{i}", role_type="Backend" if i % 2 else "Data") for i in range(6)]
+        self.candidate("Hired", status="Hired")
+
+        response, broadcaster = self.post(
+            ids=[form.pk for form in forms[:4]], status="Reject", reject_reason="Position filled",
+        )
+
+        self.assertEqual(response.json()["summary"]["success"], 4)
+        self.assertEqual(status_counts(), {"Scouting": 2, "Ongoing": 0, "Hired": 1, "Reject": 4})
+        self.assertEqual(
+            dict(CandidateCounter.objects.filter(status="Reject").values_list("role_type", "count")),
+            {"Backend": 2, "Data": 2},
+        )
+        self.assertEqual(reconcile(), {})
+        deltas = broadcaster.record.call_args.kwargs["status_deltas"]
+        self.assertEqual((deltas["Scouting"], deltas["Reject"]), (-4, 4))
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", STATUS_EMAIL_MAX_ATTEMPTS=3)
+class StatusEmailOutboxTests(TestCase):
+    def setUp(self):
+        self.form = FormData.objects.create(submission_data={"Name": "Asha Rao", "Email": "asha@example.com"})
+        StatusEmail.objects.all().delete()
+
+    def queue(self, to_email, **fields):
+        payload = {"candidate_name": "Asha Rao", "current_status": "Ongoing"}
+        return StatusEmail.objects.create(form=self.form, to_email=to_email, payload=payload, **fields)
+
+    def test_retry_delay_bounds(self):
+        for attempts in range(0, 12):
+            expected = min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS)
+            with self.subTest(attempts=attempts):
+                with mock.patch("form_data.outbox.random.uniform", side_effect=lambda low, high: low):
+                    self.assertEqual(retry_delay(attempts), timedelta(seconds=expected * 0.8))
+                with mock.patch("form_data.outbox.random.uniform", side_effect=lambda low, high: high):
+                    self.assertEqual(retry_delay(attempts), timedelta(seconds=expected * 1.2))
+                delay = retry_delay(attempts).total_seconds()
+                self.assertTrue(expected * 0.8 <= delay <= expected * 1.2)
+        self.assertLessEqual(retry_delay(50), timedelta(seconds=RETRY_MAX_SECONDS * 1.2))
+
+    def test_only_due_pending_rows_are_claimed_with_skip_locked(self):
+        due = [self.queue(f"due{i}@example.com") for i in range(3)]
+        self.queue("later@example.com", next_attempt_at=dj_timezone.now() + timedelta(minutes=5))
+        self.queue("sent@example.com", status=StatusEmail.SENT)
+        self.queue("failed@example.com", status=StatusEmail.FAILED)
+
+        real = QuerySet.select_for_update
+        with mock.patch.object(QuerySet, "select_for_update", autospec=True, side_effect=real) as select_for_update:
+            result = deliver_due_emails(batch_size=2)
+
+        self.assertEqual(select_for_update.call_args.kwargs, {"skip_locked": True})
+        self.assertEqual(result, {"sent": 2, "retry": 0, "failed": 0})
+        self.assertEqual([message.to for message in mail.outbox], [["due0@example.com"], ["due1@example.com"]])
+        self.assertEqual(
+            set(StatusEmail.objects.filter(sent_at__isnull=False).values_list("to_email", flat=True)),
+            {"due0@example.com", "due1@example.com"},
+        )
+        self.assertEqual(StatusEmail.objects.get(pk=due[2].pk).status, StatusEmail.PENDING)
+
+    def test_failed_send_is_rescheduled_and_the_batch_continues(self):
+        bad = self.queue("bad@example.com")
+        good = self.queue("good@example.com")
+        real_send = mail.get_connection().__class__.send_messages
+
+        def send_messages(connection, messages):
+            if messages[0].to == ["bad@example.com"]:
+                raise SMTPException("mailbox unavailable")
+            return real_send(connection, messages)
+
+        before = dj_timezone.now()
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", autospec=True, side_effect=send_messages):
+            result = deliver_due_emails()
+
+        self.assertEqual(result, {"sent": 1, "retry": 1, "failed": 0})
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts, bad.last_error), (StatusEmail.PENDING, 1, "mailbox unavailable"))
+        wait = bad.next_attempt_at - before
+        self.assertTrue(timedelta(seconds=RETRY_BASE_SECONDS * 0.8) <= wait <= timedelta(seconds=RETRY_BASE_SECONDS * 1.2 + 5))
+        good.refresh_from_db()
+        self.assertEqual(good.status, StatusEmail.SENT)
+
+        # Not due yet: the next run leaves it alone
+        self.assertEqual(deliver_due_emails(), {"sent": 0, "retry": 0, "failed": 0})
+
+    def test_send_is_given_up_after_max_attempts(self):
+        row = self.queue("bad@example.com", attempts=2)
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=SMTPException("no")):
+            self.assertEqual(deliver_due_emails(), {"sent": 0, "retry": 0, "failed": 1})
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (StatusEmail.FAILED, 3))
+
+    def test_connection_failure_reschedules_the_whole_batch(self):
+        rows = [self.queue(f"c{i}@example.com") for i in range(2)]
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.open", side_effect=OSError("refused")):
+            self.assertEqual(deliver_due_emails(), {"sent": 0, "retry": 2, "failed": 0})
+        for row in rows:
+            row.refresh_from_db()
+            self.assertEqual((row.status, row.attempts, row.last_error), (StatusEmail.PENDING, 1, "refused"))
+        self.assertEqual(mail.outbox, [])
+
+    def test_drain_task_runs_batches_until_the_outbox_is_empty(self):
+        for i in range(5):
+            self.queue(f"c{i}@example.com")
+
+        totals = drain_status_email_outbox.apply(kwargs={"batch_size": 2}).get()
+
+        self.assertEqual(totals, {"sent": 5, "retry": 0, "failed": 0})
+        self.assertEqual(len(mail.outbox), 5)
+
+
+class FormDataSerializerTests(TestCase):
+    def test_lists_load_the_histories_in_one_query_each(self):
+        for i in range(4):
+            form = FormData.objects.create(submission_data={"Name": f"C{i}", "Email": f"c{i}@example.com"})
+            form.notes.create(note=f"note {i}")
+
+        # One query for the rows, one per history table
+        with self.assertNumQueries(4):
+            data = FormDataSerializer(FormData.objects.order_by("id"), many=True).data
+        self.assertEqual([row["submission_data"]["notes_history"][0]["note"] for row in data], [f"note {i}" for i in range(4)])
+
+        forms = list(FormData.objects.order_by("id"))
+        with self.assertNumQueries(3):
+            FormDataSerializer(forms, many=True).data
@@ -0,0 +1,134 @@
+from django.utils import timezone
+
+from .models import CandidateStatusEvent
+
+
+class TransitionError(ValueError):
+    pass
+
+
+class Transition:
+    """One allowed status change and what it records.
+
+    requires: request parameter that must be present (with the error shown otherwise)
+    reason:   request parameter stored as the event reason and in status_details
+    phase:    callable(form, params) returning the new phase, or None to leave it alone
+    action:   label stored on the status event (Archived / Unarchived)
+    carry:    request parameters copied onto the event and into status_details
+    details:  constant status_details updates
+    email:    status label for the candidate e-mail, plus the parameters passed to it
+    """
+
+    def __init__(self, requires=None, reason=None, phase=None, action="", carry=(), details=None,
+                 email=None, email_phase=None, email_params=()):
+        self.requires = requires
+        self.reason = reason
+        self.phase = phase
+        self.action = action
+        self.carry = carry
+        self.details = details or {}
+        self.email = email
+        self.email_phase = email_phase
+        self.email_params = email_params
+
+
+_REJECT = Transition(
+    requires=("reject_reason", "Reject reason required when rejecting from {source}."),
+    reason="reject_reason",
+    email="Reject",
+)
+
+TRANSITIONS = {
+    ("Scouting", "Reject"): _REJECT,
+    ("Scouting", "Ongoing"): Transition(
+        phase=lambda form, params: params.get("phase") or "First Round",
+        carry=("interview_date", "interview_time"),
+        email="Ongoing",
+        email_params=("phase", "interview_date", "interview_time"),
+    ),
+    ("Scouting", "Archived"): Transition(action="Archived", details={"archived": True}, email="Archived"),
+    ("Archived", "Scouting"): Transition(action="Unarchived", details={"archived": False}, email="Unarchived"),
+    ("Ongoing", "Hired"): Transition(
+        phase=lambda form, params: "Final Selection",
+        carry=("offer_letter_date", "joining_date"),
+        email="Hired",
+        email_phase="Final Selection",
+        email_params=("joining_date",),
+    ),
+    ("Ongoing", "Reject"): _REJECT,
+    ("Ongoing", "Ongoing"): Transition(
+        phase=lambda form, params: params.get("phase") or form.phase or "Next Round",
+        carry=("interview_date", "interview_time"),
+        email="Ongoing",
+        email_params=("phase", "interview_date", "interview_time"),
+    ),
+}
+
+TERMINAL_STATUSES = {
+    "Reject": "Cannot change status after rejection.",
+    "Hired": "Candidate already hired. No further changes allowed.",
+}
+
+INVALID_TRANSITION_MESSAGES = {
+    "Scouting": "Invalid transition from Scouting. Must be 'Ongoing', 'Reject', or 'Archived'.",
+    "Archived": "Invalid transition from Archived. Only allowed: 'Scouting' (unarchive).",
+    "Ongoing": "Invalid transition from Ongoing to {target}.",
+}
+
+
+def get_transition(source, target):
+    """Return the Transition for source -> target or raise TransitionError."""
+    if source in TERMINAL_STATUSES:
+        raise TransitionError(TERMINAL_STATUSES[source])
+    rule = TRANSITIONS.get((source, target))
+    if rule is None:
+        message = INVALID_TRANSITION_MESSAGES.get(source, "Unhandled current status: {source}.")
+        raise TransitionError(message.format(source=source, target=target))
+    return rule
+
+
+def apply_transition(form, target, params, ts=None, candidate_name=None, candidate_email=None):
+    """Move `form` to `target` in memory.
+
+    Updates form.status / phase / status_details and returns (event, notification):
+    an unsaved CandidateStatusEvent and the build_status_email() kwargs (or None).
+    Saving both is left to the caller so bulk callers can batch the writes.
+    """
+    source = form.status
+    rule = get_transition(source, target)
+    ts = ts or timezone.now()
+
+    if rule.requires:
+        param, message = rule.requires
+        if not params.get(param):
+            raise TransitionError(message.format(source=source))
+
+    details = dict(form.status_details or {})
+    details.update(rule.details)
+    event = CandidateStatusEvent(form=form, from_status=source, to_status=target, action=rule.action, created_at=ts)
+
+    if rule.reason:
+        event.reason = details[rule.reason] = params.get(rule.reason)
+    for param in rule.carry:
+        value = params.get(param)
+        if value:
+            event.details[param] = value
+            details[param] = value
+    if rule.phase is not None:
+        form.phase = event.phase = rule.phase(form, params)
+
+    form.status = target
+    form.status_details = details
+
+    notification = None
+    if rule.email:
+        notification = {
+            "candidate_email": candidate_email,
+            "candidate_name": candidate_name,
+            "current_status": rule.email,
+        }
+        if rule.email_phase:
+            notification["phase"] = rule.email_phase
+        for param in rule.email_params:
+            notification[param] = params.get(param)
+    return event, notification
@@ -7,6 +7,8 @@ urlpatterns = [
     path('formdata/', FormDataAPIView.as_view(), name='formdata'),
     path("formdata/<int:form_id>/section/", FormDataAPIView.as_view()),
     path('formdata/<int:pk>/', FormDataAPIView.as_view(), name='formdata-detail'),
+    path('formdata/<int:pk>/status-emails/', StatusEmailDeliveryAPIView.as_view(), name='formdata-status-emails'),
+    path('formdata/bulk-status/', BulkStatusTransitionAPIView.as_view(), name='formdata-bulk-status'),
     path('schedule-interview/', ScheduleInterviewAPIView.as_view(), name='schedule-interview'),
     path('send-whatsapp/<int:form_id>/', SendWhatsappMessageAPIView.as_view(), name='send_whatsapp'),
     path("send-whatsapp/", SendWhatsappMessageAPIView.as_view(), name="get_whatsapp_messages"),
@@ -25,6 +27,10 @@ urlpatterns = [
     path("role_type_counts/", RoleTypeCountAPIView.as_view(), name="role-type-counts"),
     path("public/submit-form/", PublicFormAPIView.as_view(), name="public-submit-form"),
     path("candidates/upload-csv/", UploadCandidatesCSVAPIView.as_view()),
+    path("candidates/import-jobs/<int:pk>/", CandidateImportJobAPIView.as_view(), name="candidate-import-job"),
+    path("candidates/import-jobs/<int:pk>/resume/", CandidateImportJobAPIView.as_view(), name="candidate-import-resume"),
+    path("resume-parse-jobs/", ResumeParseJobAPIView.as_view(), name="resume-parse-jobs"),
+    path("resume-parse-jobs/<int:pk>/", ResumeParseJobAPIView.as_view(), name="resume-parse-job"),
 
 
 
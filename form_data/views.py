@@ -1,5 +1,6 @@
 import json
 import logging
+from collections import Counter
 from functools import reduce
 from operator import or_
 import json
@@ -8,17 +9,26 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.db import transaction
 from django.db.models import Q
-from django.template.loader import render_to_string
+from django.db.models.fields.json import KT
 from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.utils.html import strip_tags
 
-from .models import FormData
-from .serializers import FormDataSerializer
+from .broadcast import FORMDATA_GROUP, formdata_broadcaster
+from .counters import role_type_counts as get_role_type_counts
+from .identity import possible_duplicates, save_or_merge
+from .models import (
+    CandidateCounter, CandidateNote, CandidateSentMessage, CandidateStatusEvent, FormData, StatusEmail,
+)
+from .notifications import submission_notification
+from .outbox import queue_status_emails
+from .pagination import InvalidCursor, paginate_candidates
+from .projections import InvalidFieldset, candidate_cards, parse_card_fields
+from .search import search_candidates
+from .serializers import CandidateCardSerializer, FormDataSerializer
+from .transitions import TransitionError, apply_transition
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.core.files.storage import FileSystemStorage
 from django.core.mail import EmailMessage,get_connection
@@ -29,42 +39,6 @@ logger = logging.getLogger(__name__)
 
 class FormDataAPIView(APIView):
     parser_classes = (MultiPartParser, FormParser,JSONParser)
-    def send_status_email(self, candidate_email, candidate_name, current_status, phase=None,
-                          interview_date=None, interview_time=None, joining_date=None, is_new_candidate=False):
-        if not candidate_email:
-            return
-
-        if is_new_candidate:
-            template_name = "application_welcome.html"
-            subject = "Thank You For Applying - GXI Networks"
-        else:
-            template_name = "application_status.html"
-            subject = f"Update: Your Application Status - {current_status}"
-
-        context = {
-            "candidate_name": candidate_name,
-            "current_status": current_status,
-            "phase": phase,
-            "interview_date": interview_date,
-            "interview_time": interview_time,
-            "joining_date": joining_date,
-        }
-
-        html_message = render_to_string(template_name, context)
-        text_message = strip_tags(html_message) if html_message else "Your application status has been updated."
-
-        try:
-            send_mail(
-                subject=subject,
-                message=text_message,
-                from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None) or "",
-                recipient_list=[candidate_email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-        except Exception as e:
-            # Log error; do not raise to keep API flow stable
-            logger.exception("Failed to send status email to %s: %s", candidate_email, str(e))
 
     def get(self, request, pk=None):
         try:
@@ -74,11 +48,15 @@ class FormDataAPIView(APIView):
                     return Response({"status": "error", "message": "Record not found"},
                                     status=status.HTTP_404_NOT_FOUND)
                 serializer = FormDataSerializer(form)
-                return Response({"status": "success", "data": serializer.data}, status=status.HTTP_200_OK)
+                return Response({
+                    "status": "success",
+                    "data": serializer.data,
+                    "possible_duplicates": possible_duplicates(form),
+                }, status=status.HTTP_200_OK)
 
             search_query = request.query_params.get('search', None)
             form_name = request.query_params.get('form_name', None)
-            sort_by = request.query_params.get('sort_by', '-submitted_at')
+            sort_by = request.query_params.get('sort_by')
 
             role_type_param = request.query_params.get('role_type')  # comma separated
             role_type_exact = request.query_params.get('role_type_exact', 'false').lower() in ('1', 'true', 'yes')
@@ -89,10 +67,7 @@ class FormDataAPIView(APIView):
                 forms = forms.filter(form_name__icontains=form_name)
 
             if search_query:
-                forms = forms.filter(
-                    Q(form_name__icontains=search_query) |
-                    Q(submission_data__icontains=search_query)
-                )
+                forms = search_candidates(forms, search_query)
 
             # -------------------------------------
             # ROLE TYPE FILTER (CASE-INSENSITIVE)
@@ -104,45 +79,49 @@ class FormDataAPIView(APIView):
                     if role_type_exact:
                         # CASE-INSENSITIVE EXACT MATCH
                         conds = [
-                            Q(submission_data__Role_Type__iexact=rt)
+                            Q(role_type__iexact=rt)
                             for rt in role_types
                         ]
                     else:
                         # CASE-INSENSITIVE CONTAINS MATCH
                         conds = [
-                            Q(submission_data__Role_Type__icontains=rt)
+                            Q(role_type__icontains=rt)
                             for rt in role_types
                         ]
 
                     forms = forms.filter(reduce(or_, conds))
 
-            valid_sort_fields = ['form_name', 'submitted_at']
-            if sort_by.lstrip('-') not in valid_sort_fields:
-                sort_by = '-submitted_at'
-            forms = forms.order_by(sort_by)
+            status_param = request.query_params.get('status')  # comma separated
+            if status_param:
+                statuses = [st.strip() for st in status_param.split(',') if st.strip()]
+                if statuses:
+                    forms = forms.filter(status__in=statuses)
 
-            page = request.query_params.get('page', 1)
-            page_size = int(request.query_params.get('page_size', 25))
-            paginator = Paginator(forms, page_size)
+            job_id_param = request.query_params.get('job_id')
+            if job_id_param:
+                forms = forms.filter(job_id=job_id_param)
 
-            try:
-                forms_page = paginator.page(page)
-            except PageNotAnInteger:
-                forms_page = paginator.page(1)
-            except EmptyPage:
-                forms_page = paginator.page(paginator.num_pages)
+            # A search without an explicit sort_by keeps the relevance ordering
+            if sort_by or not search_query:
+                valid_sort_fields = ['form_name', 'submitted_at']
+                if not sort_by or sort_by.lstrip('-') not in valid_sort_fields:
+                    sort_by = '-submitted_at'
+                forms = forms.order_by(sort_by)
+
+            # List rows are compact cards; the full submission_data is served by the detail endpoint
+            card_fields = parse_card_fields(request.query_params.get('fields'))
+            forms_page, page_meta = paginate_candidates(request, candidate_cards(forms, card_fields))
 
-            serializer = FormDataSerializer(forms_page, many=True)
+            serializer = CandidateCardSerializer(forms_page, many=True, fields=card_fields)
 
             return Response({
                 "status": "success",
-                "total_records": paginator.count,
-                "total_pages": paginator.num_pages,
-                "current_page": forms_page.number,
-                "page_size": page_size,
+                **page_meta,
                 "data": serializer.data
             }, status=status.HTTP_200_OK)
 
+        except (InvalidCursor, InvalidFieldset) as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("GET FormData error: %s", str(e))
             return Response({"status": "error", "message": f"An error occurred: {str(e)}"},
@@ -176,29 +155,26 @@ class FormDataAPIView(APIView):
         serializer = FormDataSerializer(data=data)
 
         if serializer.is_valid():
-            candidate_email = submission_data.get("Email")
-            is_new = not FormData.objects.filter(
-                submission_data__Email=candidate_email
-            ).exists()
-
-            form_obj = serializer.save()
-            submission = form_obj.submission_data  # Python dict (auto parsed)
-
-            self.send_status_email(
-                candidate_email=submission.get("Email"),
-                candidate_name=submission.get("Name"),
-                current_status=submission.get("status", "Applied"),
-                phase=submission.get("phase"),
-                interview_date=submission.get("interview_time"),
-                interview_time=submission.get("interview_time"),
-                joining_date=submission.get("joining_date"),
-                is_new_candidate=is_new
-            )
+            # The e-mail is queued in the outbox with the row and sent by Celery
+            with transaction.atomic():
+                form_obj, created = save_or_merge(serializer, submission_data)
+                queue_status_emails([
+                    (form_obj, submission_notification(submission_data, is_new_candidate=created))
+                ])
+
+            if not created:
+                return Response({
+                    "status": "success",
+                    "message": "Candidate has already applied to this job; their application was updated",
+                    "data": FormDataSerializer(form_obj).data,
+                    "possible_duplicates": possible_duplicates(form_obj),
+                }, status=200)
 
             return Response({
                 "status": "success",
                 "message": "Form data saved successfully",
-                "data": serializer.data
+                "data": serializer.data,
+                "possible_duplicates": possible_duplicates(form_obj),
             }, status=201)
 
         return Response({
@@ -210,16 +186,12 @@ class FormDataAPIView(APIView):
     # PUT METHOD (update status / notes)
     # ================================
     def put(self, request, pk):
+        # reject_reason / phase / interview_* / offer_letter_date / joining_date are read
+        # by the transition rules in form_data.transitions
         new_status = request.data.get("status")
-        reject_reason = request.data.get("reject_reason")
-        interview_date = request.data.get("interview_date")
-        interview_time = request.data.get("interview_time")
-        offer_letter_date = request.data.get("offer_letter_date")
-        joining_date = request.data.get("joining_date")
-        phase = request.data.get("phase")
         note = request.data.get("note")
 
-        ts = timezone.now().isoformat()
+        ts = timezone.now()
 
         # Allowed note authors (None => any author allowed)
         ALLOWED_NOTE_AUTHORS = None
@@ -234,14 +206,16 @@ class FormDataAPIView(APIView):
             except FormData.DoesNotExist:
                 return Response({"status": "error", "message": "Record not found"}, status=status.HTTP_404_NOT_FOUND)
 
+            # Only the small pipeline columns are written; histories go to the child tables
             submission_data = form.submission_data or {}
-            old_status = submission_data.get("status", "Scouting")
+            details = dict(form.status_details or {})
+            old_status = form.status
 
             candidate_name = submission_data.get("Name")
             candidate_email = submission_data.get("Email")
 
             # === NOTES: Always allow adding/updating notes regardless of status ===
-            note_was_added = False
+            new_note = None
             if note is not None:
                 if not author_name:
                     return Response({"status": "error", "message": "Author is required when adding a note."},
@@ -251,22 +225,19 @@ class FormDataAPIView(APIView):
                         return Response({"status": "error", "message": f"Author must be one of: {', '.join(ALLOWED_NOTE_AUTHORS)}."},
                                         status=status.HTTP_400_BAD_REQUEST)
 
-                submission_data.setdefault("notes_history", []).append({
-                    "note": note,
-                    "author": author_name,
-                    "updated_at": ts
-                })
-                submission_data["note"] = note
-                submission_data["note_author"] = author_name
-                note_was_added = True
+                new_note = CandidateNote(form=form, note=note, author=author_name, created_at=ts)
+                details["note"] = note
+                details["note_author"] = author_name
+                form.status_details = details
 
             # If either no status provided, or same as current => save note only (if any) and return
             if (new_status is None) or (new_status == old_status):
-                form.submission_data = submission_data
-                form.save()
+                if new_note is not None:
+                    new_note.save()
+                    form.save(update_fields=["status_details", "search_text"])
                 serializer = FormDataSerializer(form)
-                msg = f"Update saved (status unchanged: {submission_data.get('status')})."
-                if note_was_added:
+                msg = f"Update saved (status unchanged: {form.status})."
+                if new_note is not None:
                     msg = f"Note saved by {author_name}. " + msg
                 return Response({
                     "status": "success",
@@ -274,173 +245,30 @@ class FormDataAPIView(APIView):
                     "data": serializer.data
                 }, status=status.HTTP_200_OK)
 
-            # Disallow any status mutation when current is Reject or Hired
-            if old_status == "Reject":
-                return Response({"status": "error", "message": "Cannot change status after rejection."},
-                                status=status.HTTP_400_BAD_REQUEST)
-            if old_status == "Hired":
-                return Response({"status": "error", "message": "Candidate already hired. No further changes allowed."},
-                                status=status.HTTP_400_BAD_REQUEST)
-
-            # Allowed statuses set (for reference)
-            # VALID_STATUSES = {"Scouting", "Ongoing", "Reject", "Hired", "Archived"}
-
-            # === SCOUTING ===
-            if old_status == "Scouting":
-                if new_status == "Reject":
-                    if not reject_reason:
-                        return Response({"status": "error", "message": "Reject reason required when rejecting from Scouting."},
-                                        status=status.HTTP_400_BAD_REQUEST)
-                    submission_data.setdefault("status_history", []).append({
-                        "from": old_status,
-                        "to": "Reject",
-                        "reason": reject_reason,
-                        "updated_at": ts
-                    })
-                    submission_data["status"] = "Reject"
-                    submission_data["reject_reason"] = reject_reason
-
-                    self.send_status_email(candidate_email, candidate_name, "Reject")
-
-                elif new_status == "Ongoing":
-                    history_entry = {
-                        "from": old_status,
-                        "to": "Ongoing",
-                        "phase": phase or "First Round",
-                        "updated_at": ts
-                    }
-                    if interview_date:
-                        history_entry["interview_date"] = interview_date
-                        submission_data["interview_date"] = interview_date
-                    if interview_time:
-                        history_entry["interview_time"] = interview_time
-                        submission_data["interview_time"] = interview_time
-
-                    submission_data.setdefault("status_history", []).append(history_entry)
-                    submission_data["status"] = "Ongoing"
-                    submission_data["phase"] = phase or "First Round"
-
-                    self.send_status_email(candidate_email, candidate_name, "Ongoing", phase, interview_date, interview_time)
-
-                elif new_status == "Archived":
-                    # Move to Archived — allow only from Scouting
-                    submission_data.setdefault("status_history", []).append({
-                        "from": old_status,
-                        "to": "Archived",
-                        "action": "Archived",
-                        "updated_at": ts
-                    })
-                    submission_data["status"] = "Archived"
-                    # It's helpful to keep a top-level flag for quick checks
-                    submission_data["archived"] = True
-
-                    # Optional: notify or log
-                    try:
-                        self.send_status_email(candidate_email, candidate_name, "Archived")
-                    except Exception:
-                        # Do not fail the request on email error; transaction will still commit.
-                        pass
-
-                else:
-                    return Response({"status": "error", "message": "Invalid transition from Scouting. Must be 'Ongoing', 'Reject', or 'Archived'."},
-                                    status=status.HTTP_400_BAD_REQUEST)
-
-            # === ARCHIVED ===
-            elif old_status == "Archived":
-                # Only allowed transition from Archived is to Scouting (unarchive)
-                if new_status == "Scouting":
-                    submission_data.setdefault("status_history", []).append({
-                        "from": old_status,
-                        "to": "Scouting",
-                        "action": "Unarchived",
-                        "updated_at": ts
-                    })
-                    submission_data["status"] = "Scouting"
-                    submission_data["archived"] = False
-
-                    try:
-                        self.send_status_email(candidate_email, candidate_name, "Unarchived")
-                    except Exception:
-                        pass
-                else:
-                    return Response({"status": "error", "message": "Invalid transition from Archived. Only allowed: 'Scouting' (unarchive)."},
-                                    status=status.HTTP_400_BAD_REQUEST)
-
-            # === ONGOING ===
-            elif old_status == "Ongoing":
-                if new_status == "Hired":
-                    history_entry = {
-                        "from": "Ongoing",
-                        "to": "Hired",
-                        "updated_at": ts
-                    }
-                    if offer_letter_date:
-                        history_entry["offer_letter_date"] = offer_letter_date
-                        submission_data["offer_letter_date"] = offer_letter_date
-                    if joining_date:
-                        history_entry["joining_date"] = joining_date
-                        submission_data["joining_date"] = joining_date
-
-                    submission_data.setdefault("status_history", []).append(history_entry)
-                    submission_data["status"] = "Hired"
-                    submission_data["phase"] = "Final Selection"
-
-                    try:
-                        self.send_status_email(candidate_email, candidate_name, "Hired", "Final Selection", joining_date=joining_date)
-                    except Exception:
-                        pass
-
-                elif new_status == "Reject":
-                    if not reject_reason:
-                        return Response({"status": "error", "message": "Reject reason required when rejecting from Ongoing."},
-                                        status=status.HTTP_400_BAD_REQUEST)
-                    submission_data.setdefault("status_history", []).append({
-                        "from": "Ongoing",
-                        "to": "Reject",
-                        "reason": reject_reason,
-                        "updated_at": ts
-                    })
-                    submission_data["status"] = "Reject"
-                    submission_data["reject_reason"] = reject_reason
-
-                    self.send_status_email(candidate_email, candidate_name, "Reject")
-
-                elif new_status == "Ongoing":
-                    history_entry = {
-                        "from": "Ongoing",
-                        "to": "Ongoing",
-                        "phase": phase or submission_data.get("phase", "Next Round"),
-                        "updated_at": ts
-                    }
-                    if interview_date:
-                        submission_data["interview_date"] = interview_date
-                        history_entry["interview_date"] = interview_date
-                    if interview_time:
-                        submission_data["interview_time"] = interview_time
-                        history_entry["interview_time"] = interview_time
-
-                    submission_data.setdefault("status_history", []).append(history_entry)
-                    submission_data["status"] = "Ongoing"
-                    submission_data["phase"] = phase or submission_data.get("phase", "Next Round")
-
-                    self.send_status_email(candidate_email, candidate_name, "Ongoing", phase, interview_date, interview_time)
-
-                else:
-                    return Response({"status": "error", "message": f"Invalid transition from Ongoing to {new_status}."},
-                                    status=status.HTTP_400_BAD_REQUEST)
-
-            else:
-                return Response({"status": "error", "message": f"Unhandled current status: {old_status}."},
-                                status=status.HTTP_400_BAD_REQUEST)
+            try:
+                status_event, notification = apply_transition(
+                    form, new_status, request.data, ts,
+                    candidate_name=candidate_name, candidate_email=candidate_email,
+                )
+            except TransitionError as exc:
+                return Response({"status": "error", "message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
             # Persist changes
-            form.submission_data = submission_data
-            form.save()
+            if new_note is not None:
+                new_note.save()
+            status_event.save()
+            update_fields = ["status", "phase", "status_details"]
+            if new_note is not None:
+                update_fields.append("search_text")
+            form.save(update_fields=update_fields)
+            # Queued in the outbox; Celery sends it after commit, never while the row is locked
+            if notification:
+                queue_status_emails([(form, notification)])
 
             serializer = FormDataSerializer(form)
             return Response({
                 "status": "success",
-                "message": f"Status updated successfully (current: {submission_data.get('status')}, phase: {submission_data.get('phase')})",
+                "message": f"Status updated successfully (current: {form.status}, phase: {form.phase})",
                 "data": serializer.data
             }, status=status.HTTP_200_OK)
 
@@ -547,6 +375,136 @@ class FormDataAPIView(APIView):
 
 
 
+class StatusEmailDeliveryAPIView(APIView):
+    """Delivery status of the outbox e-mails queued for one candidate."""
+
+    def get(self, request, pk):
+        if not FormData.objects.filter(pk=pk).exists():
+            return Response({"status": "error", "message": "Record not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        emails = StatusEmail.objects.filter(form_id=pk).order_by("-created_at", "-id")
+        data = [
+            {
+                "id": email.id,
+                "to_email": email.to_email,
+                "current_status": email.payload.get("current_status"),
+                "is_new_candidate": bool(email.payload.get("is_new_candidate")),
+                "status": email.status,
+                "attempts": email.attempts,
+                "last_error": email.last_error,
+                "next_attempt_at": email.next_attempt_at if email.status == StatusEmail.PENDING else None,
+                "created_at": email.created_at,
+                "sent_at": email.sent_at,
+            }
+            for email in emails
+        ]
+        return Response({"status": "success", "data": data}, status=status.HTTP_200_OK)
+
+
+MAX_BULK_TRANSITION_IDS = 1000
+
+
+class BulkStatusTransitionAPIView(APIView):
+    """Apply one status transition to many candidates.
+
+    POST {"ids": [...], "status": "Reject", "reject_reason": "...", ...} takes the same
+    parameters as FormDataAPIView.put. All rows are locked and updated in one
+    transaction, every id gets its own result, and the status e-mails are queued in
+    the outbox together for the Celery worker to send after commit.
+    """
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        new_status = request.data.get("status")
+
+        if not isinstance(ids, list) or not ids:
+            return Response({"status": "error", "message": "ids must be a non-empty list."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = list(dict.fromkeys(int(i) for i in ids))
+        except (TypeError, ValueError):
+            return Response({"status": "error", "message": "ids must be integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_BULK_TRANSITION_IDS:
+            return Response({"status": "error", "message": f"At most {MAX_BULK_TRANSITION_IDS} ids per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not new_status:
+            return Response({"status": "error", "message": "status is required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ts = timezone.now()
+        results = {}
+        changed, events, notifications = [], [], []
+        counter_deltas = Counter()
+        status_deltas = Counter()
+
+        with transaction.atomic():
+            # Lock in primary-key order so overlapping bulk requests cannot deadlock;
+            # the e-mail is the indexed column and the name comes out of the JSON in
+            # the database, the blob is never loaded
+            forms = (
+                FormData.objects.select_for_update()
+                .filter(pk__in=ids)
+                .order_by("pk")
+                .only("id", "status", "phase", "status_details", "role_type", "job", "email")
+                .annotate(notify_name=KT("submission_data__Name"))
+            )
+            for form in forms:
+                old_key = form.counter_key
+                if form.status == new_status:
+                    results[form.pk] = {"id": form.pk, "status": "skipped", "message": f"Already {new_status}."}
+                    continue
+                try:
+                    event, notification = apply_transition(
+                        form, new_status, request.data, ts,
+                        candidate_name=form.notify_name, candidate_email=form.email,
+                    )
+                except TransitionError as exc:
+                    results[form.pk] = {"id": form.pk, "status": "error", "message": str(exc)}
+                    continue
+
+                changed.append(form)
+                events.append(event)
+                if notification:
+                    notifications.append((form, notification))
+                counter_deltas[old_key] -= 1
+                counter_deltas[form.counter_key] += 1
+                status_deltas[old_key[0]] -= 1
+                status_deltas[form.status] += 1
+                results[form.pk] = {
+                    "id": form.pk,
+                    "status": "success",
+                    "from": old_key[0],
+                    "to": form.status,
+                    "phase": form.phase,
+                }
+
+            # bulk_update() skips FormData.save(), so counters and the realtime
+            # broadcast are handled here once for the whole batch
+            CandidateStatusEvent.objects.bulk_create(events)
+            FormData.objects.bulk_update(changed, ["status", "phase", "status_details"], batch_size=500)
+            CandidateCounter.apply(counter_deltas)
+
+            changed_ids = [form.pk for form in changed]
+            if changed_ids:
+                transaction.on_commit(lambda: formdata_broadcaster.record(
+                    FORMDATA_GROUP, changed_ids=changed_ids, status_deltas=status_deltas,
+                ))
+            queue_status_emails(notifications)
+
+        ordered = [
+            results.get(pk) or {"id": pk, "status": "error", "message": "Record not found"}
+            for pk in ids
+        ]
+        summary = Counter(result["status"] for result in ordered)
+        return Response({
+            "status": "success",
+            "message": f"{summary['success']} of {len(ids)} candidates moved to {new_status}.",
+            "summary": {key: summary[key] for key in ("success", "skipped", "error")},
+            "results": ordered,
+        }, status=status.HTTP_200_OK)
+
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -747,7 +705,7 @@ class ComposeMailAPIView(APIView):
         submission = form_obj.submission_data
         candidate_email = submission.get("Email")
         role = submission.get("Role_Type", "Not Provided")
-        current_status = submission.get("status", "Unknown")
+        current_status = form_obj.status
  
         # Replace placeholders dynamically in message
         subject = f"Role: {role} | Status: {current_status}"
@@ -764,25 +722,14 @@ class ComposeMailAPIView(APIView):
             saved_name = fs.save(attachment_file.name, attachment_file)
             saved_file_path = f"email_attachments/{saved_name}"  # relative path to media
  
-        # =============================================
-        # ⭐ UPDATE submission_data JSON STRUCTURE
-        # =============================================
-        email_log = {
-            "subject": subject,
-            "message": message,
-            "cc": cc_list,
-            "attachments": [saved_file_path] if saved_file_path else []
-        }
-        if "email_message" not in submission or not isinstance(submission["email_message"], list):
-            submission["email_message"] = []
- 
-        # Append new email message entry
-        submission["email_message"].append(email_log)
- 
-       
-        # SAVE MESSAGE IN DATABASE
-        form_obj.submission_data = submission
-        form_obj.save()
+        # SAVE MESSAGE IN DATABASE (append-only log, submission_data is not rewritten)
+        CandidateSentMessage.objects.create(
+            form=form_obj,
+            subject=subject,
+            message=message,
+            cc=cc_list,
+            attachments=[saved_file_path] if saved_file_path else [],
+        )
         # Send email
         send_composed_email(
             to_email=candidate_email,
@@ -817,7 +764,7 @@ class ComposeMailAPIView(APIView):
 
         # Extract fields
         role = submission.get("Role_Type", "")
-        current_status = submission.get("status", "")
+        current_status = form_obj.status
         name = submission.get("Name", "")
         email = submission.get("Email", "")
 
@@ -844,7 +791,8 @@ class ComposeMailAPIView(APIView):
     
 
 
-from .resume_parser import parse_resume
+from . import resume_parser
+from .parse_cache import cached_parse, read_upload
 
 class ResumeParseAPIView(APIView):
     def post(self, request):
@@ -856,18 +804,94 @@ class ResumeParseAPIView(APIView):
         if getattr(f, "size", 0) > max_mb * 1024 * 1024:
             return Response({"error": f"File too large. Max {max_mb} MB allowed."}, status=status.HTTP_400_BAD_REQUEST)
 
+        def parse():
+            parsed = resume_parser.parse_resume(f, f.name)
+            return parsed["raw_text"], parsed
+
         try:
-            result = parse_resume(f, f.name)
-            return Response({"success": True, "response": result}, status=status.HTTP_200_OK)
+            # The same CV is parsed on upload, re-open and re-run; reuse the first result
+            _, result, hit = cached_parse(
+                resume_parser.PARSER_NAME, resume_parser.PARSER_VERSION, read_upload(f), parse,
+            )
+            return Response({"success": True, "cached": hit, "response": result}, status=status.HTTP_200_OK)
         except Exception as exc:
             return Response({"success": False, "error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+from .models import ResumeParseJob
+from .parse_cache import content_hash, get_cached
+from .resume_jobs import PARSERS, job_group
+from .tasks import parse_resume_job
+
+
+class ResumeParseJobAPIView(APIView):
+    """Submit a resume for background parsing (POST) and poll the job (GET <pk>/).
+
+    POST takes the file under 'resume' and an optional 'parser' (resume_parser,
+    keyword or gemini). A file that was parsed before is answered from the cache
+    straight away; otherwise the job is queued on the resume parsing queue and its
+    updates are pushed to ws/resume-parse-jobs/<id>/.
+    """
+
+    max_mb = 10
+
+    def get(self, request, pk):
+        try:
+            job = ResumeParseJob.objects.get(pk=pk)
+        except ResumeParseJob.DoesNotExist:
+            return Response({"status": "error", "message": "Parse job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"status": "success", "data": job.progress()}, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        f = request.FILES.get("resume")
+        if not f:
+            return Response({"status": "error", "message": "Please upload a file under the key 'resume'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if getattr(f, "size", 0) > self.max_mb * 1024 * 1024:
+            return Response({"status": "error", "message": f"File too large. Max {self.max_mb} MB allowed."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        parser_name = request.data.get("parser") or resume_parser.PARSER_NAME
+        spec = PARSERS.get(parser_name)
+        if spec is None:
+            return Response({"status": "error", "message": f"Unknown parser. Use one of: {', '.join(PARSERS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not spec.accepts(f.name):
+            return Response({"status": "error", "message": "Unsupported file type for this parser."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        digest = content_hash(read_upload(f))
+        job = ResumeParseJob(parser=parser_name, original_name=f.name[:255], content_hash=digest)
+
+        cached = get_cached(parser_name, spec.version, digest)
+        if cached is not None:
+            job.status = ResumeParseJob.COMPLETED
+            job.cached = True
+            job.result = cached["result"]
+            job.finished_at = timezone.now()
+            job.save()
+            return Response({"status": "success", "message": "Resume parsed (cached).", "data": job.progress()},
+                            status=status.HTTP_200_OK)
+
+        with transaction.atomic():
+            job.file = f
+            job.save()
+            transaction.on_commit(lambda: parse_resume_job.delay(job.pk))
+
+        return Response({
+            "status": "success",
+            "message": "Resume queued for parsing.",
+            "websocket_group": job_group(job.pk),
+            "data": job.progress(),
+        }, status=status.HTTP_202_ACCEPTED)
+
 from .csv_reader import get_or_create_job_by_title
 from create_job.models import add_job
 from django.db import transaction
-from .csv_reader import read_uploaded_file
-
-BATCH_SIZE = 100
+from .csv_reader import iter_uploaded_file
+from .imports import import_group, missing_columns
+from .models import CandidateImportJob
+from .tasks import run_candidate_import
 
 
 def extract_group(row, prefix, fields):
@@ -895,15 +919,14 @@ def extract_group(row, prefix, fields):
 
     return result
 
-def clean_value(value):
-    if value is None:
-        return ""
-    value_str = str(value).strip()
-    if value_str.lower() in ["not available", "n/a", "na", "none", "not specified"]:
-        return ""
-    return value_str
-
 class UploadCandidatesCSVAPIView(APIView):
+    """Validate an upload and queue it as a background CandidateImportJob.
+
+    Rows are read, deduplicated on e-mail and inserted in chunks by the
+    run_candidate_import Celery task; progress is served by CandidateImportJobAPIView
+    and pushed to the ws/candidate-imports/<id>/ WebSocket group.
+    """
+
     def post(self, request):
 
         csv_file = request.FILES.get("file")
@@ -918,154 +941,76 @@ class UploadCandidatesCSVAPIView(APIView):
         ):
             return Response({"error": "Only CSV, XLSX, and XLS files allowed."}, status=status.HTTP_400_BAD_REQUEST)
 
+        job_id = request.data.get("job_id")
+        if not job_id:
+            return Response({"error": "job_id is required."}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            rows = read_uploaded_file(csv_file)
+            job_instance = add_job.objects.get(pk=job_id)
+        except (add_job.DoesNotExist, ValueError):
+            return Response({"error": f"Job with id {job_id} does not exist."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only the header row is needed to reject a malformed file up front
+        try:
+            first_row = next(iter_uploaded_file(csv_file), None)
         except Exception as e:
             return Response({"error": f"Error reading CSV: {str(e)}"},
                             status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            csv_file.seek(0)
 
-        REQUIRED_COLUMNS = [
-            "Name",
-            "Email",
-            "Phone",
-            "Total Experience",
-            "Current Salary",
-            "Highest Qualification",
-            "University",
-            "Organisation",
-            "Available To Join (in days)"
-
-        ]
-
-        csv_columns = set(rows[0].keys()) if rows else set()
-
-        missing_cols = [col for col in REQUIRED_COLUMNS if col not in csv_columns]
-
+        missing_cols = missing_columns(first_row)
         if missing_cols:
             return Response({
                 "error": "Missing required columns in CSV.",
                 "missing_columns": missing_cols
             }, status=status.HTTP_400_BAD_REQUEST)
 
+        with transaction.atomic():
+            import_job = CandidateImportJob.objects.create(
+                file=csv_file,
+                original_name=csv_file.name[:255],
+                job=job_instance,
+            )
+            transaction.on_commit(lambda: run_candidate_import.delay(import_job.pk))
 
-        created = 0
-        errors = []
-        job_cache = {}
-        batch_objects = []
-
-        for idx, row in enumerate(rows, start=2):
+        return Response({
+            "message": "File uploaded successfully! Import started.",
+            "import": import_job.progress(),
+            "websocket_group": import_group(import_job.pk),
+        }, status=status.HTTP_202_ACCEPTED)
 
-            try:
-                job_id = request.data.get("job_id")
 
-                if not job_id:
-                    return Response({"error": "job_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+class CandidateImportJobAPIView(APIView):
+    """GET progress of a candidate import; POST .../resume/ restarts an interrupted one."""
 
-                try:
-                    job_instance = add_job.objects.get(pk=job_id)
-                except add_job.DoesNotExist:
-                    return Response({"error": f"Job with id {job_id} does not exist."}, status=status.HTTP_400_BAD_REQUEST)
-
-                job_title = job_instance.title
-
-                university = row.get("University", "")
-                highest_qualification = row.get("Highest Qualification", "")
-
-                education_history = []
-                if university or highest_qualification:
-                    education_history.append({
-                        "Qualification": highest_qualification,
-                        "University": university,
-                        "Start_Date": "",
-                        "End_Date": "",
-                        "Score": ""
-                    })
-
-                organisation = row.get("Organisation", "")
-
-                professional_experience = []
-                if organisation:
-                    professional_experience.append({
-                        "Role": "",
-                        "Organisation": organisation,
-                        "Start_Date": "",
-                        "End_Date": "",
-                        "Location": "",
-                        "CTC_INR": "",
-                        "Responsibilities": ""
-                    })
-
-                submission_json = {}
-
-                for k, v in row.items():
-
-                    key_lower = k.lower()
-
-                    if key_lower in [
-                        # "university".lower(),
-                        # "highest qualification".lower(),
-                        # "organisation".lower(),
-                        "job title"
-                    ]:
-                        continue
-
-                    if key_lower.startswith("education_"):
-                        continue
-                    if key_lower.startswith("experience_"):
-                        continue
-
-                    if key_lower == "available to join (in days)":
-                        submission_json["Notice_Period"] = clean_value(v)
-                        continue
-
-                    if key_lower == "current location":
-                        submission_json["Location"] = clean_value(v)
-                        continue
-                    if key_lower == "nationality":
-                        submission_json["Country"] = clean_value(v)
-                        continue
-
-                    clean_key = k.replace(" ", "_")
-
-                    # submission_json[clean_key] = v
-                    submission_json[clean_key] = clean_value(v)
-
-                submission_json["status"] = "Scouting"
-                submission_json["State"] = row.get("State", "")
-
-                submission_json["Education_History"] = education_history
-                submission_json["Professional_Experience"] = professional_experience
-
-                submission_json["Role_Type"] = job_title
-                submission_json["job_id"] = job_instance.id if job_instance else None
-                submission_json["job_title"] = job_instance.title if job_instance else None
-
-                batch_objects.append(
-                    FormData(
-                        form_name="gxi_form",
-                        submission_data=submission_json
-                    )
-                )
-
-                if len(batch_objects) >= BATCH_SIZE:
-                    FormData.objects.bulk_create(batch_objects)
-                    created += len(batch_objects)
-                    batch_objects = []
+    def get(self, request, pk):
+        try:
+            import_job = CandidateImportJob.objects.get(pk=pk)
+        except CandidateImportJob.DoesNotExist:
+            return Response({"status": "error", "message": "Import not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"status": "success", "data": import_job.progress()}, status=status.HTTP_200_OK)
 
-            except Exception as e:
-                errors.append(f"Row {idx}: {str(e)}")
+    def post(self, request, pk):
+        with transaction.atomic():
+            try:
+                import_job = CandidateImportJob.objects.select_for_update().get(pk=pk)
+            except CandidateImportJob.DoesNotExist:
+                return Response({"status": "error", "message": "Import not found"}, status=status.HTTP_404_NOT_FOUND)
+            if import_job.status == CandidateImportJob.COMPLETED:
+                return Response({"status": "error", "message": "Import already completed."},
+                                status=status.HTTP_400_BAD_REQUEST)
 
-        if batch_objects:
-            FormData.objects.bulk_create(batch_objects)
-            created += len(batch_objects)
+            # A RUNNING job is only resumed when its worker is gone; a live worker notices
+            # the status change at its next chunk and stops (ImportSuperseded)
+            import_job.status = CandidateImportJob.QUEUED
+            import_job.save(update_fields=["status"])
+            transaction.on_commit(lambda: run_candidate_import.delay(import_job.pk))
 
         return Response({
-            "message": "File uploaded successfully!",
-            "total_rows": len(rows),
-            "created": created,
-            "failed": len(errors),
-            "errors": errors[:20],
-        }, status=status.HTTP_200_OK)
+            "status": "success",
+            "message": f"Import resumed after row {import_job.committed_rows}.",
+            "data": import_job.progress(),
+        }, status=status.HTTP_202_ACCEPTED)
 
 
 
@@ -1075,32 +1020,12 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Count, Q
-from django.core.cache import cache   # optional: requires Django cache configured
 
 class RoleTypeCountAPIView(APIView):
-    CACHE_KEY = "role_type_counts_v1"
-    CACHE_TIMEOUT = 600
-
     def get(self, request):
         try:
-            cached = cache.get(self.CACHE_KEY)
-            if cached is not None:
-                return Response({"status": "success", "role_type_counts": cached}, status=status.HTTP_200_OK)
-            qs = (
-                FormData.objects
-                .exclude(Q(submission_data__Role_Type__isnull=True) | Q(submission_data__Role_Type__exact=''))
-                .values('submission_data__Role_Type')
-                .annotate(count=Count('id'))
-            )
-
-            role_type_counts = {item['submission_data__Role_Type']: item['count'] for item in qs}
-
-            # Optional: cache the result
-            try:
-                cache.set(self.CACHE_KEY, role_type_counts, timeout=self.CACHE_TIMEOUT)
-            except Exception:
-                # caching is best-effort — don't fail the request if cache isn't configured
-                pass
+            # Read from the maintained counters table: exact and cheap, so no cache needed
+            role_type_counts = get_role_type_counts()
 
             return Response({"status": "success", "role_type_counts": role_type_counts}, status=status.HTTP_200_OK)
 
@@ -1186,7 +1111,7 @@ class HRComposeMailAPIView(APIView):
         submission = form_obj.submission_data
         candidate_email = submission.get("Email")
         role = submission.get("Role_Type", "Not Provided")
-        current_status = submission.get("status", "Unknown")
+        current_status = form_obj.status
 
         # Subject
         subject = f"Role: {role} | Status: {current_status}"
@@ -1212,19 +1137,13 @@ class HRComposeMailAPIView(APIView):
         # ============================
         # SAVE EMAIL LOG IN DB
         # ============================
-        email_log = {
-            "message": message,
-            "cc": cc_list,
-            "attachments": [saved_file_path] if saved_file_path else []
-        }
-
-        if "email_message" not in submission or not isinstance(submission["email_message"], list):
-            submission["email_message"] = []
-
-        submission["email_message"].append(email_log)
-
-        form_obj.submission_data = submission
-        form_obj.save()
+        CandidateSentMessage.objects.create(
+            form=form_obj,
+            message=message,
+            cc=cc_list,
+            attachments=[saved_file_path] if saved_file_path else [],
+            sent_by=user,
+        )
 
         # ============================
         # SEND EMAIL USING HR SMTP
@@ -1344,11 +1263,12 @@ class ChatHistoryAPIView(APIView):
         candidate_email = submission.get("Email")
 
         # 1️⃣ Sent Messages (DB)
-        sent_messages = submission.get("email_message", [])
+        sent_messages = form_obj.sent_messages.all()
 
         # Force type=sent and remove timestamp if exists
         clean_sent = []
-        for msg in sent_messages:
+        for sent in sent_messages:
+            msg = sent.as_history_entry()
             msg.pop("timestamp", None)
             msg["type"] = "sent"
             clean_sent.append(msg)
@@ -1390,7 +1310,7 @@ class role_types(APIView):
 
             search_query = request.query_params.get('search', None)
             form_name = request.query_params.get('form_name', None)
-            sort_by = request.query_params.get('sort_by', '-submitted_at')
+            sort_by = request.query_params.get('sort_by')
 
             role_type_param = request.query_params.get('role_type')  # comma separated
             role_type_exact = request.query_params.get('role_type_exact', 'false').lower() in ('1', 'true', 'yes')
@@ -1401,27 +1321,12 @@ class role_types(APIView):
                 forms = forms.filter(form_name__icontains=form_name)
 
             if search_query:
-                forms = forms.filter(
-                    Q(form_name__icontains=search_query) |
-                    Q(submission_data__icontains=search_query)
-                )
+                forms = search_candidates(forms, search_query)
 
             # ------------------------------------------------
             # ALWAYS RETURN ROLE TYPE COUNTS (NEW LOGIC)
             # ------------------------------------------------
-            all_forms = FormData.objects.all()
-            role_type_counts = {}
-
-            # collect all distinct Role_Type values
-            distinct_roles = set(
-                all_forms.values_list("submission_data__Role_Type", flat=True)
-            )
-
-            for rt in distinct_roles:
-                if rt:  # avoid None values
-                    role_type_counts[rt] = all_forms.filter(
-                        submission_data__Role_Type=rt
-                    ).count()
+            role_type_counts = get_role_type_counts()
 
             # ------------------------------------------------
             # APPLY FILTER IF ?role_type= PASSED
@@ -1430,40 +1335,34 @@ class role_types(APIView):
                 role_types = [rt.strip() for rt in role_type_param.split(',') if rt.strip()]
                 if role_types:
                     if role_type_exact:
-                        conds = [Q(**{"submission_data__Role_Type__iexact": rt}) for rt in role_types]
+                        conds = [Q(role_type__iexact=rt) for rt in role_types]
                     else:
-                        conds = [Q(**{"submission_data__Role_Type__icontains": rt}) for rt in role_types]
+                        conds = [Q(role_type__icontains=rt) for rt in role_types]
 
                     forms = forms.filter(reduce(or_, conds))
 
-            valid_sort_fields = ['form_name', 'submitted_at']
-            if sort_by.lstrip('-') not in valid_sort_fields:
-                sort_by = '-submitted_at'
-            forms = forms.order_by(sort_by)
+            # A search without an explicit sort_by keeps the relevance ordering
+            if sort_by or not search_query:
+                valid_sort_fields = ['form_name', 'submitted_at']
+                if not sort_by or sort_by.lstrip('-') not in valid_sort_fields:
+                    sort_by = '-submitted_at'
+                forms = forms.order_by(sort_by)
 
-            page = request.query_params.get('page', 1)
-            page_size = int(request.query_params.get('page_size', 25))
-            paginator = Paginator(forms, page_size)
+            # List rows are compact cards; the full submission_data is served by the detail endpoint
+            card_fields = parse_card_fields(request.query_params.get('fields'))
+            forms_page, page_meta = paginate_candidates(request, candidate_cards(forms, card_fields))
 
-            try:
-                forms_page = paginator.page(page)
-            except PageNotAnInteger:
-                forms_page = paginator.page(1)
-            except EmptyPage:
-                forms_page = paginator.page(paginator.num_pages)
-
-            serializer = FormDataSerializer(forms_page, many=True)
+            serializer = CandidateCardSerializer(forms_page, many=True, fields=card_fields)
 
             return Response({
                 "status": "success",
-                "total_records": paginator.count,
-                "total_pages": paginator.num_pages,
-                "current_page": forms_page.number,
-                "page_size": page_size,
+                **page_meta,
                 "role_type_counts": role_type_counts,   # ALWAYS RETURN THIS
                 "data": serializer.data
             }, status=status.HTTP_200_OK)
 
+        except (InvalidCursor, InvalidFieldset) as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("GET FormData error: %s", str(e))
             return Response({"status": "error", "message": f"An error occurred: {str(e)}"},
@@ -1475,42 +1374,6 @@ class PublicFormAPIView(APIView):
     authentication_classes = []      # Disable authentication
     permission_classes = [AllowAny]  # Allow all
 
-    def send_status_email(self, candidate_email, candidate_name, current_status, phase=None,
-                          interview_date=None, interview_time=None, joining_date=None, is_new_candidate=False):
-        if not candidate_email:
-            return
-
-        if is_new_candidate:
-            template_name = "application_welcome.html"
-            subject = "Thank You For Applying - GXI Networks"
-        else:
-            template_name = "application_status.html"
-            subject = f"Update: Your Application Status - {current_status}"
-
-        context = {
-            "candidate_name": candidate_name,
-            "current_status": current_status,
-            "phase": phase,
-            "interview_date": interview_date,
-            "interview_time": interview_time,
-            "joining_date": joining_date,
-        }
-
-        html_message = render_to_string(template_name, context)
-        text_message = strip_tags(html_message) if html_message else "Your application status has been updated."
-
-        try:
-            send_mail(
-                subject=subject,
-                message=text_message,
-                from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None) or "",
-                recipient_list=[candidate_email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-        except Exception as e:
-            # Log error; do not raise to keep API flow stable
-            logger.exception("Failed to send status email to %s: %s", candidate_email, str(e))
 
 
     def post(self, request):
@@ -1539,24 +1402,19 @@ class PublicFormAPIView(APIView):
         serializer = FormDataSerializer(data=data)
 
         if serializer.is_valid():
-            candidate_email = submission_data.get("Email")
-            is_new = not FormData.objects.filter(
-                submission_data__Email=candidate_email
-            ).exists()
-
-            form_obj = serializer.save()
-            submission = form_obj.submission_data  # Python dict (auto parsed)
-
-            self.send_status_email(
-                candidate_email=submission.get("Email"),
-                candidate_name=submission.get("Name"),
-                current_status=submission.get("status", "Applied"),
-                phase=submission.get("phase"),
-                interview_date=submission.get("interview_time"),
-                interview_time=submission.get("interview_time"),
-                joining_date=submission.get("joining_date"),
-                is_new_candidate=is_new
-            )
+            # The e-mail is queued in the outbox with the row and sent by Celery
+            with transaction.atomic():
+                form_obj, created = save_or_merge(serializer, submission_data)
+                queue_status_emails([
+                    (form_obj, submission_notification(submission_data, is_new_candidate=created))
+                ])
+
+            if not created:
+                return Response({
+                    "status": "success",
+                    "message": "Candidate has already applied to this job; their application was updated",
+                    "data": FormDataSerializer(form_obj).data
+                }, status=200)
 
             return Response({
                 "status": "success",
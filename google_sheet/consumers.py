@@ -5,7 +5,7 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from asgiref.sync import sync_to_async
 from django.utils.dateparse import parse_datetime
 from .models import TypeformAnswer, Hiring_process
-from .utils.typeform_utils import fetch_typeform_data
+from .utils.typeform_utils import candidate_identity_keys, existing_candidate_ids, fetch_typeform_data
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +155,7 @@ class TypeformRealtimeConsumer(AsyncWebsocketConsumer):
                     )
 
                     integration_responses = []
+                    identity_keys = []
                     new_count = 0
 
                     for item in sorted_items:
@@ -184,6 +185,11 @@ class TypeformRealtimeConsumer(AsyncWebsocketConsumer):
                             "submitted_at": submitted_at.isoformat() if submitted_at else None,
                             "is_new": not exists,
                         })
+                        identity_keys.append(candidate_identity_keys(mapped_groups))
+
+                    existing_ids = await sync_to_async(existing_candidate_ids)(identity_keys)
+                    for response, form_id in zip(integration_responses, existing_ids):
+                        response["existing_candidate_id"] = form_id
 
                     combined_data.append({
                         "integration": integration.identifier,
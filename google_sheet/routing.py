@@ -3,6 +3,8 @@ from .consumers import TypeformRealtimeConsumer
 from google_form_work.consumers import GoogleFormAllSheetsConsumer
 from form_data.consumer.consumers import FormDataRealtimeConsumer
 from form_data.consumer.consumers_realtime_model import FormDataModelRealtimeConsumer
+from form_data.consumer.imports import CandidateImportConsumer
+from form_data.consumer.resume_jobs import ResumeParseJobConsumer
 from form_data.consumer.wati import WatiRealtimeConsumer
 # from tasks.consumers import TaskConsumer
 
@@ -12,6 +14,8 @@ websocket_urlpatterns = [
     re_path(r"ws/forms/$", GoogleFormAllSheetsConsumer.as_asgi()),
     re_path(r'^ws/formdata/$', FormDataRealtimeConsumer.as_asgi()),
     re_path(r'^ws/formdata_model/$', FormDataModelRealtimeConsumer.as_asgi()),
+    re_path(r'^ws/candidate-imports/(?P<import_id>\d+)/$', CandidateImportConsumer.as_asgi()),
+    re_path(r'^ws/resume-parse-jobs/(?P<job_id>\d+)/$', ResumeParseJobConsumer.as_asgi()),
     re_path(r"ws/wati/$", WatiRealtimeConsumer.as_asgi()),
     # re_path(r"ws/tasks/$", TaskConsumer.as_asgi()),
 ]
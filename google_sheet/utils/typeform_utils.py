@@ -1,6 +1,8 @@
 import requests
 import logging
 
+from form_data.models import CandidateIdentity
+
 TYPEFORM_API_BASE = "https://api.typeform.com"
 logger = logging.getLogger(__name__)
 
@@ -44,3 +46,26 @@ def fetch_typeform_data(form_id, token):
     except Exception as e:
         logger.error(f"Unexpected error fetching Typeform responses: {e}")
         return {"error": str(e)}
+
+
+def candidate_identity_keys(mapped_groups):
+    """CandidateIdentity keys (e-mail, phone, name) of a response grouped by map_answers_grouped()."""
+    personal = {}
+    for entry in mapped_groups.get("Personal_details", []):
+        personal.update(entry)
+    submission = {
+        "Email": personal.get("email"),
+        "Phone": personal.get("phone_number"),
+        "Name": " ".join(str(part) for part in (personal.get("first_name"), personal.get("last_name")) if part),
+    }
+    return CandidateIdentity.keys_for(submission)
+
+
+def existing_candidate_ids(keys_per_response):
+    """FormData id of the latest application with each response's e-mail (or None), in one query.
+
+    A shared phone number or name is not enough to call a response an existing candidate.
+    """
+    emails = [CandidateIdentity.email_of(keys) for keys in keys_per_response]
+    owners = CandidateIdentity.latest_by_email({email for email in emails if email})
+    return [owners.get(email) for email in emails]
@@ -91,7 +91,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from asgiref.sync import sync_to_async
 from .models import TypeformAnswer, Hiring_process
-from .utils.typeform_utils import fetch_typeform_data
+from .utils.typeform_utils import candidate_identity_keys, existing_candidate_ids, fetch_typeform_data
 
 logger = logging.getLogger(__name__)
 
@@ -230,6 +230,7 @@ class TypeformListView(APIView):
                 )
 
                 integration_responses = []
+                identity_keys = []
                 new_count = 0
 
                 for item in sorted_items:
@@ -265,6 +266,11 @@ class TypeformListView(APIView):
                         "submitted_at": submitted_at.isoformat() if submitted_at else None,
                         "is_new": created,
                     })
+                    identity_keys.append(candidate_identity_keys(mapped_groups))
+
+                # "Already applied?" for every response in one identity lookup
+                for response, form_id in zip(integration_responses, existing_candidate_ids(identity_keys)):
+                    response["existing_candidate_id"] = form_id
 
                 # Order the integration_responses by submitted_at DESC before appending
                 integration_responses.sort(
@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_summernote',
     'rest_framework',
     'corsheaders',
@@ -111,6 +112,15 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Realtime FormData updates are merged and sent at most once per interval per group
+FORMDATA_BROADCAST_INTERVAL_MS = int(os.getenv("FORMDATA_BROADCAST_INTERVAL_MS", 250))
+
+# Rows per committed chunk in background candidate imports (form_data.imports)
+CANDIDATE_IMPORT_CHUNK_SIZE = int(os.getenv("CANDIDATE_IMPORT_CHUNK_SIZE", 500))
+
+# How long a parsed resume stays in Redis; the DB copy (ResumeParseCache) is kept until invalidated
+RESUME_PARSE_CACHE_TTL = int(os.getenv("RESUME_PARSE_CACHE_TTL", 7 * 24 * 3600))
+
 
 
 
@@ -208,6 +218,35 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    # Safety net for outbox e-mails whose post-commit kick was lost, and for retries
+    'drain-status-email-outbox': {
+        'task': 'form_data.tasks.drain_status_email_outbox',
+        'schedule': 60.0,
+    },
+}
+# Resume parsing (PDF/DOCX extraction, Gemini) gets its own queue so slow files cannot
+# starve other tasks. Run a dedicated worker whose concurrency caps parsing load, e.g.
+#   celery -A restserver worker -Q resume_parsing --concurrency 2 --prefetch-multiplier 1
+RESUME_PARSE_QUEUE = os.getenv("RESUME_PARSE_QUEUE", "resume_parsing")
+RESUME_PARSE_TIME_LIMIT = int(os.getenv("RESUME_PARSE_TIME_LIMIT", 120))
+CELERY_TASK_ROUTES = {
+    'form_data.tasks.parse_resume_job': {'queue': RESUME_PARSE_QUEUE},
+}
+# Gemini resume parsing: "gemini", "stub" (offline, for load tests) or a dotted backend class path
+GEMINI_BACKEND = os.getenv("GEMINI_BACKEND", "gemini")
+# Seconds per request (also the longest wait for a free request slot)
+GEMINI_TIMEOUT = int(os.getenv("GEMINI_TIMEOUT", 60))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 3))
+# Concurrent Gemini calls per process, and calls per minute across all processes (0 = no limit)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 4))
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", 0))
+# Resume text beyond this many (estimated) tokens is cut by section priority before prompting
+GEMINI_PROMPT_TOKEN_BUDGET = int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", 3000))
+# Responses are cached by prompt hash
+GEMINI_RESPONSE_CACHE_TTL = int(os.getenv("GEMINI_RESPONSE_CACHE_TTL", 7 * 24 * 3600))
+# Simulated latency of the stub backend, in seconds
+GEMINI_STUB_LATENCY = float(os.getenv("GEMINI_STUB_LATENCY", 1.5))
 
 LANGUAGE_CODE = 'en-us'
 USE_I18N = True
@@ -240,6 +279,10 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 
+# Candidate status e-mails are queued in form_data.StatusEmail and sent by Celery
+STATUS_EMAIL_BATCH_SIZE = int(os.getenv('STATUS_EMAIL_BATCH_SIZE', 50))
+STATUS_EMAIL_MAX_ATTEMPTS = int(os.getenv('STATUS_EMAIL_MAX_ATTEMPTS', 5))
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 GOOGLE_SHEETS_CREDENTIALS_FILE = os.path.join(BASE_DIR, "gxihiring-d7185498ec0f.json")
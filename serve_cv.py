@@ -0,0 +1,69 @@
+# ============================
+# File: serve_cv.py
+# ============================
+"""
+Production entry point for the CV extraction service (app.py) on gunicorn.
+
+The master process imports cv, loads the spaCy model and checks tesseract once,
+moves everything loaded so far out of the garbage collector's reach (gc.freeze, so
+workers do not dirty those pages) and then forks the workers, which share the model
+copy-on-write instead of each loading it. Workers use threads (gthread) for
+concurrent requests; OCR inside a request has its own threads (CV_OCR_WORKERS).
+
+Usage:
+    python serve_cv.py [--bind 0.0.0.0:5000] [--workers 4] [--threads 4] [--timeout 120]
+
+Flags default to CV_BIND, CV_WORKERS, CV_THREADS, CV_TIMEOUT.
+Probes: GET /healthz (worker is up), GET /readyz (200 once the model is loaded, else 503).
+"""
+
+import argparse
+import gc
+import os
+
+from gunicorn.app.base import BaseApplication
+
+
+class CVService(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # With preload_app this runs once, in the master, before any worker is forked
+        import cv
+        from app import app
+
+        cv.warm_up()
+        gc.collect()
+        gc.freeze()
+        return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the CV extraction service with preloaded, forked workers")
+    ap.add_argument("--bind", default=os.getenv("CV_BIND", "0.0.0.0:5000"))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("CV_WORKERS", os.cpu_count() or 1)),
+                    help="Worker processes (default: CPU count)")
+    ap.add_argument("--threads", type=int, default=int(os.getenv("CV_THREADS", 4)), help="Request threads per worker")
+    ap.add_argument("--timeout", type=int, default=int(os.getenv("CV_TIMEOUT", 120)),
+                    help="Seconds before a silent worker is restarted (OCR of long scans is slow)")
+    args = ap.parse_args()
+
+    CVService({
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "timeout": args.timeout,
+        "preload_app": True,
+        "accesslog": "-",
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
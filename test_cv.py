@@ -0,0 +1,139 @@
+import unittest
+
+import cv
+
+
+class NormalizeDateTests(unittest.TestCase):
+    def setUp(self):
+        cv.normalize_date.cache_clear()
+        cv.DATE_STATS.clear()
+
+    def test_fast_path(self):
+        cases = [
+            ("Jan 2021", "2021-01"),
+            ("sept. 2019", "2019-09"),
+            ("March, 2020", "2020-03"),
+            ("1st Jan 2019", "2019-01"),
+            ("Jan 1st, 2019", "2019-01"),
+            ("22nd   February 2018", "2018-02"),
+            ("Jan'20", "2020-01"),
+            ("Mar ’21", "2021-03"),
+            ("Dec'98", "1998-12"),
+            ("03/2020", "2020-03"),
+            ("3-2020", "2020-03"),
+            ("2020/3", "2020-03"),
+            ("2019", "2019"),
+            ("Present", "present"),
+            ("till date", "present"),
+        ]
+        for fragment, expected in cases:
+            with self.subTest(fragment=fragment):
+                self.assertEqual(cv.normalize_date(fragment), expected)
+        self.assertEqual(cv.DATE_STATS["fallback"], 0)
+
+    def test_bare_date_is_not_present(self):
+        self.assertNotEqual(cv.normalize_date("Date"), "present")
+
+    def test_repeats_are_memoised(self):
+        for _ in range(3):
+            cv.normalize_date("Jan 2021")
+        stats = cv.date_stats()
+        self.assertEqual((stats["fast"], stats["memo_hits"]), (1, 2))
+
+
+class FindDateSpanTests(unittest.TestCase):
+    def test_spans(self):
+        cases = [
+            ("BSc, 2008-12", "2008", "2012"),
+            ("2015 - 19", "2015", "2019"),
+            ("2021-03", "2021-03", None),
+            ("2021-03 - Present", "2021-03", "present"),
+            ("2008-5", "2008", None),
+            ("2019 – 2021", "2019", "2021"),
+            ("Jan'20 - Mar'21", "2020-01", "2021-03"),
+            ("Jan '20 – till date", "2020-01", "present"),
+            ("1st Jan 2019 to 3rd March 2020", "2019-01", "2020-03"),
+            ("03/2020 - 12/2021", "2020-03", "2021-12"),
+            ("2021/3 to 2022/4", "2021-03", "2022-04"),
+            # Two digits only end a bare-year range
+            ("Jan 2015 - 19 engineers", "2015-01", None),
+        ]
+        for text, start, end in cases:
+            with self.subTest(text=text):
+                span = cv.find_date_span(text)
+                self.assertEqual((span["start"], span["end"]), (start, end))
+
+    def test_no_date(self):
+        for text in ["Date", "May's 20 projects", "Team of 12"]:
+            with self.subTest(text=text):
+                self.assertIsNone(cv.find_date_span(text))
+
+
+class SegmentLinesTests(unittest.TestCase):
+    def blocks(self, lines):
+        return {key: section["lines"] for key, section in cv.segment_lines(lines).items()}
+
+    def test_only_header_like_lines_start_or_end_sections(self):
+        blocks = self.blocks([
+            "PROFILE",
+            "Backend developer with 5 years of experience building APIs",
+            "Work Experience",
+            "Engineer, Northwind, 2021 - 2024",
+            "Owned supplier qualification for the sensor gateway.",
+            "SKILLS",
+            "Python, SQL",
+        ])
+        self.assertEqual(blocks["profile"], ["Backend developer with 5 years of experience building APIs"])
+        self.assertEqual(blocks["experience"], [
+            "Engineer, Northwind, 2021 - 2024", "Owned supplier qualification for the sensor gateway.",
+        ])
+        # The body mention only opens a section the CV has no header for, and takes no lines from experience
+        self.assertEqual(blocks["education"], [])
+
+    def test_short_all_caps_lines_end_a_block(self):
+        blocks = self.blocks(["EXPERIENCE", "Engineer at Contoso", "CERTIFICATIONS", "AWS Solutions Architect"])
+        self.assertEqual(blocks["experience"], ["Engineer at Contoso"])
+
+    def test_section_without_a_header_starts_at_its_first_mention(self):
+        sections = cv.segment_lines([
+            "Asha Rao",
+            "Completed my education at Anna University with a focus on networks",
+            "B.E. Computer Science, 2016",
+            "SKILLS",
+            "Python",
+        ])
+        self.assertEqual(sections["education"]["header"], "Completed my education at Anna University with a focus on networks")
+        self.assertEqual(sections["education"]["lines"], ["B.E. Computer Science, 2016"])
+
+    def test_inline_headers(self):
+        blocks = self.blocks([
+            "Languages: English, Hindi, Tamil, Telugu, Kannada",
+            "Technical Skills: Python, Django, natural language processing",
+            "EDUCATION",
+            "B.Tech, 2019",
+        ])
+        self.assertEqual(blocks["languages"], ["English, Hindi, Tamil, Telugu, Kannada"])
+        self.assertEqual(blocks["skills"], ["Python, Django, natural language processing"])
+        self.assertEqual(blocks["education"], ["B.Tech, 2019"])
+        self.assertEqual(
+            cv.parse_languages(blocks["languages"]), ["English", "Hindi", "Tamil", "Telugu", "Kannada"],
+        )
+
+    def test_repeated_headings_continue_the_section(self):
+        sections = cv.segment_lines([
+            "EXPERIENCE",
+            "Engineer, Contoso, 2020 - 2022",
+            "SKILLS",
+            "Python",
+            "EXPERIENCE",
+            "Intern, Fabrikam, 2019 - 2020",
+        ])
+        self.assertEqual(sections["experience"]["header"], "EXPERIENCE")
+        self.assertEqual(sections["experience"]["lines"], [
+            "Engineer, Contoso, 2020 - 2022", "Intern, Fabrikam, 2019 - 2020",
+        ])
+        self.assertEqual(sections["skills"]["lines"], ["Python"])
+
+
+if __name__ == "__main__":
+    unittest.main()
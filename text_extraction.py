@@ -0,0 +1,197 @@
+# ============================
+# File: text_extraction.py
+# ============================
+"""
+Document text extraction shared by every resume parser (form_data.resume_parser,
+create_job.utils.extractors, cv.py).
+
+Each format has an ordered list of backends, fastest first; the first one that
+yields text wins and every attempt is timed:
+
+- PDF:  pymupdf -> pypdf -> pdfplumber   (page texts are kept for selective OCR)
+- DOCX: python-docx -> docx2python -> mammoth
+- TXT:  utf-8 decode
+
+Backend libraries are imported lazily, so a missing one is just a failed attempt.
+No Django imports: cv.py uses this module outside the web app.
+"""
+
+import time
+from io import BytesIO
+
+PDF = "pdf"
+DOCX = "docx"
+TXT = "txt"
+
+
+class ExtractionResult:
+    def __init__(self, fmt, size):
+        self.format = fmt
+        self.bytes = size
+        self.text = ""
+        self.pages = None        # per-page texts (PDF only)
+        self.backend = None      # backend that produced the text
+        self.timings = {}        # backend -> seconds
+        self.errors = {}         # backend -> error / "no text extracted"
+
+    @property
+    def tried(self):
+        return list(self.timings)
+
+    def diagnostics(self):
+        diag = {
+            "format": self.format,
+            "bytes": self.bytes,
+            "tried": self.tried,
+            "timings_ms": {name: round(sec * 1000, 2) for name, sec in self.timings.items()},
+            "errors": self.errors,
+        }
+        if self.backend:
+            diag["success"] = self.backend
+        else:
+            diag["error"] = "no extractor succeeded"
+        return diag
+
+
+# ---------------- PDF backends (return a list of page texts) ----------------
+def _pdf_pymupdf(data):
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return [page.get_text() for page in doc]
+
+
+def _pdf_pypdf(data):
+    from pypdf import PdfReader
+    return [page.extract_text() or "" for page in PdfReader(BytesIO(data)).pages]
+
+
+def _pdf_pdfplumber(data):
+    import pdfplumber
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+# ---------------- DOCX backends (return the text) ----------------
+def _docx_python_docx(data):
+    from docx import Document
+    doc = Document(BytesIO(data))
+    return "\n".join(p.text for p in doc.paragraphs if p.text and p.text.strip())
+
+
+def _flatten(value):
+    if isinstance(value, (list, tuple)):
+        out = []
+        for item in value:
+            out += _flatten(item)
+        return out
+    return [str(value)]
+
+
+def _docx_docx2python(data):
+    from docx2python import docx2python
+    res = docx2python(BytesIO(data))
+    text = getattr(res, "text", res)
+    if isinstance(text, (list, tuple)):
+        return "\n".join(s for s in _flatten(text) if s and s.strip())
+    return str(text)
+
+
+def _docx_mammoth(data):
+    import mammoth
+    result = mammoth.extract_raw_text(BytesIO(data))
+    return getattr(result, "value", str(result))
+
+
+def _txt_decode(data):
+    return str(data, "utf-8", errors="ignore")
+
+
+BACKENDS = {
+    PDF: [("pymupdf", _pdf_pymupdf), ("pypdf", _pdf_pypdf), ("pdfplumber", _pdf_pdfplumber)],
+    DOCX: [("python-docx", _docx_python_docx), ("docx2python", _docx_docx2python), ("mammoth", _docx_mammoth)],
+    TXT: [("utf-8", _txt_decode)],
+}
+
+
+def detect_format(filename=None, data=b""):
+    """PDF / DOCX / TXT from the file extension, else from the leading bytes."""
+    ext = (filename or "").rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    if ext == PDF:
+        return PDF
+    if ext in ("docx", "doc"):
+        return DOCX
+    if ext in ("txt", "md"):
+        return TXT
+    if data[:5] == b"%PDF-":
+        return PDF
+    if data[:2] == b"PK":
+        return DOCX
+    return TXT
+
+
+def extract(data, filename=None, fmt=None, backends=None):
+    """Extract text from file bytes (or a memoryview) with the ordered backends of its format.
+
+    `backends` restricts / reorders the backends by name (used by the benchmark).
+    Returns an ExtractionResult; text is "" when no backend yielded any.
+    """
+    fmt = fmt or detect_format(filename, data)
+    result = ExtractionResult(fmt, len(data))
+    if not data:
+        result.errors["read"] = "empty file bytes"
+        return result
+
+    chain = BACKENDS[fmt]
+    if backends is not None:
+        by_name = dict(chain)
+        chain = [(name, by_name[name]) for name in backends if name in by_name]
+
+    for name, backend in chain:
+        started = time.perf_counter()
+        try:
+            output = backend(data)
+        except Exception as exc:
+            result.timings[name] = time.perf_counter() - started
+            result.errors[name] = repr(exc)
+            continue
+        result.timings[name] = time.perf_counter() - started
+
+        pages = output if isinstance(output, list) else None
+        text = "\n".join(pages) if pages is not None else (output or "")
+        if result.pages is None and pages is not None:
+            # Keep the page split even without text: callers OCR the empty pages
+            result.pages = pages
+        if text.strip():
+            result.text = text.strip() if pages is None else text
+            result.pages = pages if pages is not None else result.pages
+            result.backend = name
+            return result
+        result.errors[name] = "no text extracted"
+    return result
+
+
+def read_bytes(source):
+    """Bytes of a path or file-like object; file objects are rewound afterwards."""
+    if hasattr(source, "read"):
+        try:
+            source.seek(0)
+        except Exception:
+            pass
+        data = source.read()
+        try:
+            source.seek(0)
+        except Exception:
+            pass
+        return data if isinstance(data, bytes) else data.encode("utf-8")
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def extract_file(source, filename=None, fmt=None, backends=None):
+    """extract() for a path or an uploaded file object."""
+    if filename is None:
+        filename = getattr(source, "name", None) if hasattr(source, "read") else str(source)
+    return extract(read_bytes(source), filename=filename, fmt=fmt, backends=backends)